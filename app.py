@@ -1,14 +1,26 @@
+import os
+import uuid
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 
-from statsmodels.tsa.seasonal import STL
-
-from src.data_loader import load_data
+from src.async_forecast import ForecastPrefetcher, neighbouring_stores
+from src.cache import ForecastCache
+from src.conformal import ConformalForecaster
+from src.data_loader import dataset_columns, load_data
+from src.data_quality import cached_quality_report, store_issues
 from src.prophet_model import prophet_forecast
-from src.insight_engine import generate_business_insight
+from src.insight_engine import fleet_insights, generate_business_insight
+from src.leaderboard import load_leaderboard, summarize_leaderboard
+from src.panel import build_sales_matrix
+from src.profiling import StageRecorder, stage
+from src.registry import ModelRegistry
+from src.scenario import SERVICE_LEVELS, build_scenario_grid
+from src.seasonal_engine import forecast_matrix
+from src.store_index import StoreIndex
 
 
 # -------------------------------------------------
@@ -37,18 +49,85 @@ st.divider()
 # -------------------------------------------------
 # Load data
 # -------------------------------------------------
+@st.cache_resource
+def load_sales_data():
+    return load_data(columns=["Store", "Date", "Sales"])
+
+
+@st.cache_resource
+def load_store_index():
+    # Built once per dataset load; switching stores is then a slice lookup
+    return StoreIndex(load_sales_data())
+
+
+@st.cache_resource
+def load_quality_report():
+    # Every store in one pass, stored on disk under the data fingerprint
+    report = cached_quality_report(load_sales_data())
+    return report, store_issues(report)
+
+
+@st.cache_resource
+def get_forecast_cache():
+    return ForecastCache()
+
+
+@st.cache_resource
+def get_model_registry():
+    # Models fitted by `python -m src.cli --registry` are reused here
+    return ModelRegistry()
+
+
+# Background forecast threads shared by all sessions. Prophet fits run in
+# cmdstan subprocesses, so threads overlap well; raise for busy deployments.
+FORECAST_WORKERS = int(os.environ.get("DEMANDIQ_FORECAST_WORKERS", "2"))
+
+
+@st.cache_resource
+def get_forecast_prefetcher(calibrate: bool):
+    # Shared by all sessions so a prefetch started for one viewer serves the next.
+    # Calibrations stored by `python -m src.cli --conformal --registry` are used
+    # when present; backtesting here costs ten extra Prophet fits per store, so
+    # it only runs when the viewer asks for it.
+    return ForecastPrefetcher(
+        get_forecast_cache(),
+        ConformalForecaster(prophet_forecast, calibrate_missing=calibrate),
+        registry=get_model_registry(),
+        max_workers=FORECAST_WORKERS,
+        return_intervals=True
+    )
+
+
+@st.cache_data(ttl=600)
+def load_cached_leaderboard():
+    # Computed offline by `python -m src.leaderboard`
+    return load_leaderboard()
+
+
 @st.cache_data
-def load_cached_data():
-    return load_data()
+def load_fleet_risk(horizon: int, top_n: int = 10):
+    # Vectorized Holt-Winters for every store, then one ranking pass
+    matrix, store_ids, _ = build_sales_matrix(load_sales_data(), dtype=np.float64)
+    point, _, _ = forecast_matrix(matrix, horizon, "holt_winters")
+    return fleet_insights(matrix, point, store_ids, top_n=top_n)
+
+
+@st.cache_data(max_entries=64)
+def load_scenario_grid(forecast_df: pd.DataFrame):
+    # Sampled once per forecast; slider moves are lookups into the grid
+    return build_scenario_grid(
+        forecast_df["yhat"],
+        forecast_df["yhat_lower"],
+        forecast_df["yhat_upper"]
+    )
 
-train = load_cached_data()
 
 # -------------------------------------------------
 # Schema validation (MANDATORY)
 # -------------------------------------------------
 required_columns = {"Store", "Date", "Sales"}
 
-if not required_columns.issubset(train.columns):
+if not required_columns.issubset(dataset_columns()):
     st.error(
         "❌ Dataset schema mismatch.\n\n"
         "This app expects the following columns:\n"
@@ -59,499 +138,616 @@ if not required_columns.issubset(train.columns):
     )
     st.stop()
 
-# -------------------------------------------------
-# Sidebar navigation
-# -------------------------------------------------
-st.sidebar.header("Navigation")
+# Per-stage timings for this rerun, shown in the sidebar debug panel.
+# The with block stops the recorder however the rerun ends: normally,
+# through st.stop(), an exception or Streamlit's rerun interrupt.
+with StageRecorder() as recorder:
+    with stage("Data load"):
+        store_index = load_store_index()
+
+    # -------------------------------------------------
+    # Sidebar navigation
+    # -------------------------------------------------
+    st.sidebar.header("Navigation")
 
-st.sidebar.markdown(
+    st.sidebar.markdown(
+        """
+    - [Executive Summary](#executive-summary)
+    - [Data Quality](#data-quality)
+    - [Sales Behavior](#sales-behavior)
+    - [What Changed](#what-changed)
+    - [Demand Drivers](#demand-drivers)
+    - [Model Comparison](#model-comparison)
+    - [Why Prophet](#why-prophet)
+    - [Forecast & Risk](#forecast-risk)
+    - [Inventory Recommendation](#inventory)
+    - [Scenario Simulation](#scenario)
+    - [Anomaly Detection](#anomaly)
+    - [Final Insight](#final-insight)
     """
-- [Executive Summary](#executive-summary)
-- [Data Quality](#data-quality)
-- [Sales Behavior](#sales-behavior)
-- [What Changed](#what-changed)
-- [Demand Drivers](#demand-drivers)
-- [Model Comparison](#model-comparison)
-- [Why Prophet](#why-prophet)
-- [Forecast & Risk](#forecast-risk)
-- [Inventory Recommendation](#inventory)
-- [Scenario Simulation](#scenario)
-- [Anomaly Detection](#anomaly)
-- [Final Insight](#final-insight)
-"""
-)
+    )
 
-# -------------------------------------------------
-# Store selection
-# -------------------------------------------------
-st.sidebar.header("Store Selection")
+    # -------------------------------------------------
+    # Store selection
+    # -------------------------------------------------
+    st.sidebar.header("Store Selection")
 
-store_ids = sorted(train["Store"].unique())
-STORE_ID = st.sidebar.selectbox("Select Store ID", store_ids)
+    store_ids = store_index.store_ids.tolist()
+    STORE_ID = st.sidebar.selectbox("Select Store ID", store_ids)
 
-HORIZON = 14
+    CALIBRATE_INTERVALS = st.sidebar.toggle(
+        "Calibrate intervals on backtest errors",
+        value=False,
+        help="Backtests Prophet on this store's recent weeks first. "
+             "Much slower unless a nightly run already stored a calibration."
+    )
 
-store_df = train[train["Store"] == STORE_ID].copy()
-store_df = store_df.sort_values("Date")
-store_df.set_index("Date", inplace=True)
+    HORIZON = 14
 
-series = store_df["Sales"].asfreq("D", fill_value=0)
+    with stage("Store filtering"):
+        series = store_index.get_series(STORE_ID)
 
-# -------------------------------------------------
-# Executive Summary
-# -------------------------------------------------
-st.markdown("<div id='executive-summary'></div>", unsafe_allow_html=True)
-st.header("Executive Summary")
+    # Start the forecast now; it fits in the background while the sections
+    # that don't need it render. Adjacent stores are queued behind it so that
+    # stepping through the store list usually hits a ready forecast.
+    with stage("Forecast submit"):
+        prefetcher = get_forecast_prefetcher(CALIBRATE_INTERVALS)
+        # Speculative work is cancelled per session, never for other viewers
+        session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+        forecast_future = prefetcher.submit(
+            STORE_ID, series, HORIZON, session=session_id
+        )
+        prefetcher.prefetch(
+            neighbouring_stores(store_ids, STORE_ID),
+            store_index.get_series,
+            HORIZON,
+            session=session_id
+        )
 
-st.markdown(
-    """
-    **In simple terms:**  
-    Sales follow a **weekly rhythm** — some days consistently perform better than others.
+    # -------------------------------------------------
+    # Executive Summary
+    # -------------------------------------------------
+    st.markdown("<div id='executive-summary'></div>", unsafe_allow_html=True)
+    st.header("Executive Summary")
 
-    **Why this matters:**  
-    Understanding this pattern allows teams to **plan ahead** instead of reacting late.
+    st.markdown(
+        """
+        **In simple terms:**  
+        Sales follow a **weekly rhythm** — some days consistently perform better than others.
 
-    **Impact:**  
-    Seasonality-aware forecasting reduced errors by **~60%**, helping prevent
-    stockouts and unnecessary overstocking.
-    """
-)
+        **Why this matters:**  
+        Understanding this pattern allows teams to **plan ahead** instead of reacting late.
 
-st.divider()
+        **Impact:**  
+        Seasonality-aware forecasting reduced errors by **~60%**, helping prevent
+        stockouts and unnecessary overstocking.
+        """
+    )
 
-# -------------------------------------------------
-# Data quality
-# -------------------------------------------------
-st.markdown("<div id='data-quality'></div>", unsafe_allow_html=True)
-st.header("Data Quality Snapshot")
-
-if store_df.empty:
-    st.warning("No data available for this store.")
-else:
-    date_min = store_df.index.min()
-    date_max = store_df.index.max()
-    expected_dates = pd.date_range(start=date_min, end=date_max, freq="D")
-    missing_count = len(expected_dates.difference(store_df.index))
-
-    zero_sales_days = int((store_df["Sales"] == 0).sum())
-
-    sales_values = store_df["Sales"]
-    q1 = sales_values.quantile(0.25)
-    q3 = sales_values.quantile(0.75)
-    iqr = q3 - q1
-    if iqr == 0:
-        outlier_count = 0
+    st.divider()
+
+    # -------------------------------------------------
+    # Data quality
+    # -------------------------------------------------
+    st.markdown("<div id='data-quality'></div>", unsafe_allow_html=True)
+    st.header("Data Quality Snapshot")
+
+    with stage("Data quality"):
+        quality_report, quality_issues = load_quality_report()
+
+    if STORE_ID not in quality_report.index:
+        st.warning("No data available for this store.")
     else:
-        lower = q1 - 1.5 * iqr
-        upper = q3 + 1.5 * iqr
-        outlier_count = int(((sales_values < lower) | (sales_values > upper)).sum())
+        store_quality = quality_report.loc[STORE_ID]
 
-    col_missing, col_zero, col_outlier = st.columns(3)
-    col_missing.metric("Missing dates", missing_count)
-    col_zero.metric("Zero-sales days", zero_sales_days)
-    col_outlier.metric("Outlier days (IQR)", outlier_count)
+        col_missing, col_zero, col_outlier = st.columns(3)
+        col_missing.metric("Missing dates", int(store_quality["missing_dates"]))
+        col_zero.metric("Zero-sales days", int(store_quality["zero_days"]))
+        col_outlier.metric("Outlier days (IQR)", int(store_quality["outlier_days"]))
 
-    st.caption(
-        "Missing dates are gaps in raw data before daily filling. "
-        "Outliers use the IQR rule."
-    )
+        if STORE_ID in quality_issues.index:
+            st.warning(f"Data quality issues: {quality_issues[STORE_ID]}.")
 
-st.divider()
+        st.caption(
+            "Missing dates are gaps in raw data before daily filling. "
+            "Outliers use the IQR rule."
+        )
 
-# -------------------------------------------------
-# Sales behavior
-# -------------------------------------------------
-st.markdown("<div id='sales-behavior'></div>", unsafe_allow_html=True)
-st.header("How has this store been selling historically?")
+    st.divider()
 
-st.markdown(
-    """
-    **What this chart shows:**  
-    Daily sales over time.
+    # -------------------------------------------------
+    # Sales behavior
+    # -------------------------------------------------
+    st.markdown("<div id='sales-behavior'></div>", unsafe_allow_html=True)
+    st.header("How has this store been selling historically?")
 
-    **What to notice:**  
-    - Repeating ups and downs  
-    - Predictable demand patterns  
+    st.markdown(
+        """
+        **What this chart shows:**  
+        Daily sales over time.
 
-    **Why this matters:**  
-    Predictable demand enables reliable forecasting.
-    """
-)
+        **What to notice:**  
+        - Repeating ups and downs  
+        - Predictable demand patterns  
 
-fig_sales = px.line(
-    series,
-    title=f"Daily Sales Over Time — Store {STORE_ID}",
-    labels={"value": "Units Sold", "index": "Date"}
-)
+        **Why this matters:**  
+        Predictable demand enables reliable forecasting.
+        """
+    )
 
-st.plotly_chart(fig_sales, use_container_width=True)
+    fig_sales = px.line(
+        series,
+        title=f"Daily Sales Over Time — Store {STORE_ID}",
+        labels={"value": "Units Sold", "index": "Date"}
+    )
 
-st.divider()
+    st.plotly_chart(fig_sales, use_container_width=True)
 
-# -------------------------------------------------
-# What changed
-# -------------------------------------------------
-st.markdown("<div id='what-changed'></div>", unsafe_allow_html=True)
-st.header("What changed recently?")
-
-if len(series) < 14:
-    st.info("Not enough history to summarize recent changes.")
-else:
-    last_7 = series[-7:].mean()
-    prev_7 = series[-14:-7].mean()
-    pct_7 = None if prev_7 == 0 else (last_7 - prev_7) / prev_7
-
-    if len(series) >= 60:
-        last_30 = series[-30:].mean()
-        prev_30 = series[-60:-30].mean()
-        pct_30 = None if prev_30 == 0 else (last_30 - prev_30) / prev_30
-        change_30 = (
+    st.divider()
+
+    # -------------------------------------------------
+    # What changed
+    # -------------------------------------------------
+    st.markdown("<div id='what-changed'></div>", unsafe_allow_html=True)
+    st.header("What changed recently?")
+
+    if len(series) < 14:
+        st.info("Not enough history to summarize recent changes.")
+    else:
+        last_7 = series[-7:].mean()
+        prev_7 = series[-14:-7].mean()
+        pct_7 = None if prev_7 == 0 else (last_7 - prev_7) / prev_7
+
+        if len(series) >= 60:
+            last_30 = series[-30:].mean()
+            prev_30 = series[-60:-30].mean()
+            pct_30 = None if prev_30 == 0 else (last_30 - prev_30) / prev_30
+            change_30 = (
+                "N/A"
+                if pct_30 is None or np.isnan(pct_30)
+                else f"{pct_30 * 100:+.1f}%"
+            )
+            change_30_line = (
+                f"- Last 30 days: {last_30:,.0f} avg units/day vs prior 30 days "
+                f"{prev_30:,.0f} ({change_30})."
+            )
+        else:
+            change_30_line = (
+                "- Last 30 days: not enough history (need 60 days of data)."
+            )
+
+        change_7 = (
             "N/A"
-            if pct_30 is None or np.isnan(pct_30)
-            else f"{pct_30 * 100:+.1f}%"
-        )
-        change_30_line = (
-            f"- Last 30 days: {last_30:,.0f} avg units/day vs prior 30 days "
-            f"{prev_30:,.0f} ({change_30})."
+            if pct_7 is None or np.isnan(pct_7)
+            else f"{pct_7 * 100:+.1f}%"
         )
-    else:
-        change_30_line = (
-            "- Last 30 days: not enough history (need 60 days of data)."
+
+        st.markdown(
+            f"""
+            **Summary:**  
+            - Last 7 days: {last_7:,.0f} avg units/day vs prior 7 days {prev_7:,.0f} ({change_7}).  
+            {change_30_line}
+            """
         )
 
-    change_7 = (
-        "N/A"
-        if pct_7 is None or np.isnan(pct_7)
-        else f"{pct_7 * 100:+.1f}%"
-    )
+    st.divider()
+
+    # -------------------------------------------------
+    # Demand drivers
+    # -------------------------------------------------
+    st.markdown("<div id='demand-drivers'></div>", unsafe_allow_html=True)
+    st.header("What is driving sales changes?")
 
     st.markdown(
-        f"""
-        **Summary:**  
-        - Last 7 days: {last_7:,.0f} avg units/day vs prior 7 days {prev_7:,.0f} ({change_7}).  
-        {change_30_line}
         """
-    )
+        This section breaks sales into understandable components:
 
-st.divider()
+        - **Trend:** Long-term growth or decline  
+        - **Weekly pattern:** Regular recurring behavior  
+        - **Residual (Unexpected changes):** Unusual events such as promotions or disruptions  
 
-# -------------------------------------------------
-# Demand drivers
-# -------------------------------------------------
-st.markdown("<div id='demand-drivers'></div>", unsafe_allow_html=True)
-st.header("What is driving sales changes?")
+        **Why this matters:**  
+        Understanding these drivers helps select the right forecasting strategy.
+        """
+    )
 
-st.markdown(
-    """
-    This section breaks sales into understandable components:
+    with stage("STL decomposition"):
+        # Deferred so the sections above render before statsmodels loads
+        from statsmodels.tsa.seasonal import STL
+
+        stl = STL(series, period=7, robust=True)
+        result = stl.fit()
+
+    decomp_df = pd.DataFrame({
+        "Observed Sales": result.observed,
+        "Trend (Long-Term Movement)": result.trend,
+        "Weekly Pattern (Seasonality)": result.seasonal,
+        "Residual (Unexpected Changes)": result.resid
+    })
+
+    fig_decomp = px.line(
+        decomp_df,
+        facet_row="variable",
+        height=800,
+        title="Breaking Down Sales Behavior"
+    )
 
-    - **Trend:** Long-term growth or decline  
-    - **Weekly pattern:** Regular recurring behavior  
-    - **Residual (Unexpected changes):** Unusual events such as promotions or disruptions  
+    # Clean up facet labels (remove vertical right-side text and place labels on the left)
+    fig_decomp.update_yaxes(title_text="")
+    fig_decomp.update_layout(
+        legend_title_text="",
+        margin=dict(l=160, r=40)
+    )
+    for annotation in fig_decomp.layout.annotations:
+        if annotation.text.startswith("variable="):
+            annotation.update(
+                text=annotation.text.split("=", 1)[1],
+                textangle=0,
+                x=0,
+                xanchor="right",
+                yanchor="middle"
+            )
+
+    st.plotly_chart(fig_decomp, use_container_width=True)
+
+    st.info(
+        "**Key takeaway:** Weekly seasonality explains most of the sales variation. "
+        "Residuals highlight unusual or one-off events."
+    )
 
-    **Why this matters:**  
-    Understanding these drivers helps select the right forecasting strategy.
-    """
-)
+    st.divider()
 
-stl = STL(series, period=7, robust=True)
-result = stl.fit()
-
-decomp_df = pd.DataFrame({
-    "Observed Sales": result.observed,
-    "Trend (Long-Term Movement)": result.trend,
-    "Weekly Pattern (Seasonality)": result.seasonal,
-    "Residual (Unexpected Changes)": result.resid
-})
-
-fig_decomp = px.line(
-    decomp_df,
-    facet_row="variable",
-    height=800,
-    title="Breaking Down Sales Behavior"
-)
+    # -------------------------------------------------
+    # Model comparison
+    # -------------------------------------------------
+    st.markdown("<div id='model-comparison'></div>", unsafe_allow_html=True)
+    st.header("Which forecasting approach works best?")
 
-# Clean up facet labels (remove vertical right-side text and place labels on the left)
-fig_decomp.update_yaxes(title_text="")
-fig_decomp.update_layout(
-    legend_title_text="",
-    margin=dict(l=160, r=40)
-)
-for annotation in fig_decomp.layout.annotations:
-    if annotation.text.startswith("variable="):
-        annotation.update(
-            text=annotation.text.split("=", 1)[1],
-            textangle=0,
-            x=0,
-            xanchor="right",
-            yanchor="middle"
-        )
+    st.markdown(
+        """
+        **How to read this chart:**  
+        - Each bar represents a forecasting approach  
+        - **Lower bars indicate better accuracy**
 
-st.plotly_chart(fig_decomp, use_container_width=True)
+        **Why this matters:**  
+        More accurate forecasts reduce inventory risk.
+        """
+    )
 
-st.info(
-    "**Key takeaway:** Weekly seasonality explains most of the sales variation. "
-    "Residuals highlight unusual or one-off events."
-)
+    leaderboard = load_cached_leaderboard()
 
-st.divider()
+    if leaderboard is not None:
+        summary = summarize_leaderboard(leaderboard)
+        comparison_df = summary[["Model", "MAE"]].rename(
+            columns={"MAE": "Average Error (MAE)"}
+        )
+    else:
+        comparison_df = pd.DataFrame({
+            "Model": ["Naive", "Moving Average", "ARIMA", "SARIMA", "Prophet"],
+            "Average Error (MAE)": [1993.86, 1519.18, 1412.63, 784.21, 778.15]
+        })
+
+    fig_comp = px.bar(
+        comparison_df,
+        x="Model",
+        y="Average Error (MAE)",
+        text_auto=".0f",
+        title="Forecast Accuracy Comparison (Lower is Better)"
+    )
 
-# -------------------------------------------------
-# Model comparison
-# -------------------------------------------------
-st.markdown("<div id='model-comparison'></div>", unsafe_allow_html=True)
-st.header("Which forecasting approach works best?")
+    st.plotly_chart(fig_comp, use_container_width=True)
 
-st.markdown(
-    """
-    **How to read this chart:**  
-    - Each bar represents a forecasting approach  
-    - **Lower bars indicate better accuracy**
+    if leaderboard is not None:
+        st.caption(
+            f"Walk-forward backtest over {leaderboard['Store'].nunique()} stores, "
+            f"computed {leaderboard['computed_at'].max():%Y-%m-%d %H:%M}."
+        )
 
-    **Why this matters:**  
-    More accurate forecasts reduce inventory risk.
-    """
-)
+        fig_cost = px.scatter(
+            leaderboard,
+            x="fit_predict_seconds",
+            y="MAE",
+            color="Model",
+            hover_data=["Store"],
+            log_x=True,
+            title="Accuracy vs Cost per Store",
+            labels={
+                "fit_predict_seconds": "Fit + predict time (seconds, log scale)",
+                "MAE": "Average Error (MAE)"
+            }
+        )
+        st.plotly_chart(fig_cost, use_container_width=True)
+    else:
+        st.caption(
+            "Reference figures. Run `python -m src.leaderboard` to compute them "
+            "for your own data."
+        )
 
-comparison_df = pd.DataFrame({
-    "Model": ["Naive", "Moving Average", "ARIMA", "SARIMA", "Prophet"],
-    "Average Error (MAE)": [1993.86, 1519.18, 1412.63, 784.21, 778.15]
-})
-
-fig_comp = px.bar(
-    comparison_df,
-    x="Model",
-    y="Average Error (MAE)",
-    text_auto=True,
-    title="Forecast Accuracy Comparison (Lower is Better)"
-)
+    st.success(
+        "Seasonality-aware models reduce forecasting errors by approximately **60%**."
+    )
 
-st.plotly_chart(fig_comp, use_container_width=True)
+    st.divider()
 
-st.success(
-    "Seasonality-aware models reduce forecasting errors by approximately **60%**."
-)
+    # -------------------------------------------------
+    # Why Prophet
+    # -------------------------------------------------
+    st.markdown("<div id='why-prophet'></div>", unsafe_allow_html=True)
+    st.header("Why was Prophet chosen?")
 
-st.divider()
+    st.markdown(
+        """
+        Prophet performs on par with advanced statistical models while being:
 
-# -------------------------------------------------
-# Why Prophet
-# -------------------------------------------------
-st.markdown("<div id='why-prophet'></div>", unsafe_allow_html=True)
-st.header("Why was Prophet chosen?")
+        - Easier to maintain  
+        - Faster to retrain  
+        - More robust to changing demand patterns  
 
-st.markdown(
-    """
-    Prophet performs on par with advanced statistical models while being:
+        This makes it well suited for **real-world business use**.
+        """
+    )
 
-    - Easier to maintain  
-    - Faster to retrain  
-    - More robust to changing demand patterns  
+    st.divider()
 
-    This makes it well suited for **real-world business use**.
-    """
-)
+    # -------------------------------------------------
+    # Forecast & risk
+    # -------------------------------------------------
+    st.markdown("<div id='forecast-risk'></div>", unsafe_allow_html=True)
+    st.header("What do we expect in the next 14 days?")
 
-st.divider()
+    st.markdown(
+        """
+        This forecast shows expected demand over the next two weeks.
 
-# -------------------------------------------------
-# Forecast & risk
-# -------------------------------------------------
-st.markdown("<div id='forecast-risk'></div>", unsafe_allow_html=True)
-st.header("What do we expect in the next 14 days?")
+        **Why this matters:**  
+        It allows teams to prepare inventory and staffing **in advance**.
 
-st.markdown(
-    """
-    This forecast shows expected demand over the next two weeks.
+        The shaded band shows the prediction interval to reflect uncertainty.
+        """
+    )
 
-    **Why this matters:**  
-    It allows teams to prepare inventory and staffing **in advance**.
+    show_interval = st.toggle("Show prediction interval", value=True)
 
-    The shaded band shows the prediction interval to reflect uncertainty.
-    """
-)
+    forecast_output = st.container()
 
-show_interval = st.toggle("Show prediction interval", value=True)
+    st.divider()
 
-forecast_df = prophet_forecast(
-    series,
-    horizon=HORIZON,
-    return_intervals=True
-)
+    # -------------------------------------------------
+    # Inventory recommendation
+    # -------------------------------------------------
+    st.markdown("<div id='inventory'></div>", unsafe_allow_html=True)
+    st.header("How much inventory should we plan?")
 
-forecast_series = forecast_df["yhat"]
-forecast_mean = forecast_series.mean()
-forecast_std = forecast_series.std()
+    st.markdown(
+        """
+        Inventory is recommended as a **range** rather than a single number.
 
-hist_series = series[-60:]
+        **Why:**  
+        Under-stocking is typically more costly than holding a small buffer.
 
-fig_forecast = go.Figure()
-fig_forecast.add_trace(
-    go.Scatter(
-        x=hist_series.index,
-        y=hist_series.values,
-        mode="lines",
-        name="Historical Sales"
-    )
-)
-fig_forecast.add_trace(
-    go.Scatter(
-        x=forecast_df.index,
-        y=forecast_df["yhat"],
-        mode="lines",
-        name="Forecast"
-    )
-)
-if show_interval:
-    fig_forecast.add_trace(
-        go.Scatter(
-            x=forecast_df.index,
-            y=forecast_df["yhat_upper"],
-            mode="lines",
-            line=dict(width=0),
-            showlegend=False
-        )
+        The range runs from median demand to the demand covered at the chosen
+        service level, from thousands of simulated demand paths.
+        """
     )
-    fig_forecast.add_trace(
-        go.Scatter(
-            x=forecast_df.index,
-            y=forecast_df["yhat_lower"],
-            mode="lines",
-            line=dict(width=0),
-            fill="tonexty",
-            fillcolor="rgba(31, 119, 180, 0.2)",
-            name="Prediction Interval"
-        )
+
+    service_level = st.select_slider(
+        "Target service level",
+        options=[level for level in SERVICE_LEVELS if level > 0.5],
+        value=0.95,
+        format_func=lambda level: f"{level:.0%}"
     )
-fig_forecast.update_layout(
-    title="14-Day Sales Forecast with Prediction Interval",
-    xaxis_title="Date",
-    yaxis_title="Units Sold"
-)
 
-st.plotly_chart(fig_forecast, use_container_width=True)
+    inventory_output = st.container()
 
-st.warning(
-    f"""
-    **Expected daily demand range:**  
-    {int(forecast_mean - 1.5*forecast_std):,} – {int(forecast_mean + 1.5*forecast_std):,} units  
+    st.divider()
 
-    This range reflects uncertainty and helps manage risk.
-    """
-)
+    # -------------------------------------------------
+    # Scenario simulation
+    # -------------------------------------------------
+    st.markdown("<div id='scenario'></div>", unsafe_allow_html=True)
+    st.header("What if demand changes?")
 
-st.divider()
+    st.markdown(
+        """
+        Demand can shift due to promotions, holidays, or external factors.
 
-# -------------------------------------------------
-# Inventory recommendation
-# -------------------------------------------------
-st.markdown("<div id='inventory'></div>", unsafe_allow_html=True)
-st.header("How much inventory should we plan?")
+        Use the slider to see how inventory needs change under different scenarios.
+        """
+    )
 
-st.markdown(
-    """
-    Inventory is recommended as a **range** rather than a single number.
+    demand_change_pct = st.slider(
+        "Simulate demand change (%)",
+        -30, 30, 0, 5
+    )
 
-    **Why:**  
-    Under-stocking is typically more costly than holding a small buffer.
-    """
-)
+    scenario_output = st.container()
 
-recommended_min = int(forecast_mean * (HORIZON / 7))
-recommended_max = int((forecast_mean + 1.2 * forecast_std) * (HORIZON / 7))
+    st.divider()
 
-st.success(
-    f"""
-    **Recommended inventory for next {HORIZON} days:**
-    - Minimum: {recommended_min:,} units
-    - Maximum (with safety buffer): {recommended_max:,} units
-    """
-)
+    # -------------------------------------------------
+    # Anomaly detection
+    # -------------------------------------------------
+    st.markdown("<div id='anomaly'></div>", unsafe_allow_html=True)
+    st.header("Were there any unusual demand events?")
 
-st.divider()
+    st.markdown(
+        """
+        This checks whether recent sales deviated significantly from normal patterns.
 
-# -------------------------------------------------
-# Scenario simulation
-# -------------------------------------------------
-st.markdown("<div id='scenario'></div>", unsafe_allow_html=True)
-st.header("What if demand changes?")
+        **Why this matters:**  
+        Unusual spikes or drops may indicate promotions, disruptions, or data issues.
+        """
+    )
 
-st.markdown(
-    """
-    Demand can shift due to promotions, holidays, or external factors.
+    with stage("Anomaly scoring"):
+        residuals = result.resid.dropna()
+        z_scores = (residuals - residuals.mean()) / residuals.std()
+        anomalies = z_scores[np.abs(z_scores) > 3]
 
-    Use the slider to see how inventory needs change under different scenarios.
-    """
-)
+    if anomalies.empty:
+        st.success("No unusual demand events detected recently.")
+    else:
+        st.error(f"Detected {len(anomalies)} unusual demand events.")
+        st.dataframe(anomalies.rename("residual").tail(10))
+
+    st.divider()
+
+    # -------------------------------------------------
+    # Resolve the background forecast
+    # -------------------------------------------------
+    # Everything above rendered while the model was fitting; the forecast
+    # sections are filled in place now that it is needed
+    with forecast_output:
+        with stage("Prophet forecast"), st.spinner("Fitting forecast..."):
+            forecast_df = forecast_future.result()
+
+        forecast_series = forecast_df["yhat"]
+        range_low = max(forecast_df["yhat_lower"].mean(), 0)
+        range_high = forecast_df["yhat_upper"].mean()
+
+        hist_series = series[-60:]
+
+        fig_forecast = go.Figure()
+        fig_forecast.add_trace(
+            go.Scatter(
+                x=hist_series.index,
+                y=hist_series.values,
+                mode="lines",
+                name="Historical Sales"
+            )
+        )
+        fig_forecast.add_trace(
+            go.Scatter(
+                x=forecast_df.index,
+                y=forecast_df["yhat"],
+                mode="lines",
+                name="Forecast"
+            )
+        )
+        if show_interval:
+            fig_forecast.add_trace(
+                go.Scatter(
+                    x=forecast_df.index,
+                    y=forecast_df["yhat_upper"],
+                    mode="lines",
+                    line=dict(width=0),
+                    showlegend=False
+                )
+            )
+            fig_forecast.add_trace(
+                go.Scatter(
+                    x=forecast_df.index,
+                    y=forecast_df["yhat_lower"],
+                    mode="lines",
+                    line=dict(width=0),
+                    fill="tonexty",
+                    fillcolor="rgba(31, 119, 180, 0.2)",
+                    name="Prediction Interval"
+                )
+            )
+        fig_forecast.update_layout(
+            title="14-Day Sales Forecast with Prediction Interval",
+            xaxis_title="Date",
+            yaxis_title="Units Sold"
+        )
 
-demand_change_pct = st.slider(
-    "Simulate demand change (%)",
-    -30, 30, 0, 5
-)
+        st.plotly_chart(fig_forecast, use_container_width=True)
 
-adjusted_mean = forecast_mean * (1 + demand_change_pct / 100)
+        st.warning(
+            f"""
+            **Expected daily demand range:**  
+            {int(range_low):,} – {int(range_high):,} units  
 
-scenario_min = int(adjusted_mean * (HORIZON / 7))
-scenario_max = int((adjusted_mean + 1.2 * forecast_std) * (HORIZON / 7))
+            This is the average 80% prediction interval. It is calibrated on how
+            far this store's recent forecasts actually missed when a calibration
+            is available, and comes from Prophet itself otherwise. It reflects
+            uncertainty and helps manage risk.
+            """
+        )
 
-st.info(
-    f"Adjusted inventory range: {scenario_min:,} – {scenario_max:,} units"
-)
+    with stage("Scenario grid"):
+        scenario_grid = load_scenario_grid(forecast_df)
 
-st.divider()
+    with inventory_output:
+        recommended_min = int(scenario_grid.lookup(0, 0, 0.5))
+        recommended_max = int(scenario_grid.lookup(0, 0, service_level))
 
-# -------------------------------------------------
-# Anomaly detection
-# -------------------------------------------------
-st.markdown("<div id='anomaly'></div>", unsafe_allow_html=True)
-st.header("Were there any unusual demand events?")
+        st.success(
+            f"""
+            **Recommended inventory for next {HORIZON} days:**
+            - Minimum: {recommended_min:,} units
+            - Maximum ({service_level:.0%} service level): {recommended_max:,} units
+            """
+        )
 
-st.markdown(
-    """
-    This checks whether recent sales deviated significantly from normal patterns.
+    with scenario_output:
+        scenario_min = int(scenario_grid.lookup(0, demand_change_pct, 0.5))
+        scenario_max = int(scenario_grid.lookup(0, demand_change_pct, service_level))
 
-    **Why this matters:**  
-    Unusual spikes or drops may indicate promotions, disruptions, or data issues.
-    """
-)
+        st.info(
+            f"Adjusted inventory range: {scenario_min:,} – {scenario_max:,} units"
+        )
 
-residuals = result.resid.dropna()
-z_scores = (residuals - residuals.mean()) / residuals.std()
-anomalies = z_scores[np.abs(z_scores) > 3]
+    # -------------------------------------------------
+    # Final insight
+    # -------------------------------------------------
+    st.markdown("<div id='final-insight'></div>", unsafe_allow_html=True)
+    st.header("Final Business Insight")
 
-if anomalies.empty:
-    st.success("No unusual demand events detected recently.")
-else:
-    st.error(f"Detected {len(anomalies)} unusual demand events.")
-    st.dataframe(anomalies.rename("residual").tail(10))
+    st.markdown(
+        """
+        **In summary:**  
+        This system transforms historical data and forecasts into
+        **clear, actionable guidance** for inventory and planning decisions.
+        """
+    )
 
-st.divider()
+    with stage("Insight generation"):
+        insight = generate_business_insight(series, forecast_series)
+    st.success(insight)
 
-# -------------------------------------------------
-# Final insight
-# -------------------------------------------------
-st.markdown("<div id='final-insight'></div>", unsafe_allow_html=True)
-st.header("Final Business Insight")
+    st.subheader("Stores most at risk across the fleet")
 
-st.markdown(
-    """
-    **In summary:**  
-    This system transforms historical data and forecasts into
-    **clear, actionable guidance** for inventory and planning decisions.
-    """
-)
+    with stage("Fleet risk ranking"):
+        fleet_risk = load_fleet_risk(HORIZON)
+
+    st.dataframe(
+        fleet_risk[["Store", "trend_class", "volatility_class", "risk_score", "insight"]],
+        hide_index=True,
+        use_container_width=True
+    )
+    st.caption(
+        "Ranked from a fast seasonal forecast of every store. A risk score of 1 "
+        "means a store just reaches the ±10% trend or high-volatility threshold."
+    )
 
-insight = generate_business_insight(series, forecast_series)
-st.success(insight)
+    st.markdown("---")
 
-st.markdown("---")
+    st.caption(
+        """
+        **Built by Sarthak Shandilya**  
+        Tools used: Python, Pandas, Statsmodels, Prophet, Plotly, Streamlit
+        """
+    )
 
-st.caption(
-    """
-    **Built by Sarthak Shandilya**  
-    Tools used: Python, Pandas, Statsmodels, Prophet, Plotly, Streamlit
-    """
-)
+# -------------------------------------------------
+# Debug: per-stage timings
+# -------------------------------------------------
+try:
+    recorder.write()
+except OSError:
+    pass
+
+if st.sidebar.checkbox("Show timing breakdown", value=False):
+    timings = recorder.to_frame()
+    timings["stage"] = [
+        "  " * depth + name
+        for name, depth in zip(timings["stage"], timings["depth"])
+    ]
+    st.sidebar.dataframe(
+        timings[["stage", "seconds", "rss_delta_mb"]].round(3),
+        hide_index=True
+    )
 
 
 
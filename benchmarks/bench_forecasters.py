@@ -0,0 +1,280 @@
+"""
+Forecaster benchmark suite.
+
+Times every forecaster and walk-forward validation over synthetic and
+Rossmann-like series while varying history length, horizon and store
+count. Each case runs in a fresh process so its peak RSS is its own.
+Runs offline on CPU only.
+
+    python -m benchmarks.bench_forecasters --output benchmarks/latest.json
+    python -m benchmarks.bench_forecasters --compare benchmarks/baseline.json
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+
+FORECASTERS = {
+    "naive": ("src.baseline", "naive_forecast"),
+    "moving_average": ("src.baseline", "moving_average_forecast"),
+    "arima": ("src.forecasting", "arima_forecast"),
+    "sarima": ("src.forecasting", "sarima_forecast"),
+    "prophet": ("src.prophet_model", "prophet_forecast")
+}
+
+HISTORY_DAYS = [90, 365, 730, 1825]
+HORIZONS = [7, 14, 28]
+STORE_COUNTS = [1, 10, 50]
+QUICK_FORECASTERS = ["naive", "moving_average", "arima"]
+
+
+def synthetic_series(n_days: int, kind: str = "synthetic", seed: int = 0) -> pd.Series:
+    """
+    Daily sales series: smooth weekly sine ("synthetic") or a Rossmann-like
+    shape with Sunday closures, two-week promo cycles and holiday zeros.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2013-01-01", periods=n_days, freq="D", name="Date")
+    t = np.arange(n_days)
+
+    if kind == "synthetic":
+        values = 1000 + 0.5 * t + 200 * np.sin(2 * np.pi * t / 7)
+        values = values + rng.normal(0, 50, n_days)
+    elif kind == "rossmann":
+        weekday = np.array([1.15, 1.0, 0.95, 0.95, 1.05, 0.9, 0.0])
+        promo = np.where((t // 7) % 2 == 0, 1.25, 1.0)
+        values = 6000 * weekday[dates.dayofweek] * promo
+        values = values * rng.lognormal(0, 0.08, n_days)
+        values[rng.random(n_days) < 0.01] = 0
+    else:
+        raise ValueError(f"Unknown series kind: {kind!r}")
+
+    return pd.Series(np.round(np.clip(values, 0, None)), index=dates, name="Sales")
+
+
+def _panel(n_stores: int, n_days: int, kind: str) -> pd.DataFrame:
+    frames = []
+    for store_id in range(1, n_stores + 1):
+        series = synthetic_series(n_days, kind=kind, seed=store_id)
+        frames.append(pd.DataFrame({
+            "Store": store_id,
+            "Date": series.index,
+            "Sales": series.values
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _load_forecaster(name: str):
+    module_name, func_name = FORECASTERS[name]
+    module = __import__(module_name, fromlist=[func_name])
+    return getattr(module, func_name)
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_case(case: dict, repeats: int = 3) -> dict:
+    """
+    Run one benchmark case in the current process and return its metrics.
+    """
+    import logging
+    import warnings
+
+    warnings.filterwarnings("ignore")
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+
+    forecast_func = _load_forecaster(case["forecaster"])
+    rss_before = _peak_rss_mb()
+
+    if case["kind_of_run"] == "forecast":
+        series = synthetic_series(case["history_days"], case["series"])
+
+        def run():
+            forecast_func(series, horizon=case["horizon"])
+        fits = 1
+
+    elif case["kind_of_run"] == "batch":
+        from src.batch import batch_forecast
+
+        df = _panel(case["stores"], case["history_days"], case["series"])
+
+        def run():
+            batch_forecast(df, forecast_func, horizon=case["horizon"], n_jobs=1)
+        fits = case["stores"]
+
+    else:
+        from src.evaluation import walk_forward_validation
+
+        series = synthetic_series(case["history_days"], case["series"])
+        initial = case["history_days"] - case["horizon"] - case["backtest_days"]
+
+        def run():
+            return walk_forward_validation(
+                series,
+                forecast_func,
+                horizon=case["horizon"],
+                initial_train_size=initial,
+                step=case["step"]
+            )
+        fits = None
+
+    # Untimed warm-up: pays for the lazy statsmodels / Prophet imports, and
+    # gives the walk-forward fold count
+    warm_up = run()
+    if fits is None:
+        fits = len(warm_up)
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    wall = min(timings)
+    return {
+        **case,
+        "wall_seconds": wall,
+        "peak_rss_mb": _peak_rss_mb(),
+        "rss_growth_mb": _peak_rss_mb() - rss_before,
+        "fits_per_second": fits / wall if wall > 0 else float("inf")
+    }
+
+
+def build_cases(forecasters, quick: bool = False) -> list:
+    history_days = [90, 365] if quick else HISTORY_DAYS
+    horizons = [14] if quick else HORIZONS
+    store_counts = [1, 10] if quick else STORE_COUNTS
+    cases = []
+
+    for name in forecasters:
+        for series in ("synthetic", "rossmann"):
+            for days in history_days:
+                cases.append({
+                    "kind_of_run": "forecast", "forecaster": name,
+                    "series": series, "history_days": days,
+                    "horizon": 14, "stores": 1
+                })
+        for horizon in horizons:
+            if horizon != 14:
+                cases.append({
+                    "kind_of_run": "forecast", "forecaster": name,
+                    "series": "rossmann", "history_days": 365,
+                    "horizon": horizon, "stores": 1
+                })
+        for stores in store_counts:
+            cases.append({
+                "kind_of_run": "batch", "forecaster": name,
+                "series": "rossmann", "history_days": 365,
+                "horizon": 14, "stores": stores
+            })
+        cases.append({
+            "kind_of_run": "walk_forward", "forecaster": name,
+            "series": "rossmann", "history_days": 365, "horizon": 14,
+            "stores": 1, "backtest_days": 56, "step": 7
+        })
+
+    for case in cases:
+        case["case"] = "{kind_of_run}/{forecaster}/{series}/d{history_days}/h{horizon}/s{stores}".format(**case)
+    return cases
+
+
+def run_suite(cases: list, repeats: int = 3) -> dict:
+    """
+    Run every case in its own spawned process.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = []
+
+    for case in cases:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            result = executor.submit(run_case, case, repeats).result()
+        print(
+            f"{result['case']:<60} {result['wall_seconds']:9.4f}s "
+            f"{result['peak_rss_mb']:8.1f}MB {result['fits_per_second']:10.1f} fits/s",
+            flush=True
+        )
+        results.append(result)
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": multiprocessing.cpu_count(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "repeats": repeats
+        },
+        "results": results
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.25) -> list:
+    """
+    Cases whose wall time grew by more than `tolerance` over the baseline.
+    """
+    previous = {r["case"]: r for r in baseline["results"]}
+    regressions = []
+
+    for result in current["results"]:
+        before = previous.get(result["case"])
+        if before is None:
+            continue
+        ratio = result["wall_seconds"] / max(before["wall_seconds"], 1e-9)
+        if ratio > 1 + tolerance:
+            regressions.append({
+                "case": result["case"],
+                "baseline_seconds": before["wall_seconds"],
+                "current_seconds": result["wall_seconds"],
+                "ratio": ratio
+            })
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DemandIQ forecasters.")
+    parser.add_argument("--forecasters", nargs="*", choices=list(FORECASTERS))
+    parser.add_argument("--quick", action="store_true",
+                        help="small grid without SARIMA/Prophet")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", default="benchmarks/latest.json")
+    parser.add_argument("--compare", help="baseline JSON to check against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    forecasters = args.forecasters or (
+        QUICK_FORECASTERS if args.quick else list(FORECASTERS)
+    )
+    report = run_suite(build_cases(forecasters, quick=args.quick), args.repeats)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"Wrote {len(report['results'])} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        for row in regressions:
+            print(
+                f"REGRESSION {row['case']}: {row['baseline_seconds']:.4f}s -> "
+                f"{row['current_seconds']:.4f}s ({row['ratio']:.2f}x)"
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
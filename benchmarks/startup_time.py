@@ -0,0 +1,92 @@
+"""
+Cold-start import timings for the src package.
+
+Each scenario runs in a fresh interpreter and reports the median wall time
+and which heavy model backends ended up in sys.modules. Exits non-zero if
+a baseline-only batch worker imports Prophet or statsmodels.
+
+    python -m benchmarks.startup_time
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+
+HEAVY_MODULES = ["prophet", "cmdstanpy", "statsmodels", "sklearn"]
+
+SCENARIOS = {
+    "import pandas": "import pandas",
+    "import src.baseline": "import src.baseline",
+    "import src.forecasting": "import src.forecasting",
+    "import src.prophet_model": "import src.prophet_model",
+    "import src.evaluation": "import src.evaluation",
+    "import src.batch": "import src.batch",
+    "baseline worker": (
+        "import pandas as pd\n"
+        "from src.batch import batch_forecast\n"
+        "from src.baseline import naive_forecast\n"
+        "df = pd.DataFrame({'Store': 1, 'Sales': range(30),\n"
+        "                   'Date': pd.date_range('2015-01-01', periods=30)})\n"
+        "batch_forecast(df, naive_forecast, horizon=7, n_jobs=1)\n"
+    ),
+    "import prophet": "import prophet"
+}
+
+# Which scenarios must stay free of the heavy backends
+MUST_STAY_LIGHT = {"import src.baseline", "import src.batch", "baseline worker"}
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(code: str, repeats: int = 5) -> dict:
+    runs = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(code=code, heavy=HEAVY_MODULES)],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip().splitlines()[-1]
+        runs.append(json.loads(output))
+
+    return {
+        "median_seconds": statistics.median(run["seconds"] for run in runs),
+        "heavy_modules": runs[-1]["heavy"]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure src cold-start times.")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="optional JSON file for the results")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, code in SCENARIOS.items():
+        results[name] = measure(code, repeats=args.repeats)
+        heavy = ", ".join(results[name]["heavy_modules"]) or "-"
+        print(f"{name:<28} {results[name]['median_seconds']:7.3f}s  heavy: {heavy}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    leaks = [
+        name for name in MUST_STAY_LIGHT
+        if set(results[name]["heavy_modules"]) & {"prophet", "cmdstanpy", "statsmodels"}
+    ]
+    if leaks:
+        print(f"Heavy backends imported by: {', '.join(sorted(leaks))}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.panel import Panel, build_sales_matrix
+from src.profiling import timed
+
+
+def _centered_rolling_median(matrix: np.ndarray, window: int) -> np.ndarray:
+    """
+    Row-wise centered rolling median.
+
+    Near the edges the nearest full window is used instead of a truncated
+    one, so every window still covers each weekday exactly once.
+    """
+    n_days = matrix.shape[1]
+    window = min(window, n_days)
+    medians = np.median(sliding_window_view(matrix, window, axis=1), axis=2)
+
+    t = np.arange(n_days)
+    lower = np.clip(t - window // 2, 0, n_days - window)
+    return medians[:, lower]
+
+
+def decompose_weekly(matrix: np.ndarray, period: int = 7):
+    """
+    Additive trend / seasonal / residual split for every row at once.
+
+    The trend is a centered rolling median over one period and the
+    seasonal profile is the per-phase median of the detrended values, a
+    robust, vectorized stand-in for running STL store by store.
+    Returns (trend, seasonal, resid), each shaped like `matrix`.
+    """
+    trend = _centered_rolling_median(matrix, period)
+    detrended = matrix - trend
+
+    n_days = matrix.shape[1]
+    n_cycles = -(-n_days // period)
+    padded = np.full((matrix.shape[0], n_cycles * period), np.nan)
+    padded[:, :n_days] = detrended
+
+    profile = np.nanmedian(
+        padded.reshape(matrix.shape[0], n_cycles, period),
+        axis=1
+    )
+    profile -= profile.mean(axis=1, keepdims=True)
+
+    seasonal = np.tile(profile, n_cycles)[:, :n_days]
+    resid = detrended - seasonal
+    return trend, seasonal, resid
+
+
+def robust_zscores(resid: np.ndarray) -> np.ndarray:
+    """
+    Row-wise (x - median) / (1.4826 * MAD); flat rows score 0.
+    """
+    median = np.median(resid, axis=1, keepdims=True)
+    mad = np.median(np.abs(resid - median), axis=1, keepdims=True)
+    scale = 1.4826 * mad
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(scale > 0, (resid - median) / scale, 0.0)
+    return z
+
+
+def _score_rows(matrix: np.ndarray, period: int):
+    trend, seasonal, resid = decompose_weekly(matrix, period=period)
+    return trend + seasonal, resid, robust_zscores(resid)
+
+
+@timed
+def fleet_anomaly_scan(
+    df,
+    threshold: float = 3.0,
+    last_n_days: int = 7,
+    period: int = 7,
+    value_col: str = "Sales",
+    n_jobs: int = None
+) -> pd.DataFrame:
+    """
+    Rank anomalous store-days across every store in one pass.
+
+    Builds a stores x days matrix, decomposes all rows together and flags
+    days in the last `last_n_days` (all days if None) whose robust residual
+    z-score exceeds `threshold`. Row blocks are scored on a thread pool,
+    since the NumPy kernels release the GIL. `df` may also be a `Panel`,
+    which skips the pivot; blocks are then read straight from its
+    (possibly memory-mapped) matrix.
+    Columns: Store, Date, Sales, expected, residual, z_score.
+    """
+    if isinstance(df, Panel):
+        matrix, store_ids, dates = df.values, df.store_ids, df.dates
+    else:
+        matrix, store_ids, dates = build_sales_matrix(
+            df, value_col=value_col, dtype=np.float64
+        )
+
+    n_jobs = max(1, min(n_jobs or os.cpu_count() or 1, len(store_ids)))
+    blocks = np.array_split(np.arange(len(store_ids)), n_jobs)
+
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        results = list(executor.map(
+            lambda rows: _score_rows(matrix[rows].astype(np.float64, copy=False), period),
+            blocks
+        ))
+
+    expected = np.concatenate([r[0] for r in results])
+    resid = np.concatenate([r[1] for r in results])
+    z = np.concatenate([r[2] for r in results])
+
+    first_day = 0 if last_n_days is None else max(len(dates) - last_n_days, 0)
+    window = np.abs(z[:, first_day:]) > threshold
+    rows, cols = np.nonzero(window)
+    cols = cols + first_day
+
+    result = pd.DataFrame({
+        "Store": store_ids[rows],
+        "Date": dates[cols],
+        value_col: matrix[rows, cols],
+        "expected": expected[rows, cols],
+        "residual": resid[rows, cols],
+        "z_score": z[rows, cols]
+    })
+
+    order = np.argsort(-np.abs(result["z_score"].to_numpy()), kind="stable")
+    return result.iloc[order].reset_index(drop=True)
@@ -0,0 +1,164 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pandas as pd
+
+from src.cache import ForecastCache, make_key, model_name
+from src.registry import registered_forecast
+
+
+class ForecastPrefetcher:
+    """
+    Runs forecasts on a background thread pool.
+
+    `submit` returns a Future straight away so the caller can keep working
+    while the model fits. Requests for the same store, series and settings
+    share one Future, and results land in the shared `ForecastCache`, so a
+    finished prefetch is a cache hit later on. With a `ModelRegistry`, a
+    cache miss for a store fitted earlier (e.g. by a nightly batch run)
+    only runs the predict step.
+
+    One prefetcher can serve many viewers (e.g. dashboard sessions): each
+    passes its own `session`, and only its own speculative work is
+    cancelled when it asks for something else. Use `max_workers` above 1
+    so one viewer's fit does not hold up the others.
+    """
+
+    def __init__(
+        self,
+        cache: ForecastCache,
+        forecast_func,
+        max_workers: int = 1,
+        registry=None,
+        **forecast_kwargs
+    ):
+        self.cache = cache
+        self.registry = registry
+        self.forecast_func = forecast_func
+        self.forecast_kwargs = forecast_kwargs
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="forecast"
+        )
+        self._lock = threading.Lock()
+        self._pending = {}
+        # key -> sessions that only asked for it speculatively
+        self._speculative = {}
+
+    def _key(self, store_id, series: pd.Series, horizon: int) -> str:
+        return make_key(
+            store_id,
+            series,
+            model_name(self.forecast_func),
+            horizon=horizon,
+            **self.forecast_kwargs
+        )
+
+    def _run(self, store_id, series: pd.Series, horizon: int):
+        key = self._key(store_id, series, horizon)
+        forecast = self.cache.get(key)
+        if forecast is not None:
+            return forecast
+
+        if self.registry is not None:
+            forecast = registered_forecast(
+                self.registry,
+                store_id,
+                series,
+                self.forecast_func,
+                horizon,
+                **self.forecast_kwargs
+            )
+        else:
+            forecast = self.forecast_func(
+                series, horizon=horizon, **self.forecast_kwargs
+            )
+
+        self.cache.put(key, forecast)
+        return forecast
+
+    def submit(
+        self,
+        store_id,
+        series: pd.Series,
+        horizon: int,
+        speculative: bool = False,
+        session=None
+    ) -> Future:
+        """
+        Start (or join) the forecast for one store.
+
+        A non-speculative request withdraws this `session`'s queued
+        speculative requests, so the store being viewed is never stuck
+        behind prefetches for stores that may never be opened. Queued work
+        is cancelled once no session wants it any more; other sessions'
+        prefetches are left alone.
+        """
+        key = self._key(store_id, series, horizon)
+
+        with self._lock:
+            # Finished futures are no longer needed: their results are cached
+            self._pending = {
+                k: f for k, f in self._pending.items() if not f.done()
+            }
+            self._speculative = {
+                k: sessions for k, sessions in self._speculative.items()
+                if k in self._pending
+            }
+
+            if not speculative:
+                # Someone is waiting on this one now; it is no longer speculative
+                self._speculative.pop(key, None)
+                for other, sessions in list(self._speculative.items()):
+                    sessions.discard(session)
+                    if not sessions and self._pending[other].cancel():
+                        del self._pending[other]
+                        del self._speculative[other]
+
+            future = self._pending.get(key)
+            if future is not None:
+                if speculative and key in self._speculative:
+                    self._speculative[key].add(session)
+                return future
+
+            cached = self.cache.get(key)
+            if cached is not None:
+                future = Future()
+                future.set_result(cached)
+                return future
+
+            future = self._executor.submit(self._run, store_id, series, horizon)
+            self._pending[key] = future
+            if speculative:
+                self._speculative[key] = {session}
+            return future
+
+    def prefetch(self, store_ids, get_series, horizon: int, session=None) -> None:
+        """
+        Queue speculative forecasts for stores the user is likely to open next.
+
+        `get_series(store_id)` supplies each store's history.
+        """
+        for store_id in store_ids:
+            self.submit(
+                store_id, get_series(store_id), horizon,
+                speculative=True, session=session
+            )
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def neighbouring_stores(store_ids, store_id, radius: int = 1) -> list:
+    """
+    Store ids within `radius` positions of `store_id`, nearest first.
+    """
+    store_ids = list(store_ids)
+    position = store_ids.index(store_id)
+
+    neighbours = []
+    for offset in range(1, radius + 1):
+        for index in (position + offset, position - offset):
+            if 0 <= index < len(store_ids):
+                neighbours.append(store_ids[index])
+    return neighbours
@@ -5,8 +5,10 @@ import numpy as np
 def naive_forecast(series: pd.Series, horizon: int):
     """
     Forecast using the last observed value.
+
+    Accepts a Series or a 1-D array such as a `Panel` row.
     """
-    last_value = series.iloc[-1]
+    last_value = np.asarray(series)[-1]
     forecast = np.repeat(last_value, horizon)
 
     return pd.Series(forecast)
@@ -16,7 +18,7 @@ def moving_average_forecast(series: pd.Series, horizon: int, window: int = 7):
     """
     Forecast using simple moving average.
     """
-    avg = series.iloc[-window:].mean()
+    avg = np.nanmean(np.asarray(series, dtype=np.float64)[-window:])
     forecast = np.repeat(avg, horizon)
 
     return pd.Series(forecast)
\ No newline at end of file
@@ -0,0 +1,234 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from src.cache import cached_forecast
+from src.data_loader import prepare_series
+from src.registry import registered_forecast
+from src.profiling import timed
+
+
+OUTPUT_COLUMNS = ["Store", "Date", "yhat", "yhat_lower", "yhat_upper", "error"]
+
+
+def _to_forecast_frame(forecast, last_date) -> pd.DataFrame:
+    """
+    Normalise any forecaster output into Date / yhat / yhat_lower / yhat_upper.
+    """
+    if isinstance(forecast, pd.DataFrame):
+        frame = forecast.copy()
+    else:
+        index = getattr(forecast, "index", None)
+        frame = pd.DataFrame({"yhat": np.asarray(forecast, dtype=float)}, index=index)
+
+    # Baselines return a RangeIndex, so give them real future dates
+    if not isinstance(frame.index, pd.DatetimeIndex):
+        frame.index = pd.date_range(
+            last_date + pd.Timedelta(days=1),
+            periods=len(frame),
+            freq="D"
+        )
+
+    for col in ("yhat_lower", "yhat_upper"):
+        if col not in frame.columns:
+            frame[col] = np.nan
+
+    frame.index.name = "Date"
+    return frame[["yhat", "yhat_lower", "yhat_upper"]].reset_index()
+
+
+def _failed_rows(store_ids, error: str) -> pd.DataFrame:
+    return pd.DataFrame({
+        "Store": list(store_ids),
+        "Date": pd.NaT,
+        "yhat": np.nan,
+        "yhat_lower": np.nan,
+        "yhat_upper": np.nan,
+        "error": error
+    })
+
+
+def _forecast_chunk(
+    chunk: list,
+    forecast_func,
+    horizon: int,
+    value_col: str,
+    forecast_kwargs: dict,
+    cache=None,
+    features=None,
+    registry=None,
+    store_kwargs=None
+) -> pd.DataFrame:
+    """
+    Forecast every store in a chunk, isolating failures per store.
+    """
+    frames = []
+
+    for store_id, store_df in chunk:
+        try:
+            series = prepare_series(store_df, value_col=value_col)
+            kwargs = forecast_kwargs
+            if store_kwargs is not None and store_id in store_kwargs:
+                kwargs = {**kwargs, **store_kwargs[store_id]}
+            if features is not None:
+                exog, future_exog = features.regressors_for(
+                    store_id, series.index, horizon
+                )
+                kwargs = {**kwargs, "exog": exog, "future_exog": future_exog}
+
+            if registry is not None:
+                forecast = registered_forecast(
+                    registry, store_id, series, forecast_func, horizon,
+                    **kwargs
+                )
+            elif cache is not None:
+                forecast = cached_forecast(
+                    cache, store_id, series, forecast_func, horizon,
+                    **kwargs
+                )
+            else:
+                forecast = forecast_func(
+                    series, horizon=horizon, **kwargs
+                )
+            frame = _to_forecast_frame(forecast, series.index[-1])
+            frame.insert(0, "Store", store_id)
+            frame["error"] = None
+        except Exception as exc:
+            frame = _failed_rows([store_id], f"{type(exc).__name__}: {exc}")
+
+        frames.append(frame)
+
+    return pd.concat(frames, ignore_index=True)[OUTPUT_COLUMNS]
+
+
+def _split_stores(
+    df: pd.DataFrame,
+    value_col: str,
+    stores=None
+) -> list:
+    columns = ["Store", "Date", value_col]
+    if stores is not None:
+        df = df[df["Store"].isin(stores)]
+
+    return [
+        (store_id, store_df[["Date", value_col]])
+        for store_id, store_df in df[columns].groupby("Store", sort=True)
+    ]
+
+
+def iter_batch_forecast(
+    df: pd.DataFrame,
+    forecast_func,
+    horizon: int = 14,
+    n_jobs: int = None,
+    chunk_size: int = None,
+    stores=None,
+    value_col: str = "Sales",
+    cache=None,
+    features=None,
+    registry=None,
+    store_kwargs=None,
+    **forecast_kwargs
+):
+    """
+    Forecast every store in `df` and yield one tidy frame per finished chunk.
+
+    Stores are grouped into chunks so each worker task amortises process
+    overhead across several fits. A failing store yields a single row with
+    its `error` message instead of aborting the run. With a `ForecastCache`,
+    stores whose series and parameters are unchanged skip the fit entirely.
+    With a `FeatureStore`, each store's regressors are sliced from it and
+    passed as `exog` / `future_exog`. With a `ModelRegistry`, stores whose
+    model was already fitted on the same data only run the predict step.
+    `store_kwargs` maps store ids to extra keyword arguments for that
+    store only, e.g. per-store SARIMA orders from `select_orders`.
+    """
+    items = _split_stores(df, value_col, stores=stores)
+    if not items:
+        return
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(items) // (n_jobs * 4)))
+
+    chunks = [
+        items[i:i + chunk_size]
+        for i in range(0, len(items), chunk_size)
+    ]
+
+    if n_jobs == 1:
+        for chunk in chunks:
+            yield _forecast_chunk(
+                chunk, forecast_func, horizon, value_col, forecast_kwargs,
+                cache, features, registry, store_kwargs
+            )
+        return
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = {
+            executor.submit(
+                _forecast_chunk,
+                chunk,
+                forecast_func,
+                horizon,
+                value_col,
+                forecast_kwargs,
+                cache,
+                features,
+                registry,
+                store_kwargs
+            ): chunk
+            for chunk in chunks
+        }
+
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as exc:
+                # A crashed worker takes its whole chunk down with it
+                store_ids = [store_id for store_id, _ in futures[future]]
+                yield _failed_rows(store_ids, f"{type(exc).__name__}: {exc}")
+
+
+@timed
+def batch_forecast(
+    df: pd.DataFrame,
+    forecast_func,
+    horizon: int = 14,
+    n_jobs: int = None,
+    chunk_size: int = None,
+    stores=None,
+    value_col: str = "Sales",
+    cache=None,
+    features=None,
+    registry=None,
+    store_kwargs=None,
+    **forecast_kwargs
+) -> pd.DataFrame:
+    """
+    Forecast all stores in parallel and return one tidy frame.
+
+    Columns: Store, Date, yhat, yhat_lower, yhat_upper, error.
+    """
+    frames = list(iter_batch_forecast(
+        df,
+        forecast_func,
+        horizon=horizon,
+        n_jobs=n_jobs,
+        chunk_size=chunk_size,
+        stores=stores,
+        value_col=value_col,
+        cache=cache,
+        features=features,
+        registry=registry,
+        store_kwargs=store_kwargs,
+        **forecast_kwargs
+    ))
+
+    if not frames:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+
+    result = pd.concat(frames, ignore_index=True)
+    return result.sort_values(["Store", "Date"]).reset_index(drop=True)
@@ -0,0 +1,249 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+
+DEFAULT_CACHE_DIR = Path("data/cache/forecasts")
+
+
+def data_fingerprint(data) -> str:
+    """
+    Stable content hash of a Series or DataFrame, including its index.
+    """
+    hashed = pd.util.hash_pandas_object(data, index=True).values
+    digest = hashlib.sha1(hashed.tobytes())
+
+    if isinstance(data, pd.DataFrame):
+        digest.update(",".join(map(str, data.columns)).encode())
+
+    return digest.hexdigest()
+
+
+def model_name(forecast_func) -> str:
+    qualname = getattr(forecast_func, "__qualname__", None)
+    if qualname is None:
+        # Configured callables such as ConformalForecaster are named by repr
+        return repr(forecast_func)
+    return f"{forecast_func.__module__}.{qualname}"
+
+
+def _key_default(value):
+    # repr() of a frame elides rows, so regressors are keyed by content
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return data_fingerprint(value)
+    return repr(value)
+
+
+def make_key(store_id, series: pd.Series, name: str, **kwargs) -> str:
+    """
+    Cache key from (store id, series fingerprint, model name, kwargs).
+    """
+    payload = json.dumps(
+        [str(store_id), data_fingerprint(series), name, kwargs],
+        sort_keys=True,
+        default=_key_default
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class ForecastCache:
+    """
+    Two-level forecast cache: an in-process LRU in front of a pickle directory.
+
+    Entries older than `max_age_seconds` are treated as misses. The memory
+    layer keeps at most `max_memory_items` entries and the disk layer is
+    trimmed, oldest first, to `max_disk_bytes`. Pass `cache_dir=None` for a
+    memory-only cache. Safe to share between threads.
+
+    The disk size is tallied in memory from one directory scan, so a `put`
+    does not list the directory. The directory is only rescanned, picking
+    up files written by other processes, when the tally passes the limit;
+    eviction then trims to 90% of it so the next rescan is many puts away.
+    Values are copied in and out, so callers may modify what they get.
+    """
+
+    def __init__(
+        self,
+        cache_dir=DEFAULT_CACHE_DIR,
+        max_memory_items: int = 256,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+        max_age_seconds: float = 7 * 24 * 3600
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self.max_age_seconds = max_age_seconds
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        # path -> size, oldest first; None until the first put scans the directory
+        self._disk_entries = None
+        self._disk_bytes = 0
+
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def __getstate__(self):
+        # Worker processes get the settings, not a copy of the memory layer
+        state = self.__dict__.copy()
+        state["_memory"] = OrderedDict()
+        state["_disk_entries"] = None
+        state["_disk_bytes"] = 0
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pkl"
+
+    def _expired(self, created: float) -> bool:
+        return (
+            self.max_age_seconds is not None
+            and time.time() - created > self.max_age_seconds
+        )
+
+    def get(self, key: str):
+        """
+        Return the cached value for `key`, or None on a miss.
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, value = entry
+                if not self._expired(created):
+                    self._memory.move_to_end(key)
+                    return _copy(value)
+                del self._memory[key]
+
+        if self.cache_dir is None:
+            return None
+
+        path = self._path(key)
+        try:
+            created = path.stat().st_mtime
+            if self._expired(created):
+                path.unlink(missing_ok=True)
+                return None
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+        self._remember(key, _copy(value), created)
+        return value
+
+    def put(self, key: str, value) -> None:
+        self._remember(key, _copy(value), time.time())
+
+        if self.cache_dir is None:
+            return
+
+        # Write then rename so concurrent readers never see a partial file
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+        self._track_disk(path)
+
+    def _remember(self, key: str, value, created: float) -> None:
+        with self._lock:
+            self._memory[key] = (created, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    def _scan_disk(self) -> None:
+        entries = []
+        for path in self.cache_dir.glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if self._expired(stat.st_mtime):
+                path.unlink(missing_ok=True)
+            else:
+                entries.append((stat.st_mtime, path, stat.st_size))
+
+        self._disk_entries = OrderedDict(
+            (path, size) for _, path, size in sorted(entries)
+        )
+        self._disk_bytes = sum(self._disk_entries.values())
+
+    def _track_disk(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return
+
+        with self._lock:
+            if self._disk_entries is None:
+                self._scan_disk()
+            else:
+                self._disk_bytes -= self._disk_entries.pop(path, 0)
+                self._disk_entries[path] = size
+                self._disk_bytes += size
+
+            if self._disk_bytes <= self.max_disk_bytes:
+                return
+
+            # Other processes may have written too; evict from a fresh listing
+            self._scan_disk()
+            target = 0.9 * self.max_disk_bytes
+            while self._disk_bytes > target and self._disk_entries:
+                oldest, size = self._disk_entries.popitem(last=False)
+                oldest.unlink(missing_ok=True)
+                self._disk_bytes -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._disk_entries = None
+            self._disk_bytes = 0
+        if self.cache_dir is not None:
+            for path in self.cache_dir.glob("*.pkl"):
+                path.unlink(missing_ok=True)
+
+
+def _copy(value):
+    # The memory layer must not share frames with callers that mutate them
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return value.copy()
+    return value
+
+
+def cached_forecast(
+    cache: ForecastCache,
+    store_id,
+    series: pd.Series,
+    forecast_func,
+    horizon: int,
+    **forecast_kwargs
+):
+    """
+    Return `forecast_func(series, horizon, **kwargs)`, computing it only once.
+    """
+    key = make_key(
+        store_id,
+        series,
+        model_name(forecast_func),
+        horizon=horizon,
+        **forecast_kwargs
+    )
+
+    forecast = cache.get(key)
+    if forecast is None:
+        forecast = forecast_func(series, horizon=horizon, **forecast_kwargs)
+        cache.put(key, forecast)
+
+    return forecast
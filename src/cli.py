@@ -0,0 +1,334 @@
+"""
+Headless batch forecasting.
+
+    python -m src.cli --model prophet --horizon 14 --output forecasts/
+    python -m src.cli --model sarima --stores 1-100 --shard 0/4 --workers 8
+
+Completed chunks are checkpointed as Parquet parts under <output>/parts,
+so re-running the same command after a crash skips finished stores whose
+data has not changed since. The parts are removed once a run succeeds.
+"""
+import argparse
+import os
+import shutil
+import sys
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.baseline import naive_forecast, moving_average_forecast
+from src.batch import iter_batch_forecast
+from src.cache import ForecastCache
+from src.conformal import ConformalForecaster
+from src.data_loader import list_stores, load_data
+from src.data_quality import load_quality_report, store_issues
+from src.features import FeatureStore
+from src.forecasting import arima_forecast, sarima_forecast
+from src.order_search import OrderCache, select_orders
+from src.prophet_model import prophet_forecast
+from src.registry import ModelRegistry
+from src.scenario import fleet_scenario_grid
+from src.seasonal_engine import METHODS as FLEET_METHODS, fleet_forecast
+from src.store_index import StoreIndex
+
+
+FORECASTERS = {
+    "naive": (naive_forecast, {}),
+    "moving_average": (moving_average_forecast, {}),
+    "arima": (arima_forecast, {}),
+    "sarima": (sarima_forecast, {}),
+    "prophet": (prophet_forecast, {"return_intervals": True})
+}
+
+# Forecasters that accept exog / future_exog
+REGRESSOR_MODELS = {"sarima", "prophet"}
+
+
+def parse_stores(text: str) -> list:
+    """
+    Parse "1,2,10-20" into a sorted list of store ids.
+    """
+    stores = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            stores.update(range(int(first), int(last) + 1))
+        else:
+            stores.add(int(part))
+    return sorted(stores)
+
+
+def parse_shard(text: str) -> tuple:
+    """
+    Parse "i/N" (0-based shard i of N).
+    """
+    try:
+        index, count = (int(value) for value in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"--shard must look like i/N, got {text!r}")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"--shard index must be in [0, {count})")
+    return index, count
+
+
+def shard_stores(stores: list, index: int, count: int) -> list:
+    # Round-robin so each shard gets a similar mix of store sizes
+    return sorted(stores)[index::count]
+
+
+def data_versions(df: pd.DataFrame, value_col: str = "Sales") -> dict:
+    """
+    Content hash of each store's rows, as {store id: hex string}.
+
+    Row hashes are summed per store, so the version does not depend on row
+    order but changes with any added, removed or edited row.
+    """
+    row_hashes = pd.util.hash_pandas_object(df[["Date", value_col]], index=False).to_numpy()
+    stores = df["Store"].to_numpy()
+    order = np.argsort(stores, kind="stable")
+    store_ids, first_row = np.unique(stores[order], return_index=True)
+    if not len(store_ids):
+        return {}
+
+    # uint64 sums wrap around, which keeps them a valid hash
+    totals = np.add.reduceat(row_hashes[order], first_row)
+    return {
+        store_id: f"{total:016x}"
+        for store_id, total in zip(store_ids.tolist(), totals.tolist())
+    }
+
+
+def _current_rows(part: pd.DataFrame, versions: dict) -> pd.DataFrame:
+    # Parts written against other data (or before versions existed) are stale
+    if "data_version" not in part.columns:
+        return part.iloc[:0]
+    return part[part["data_version"] == part["Store"].map(versions)]
+
+
+def completed_stores(parts_dir: Path, versions: dict) -> set:
+    """
+    Stores with a successful forecast in a checkpoint part for their current data.
+    """
+    done = set()
+    for path in parts_dir.glob("part-*.parquet"):
+        part = _current_rows(pd.read_parquet(path), versions)
+        done.update(part.loc[part["error"].isna(), "Store"].tolist())
+    return done
+
+
+def write_part(frame: pd.DataFrame, parts_dir: Path, versions: dict) -> Path:
+    """
+    Atomically write one finished chunk as a checkpoint part.
+
+    Each row is tagged with its store's data version.
+    """
+    path = parts_dir / f"part-{uuid.uuid4().hex}.parquet"
+    tmp_path = path.with_suffix(".tmp")
+    frame.assign(data_version=frame["Store"].map(versions)).to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def merge_parts(parts_dir: Path, stores: list, versions: dict) -> pd.DataFrame:
+    """
+    Combine checkpoint parts for `stores`, keeping one outcome per store.
+
+    Only rows for each store's current data version are used. A store that
+    failed in an earlier attempt and succeeded on resume only keeps its
+    successful rows.
+    """
+    paths = sorted(parts_dir.glob("part-*.parquet"), key=lambda p: p.stat().st_mtime)
+    if not paths:
+        return pd.DataFrame()
+
+    df = pd.concat(
+        [_current_rows(pd.read_parquet(path), versions) for path in paths],
+        ignore_index=True
+    ).drop(columns="data_version")
+    df = df[df["Store"].isin(stores)]
+
+    succeeded = df[df["error"].isna()]
+    failed = df[df["error"].notna() & ~df["Store"].isin(succeeded["Store"])]
+    failed = failed.drop_duplicates("Store", keep="last")
+
+    result = pd.concat([succeeded, failed], ignore_index=True)
+    return result.sort_values(["Store", "Date"]).reset_index(drop=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Forecast many stores and write the results to Parquet."
+    )
+    parser.add_argument("--data-path", default="data/raw")
+    parser.add_argument("--model", choices=[*FORECASTERS, *FLEET_METHODS],
+                        default="prophet")
+    parser.add_argument("--horizon", type=int, default=14)
+    parser.add_argument("--stores", type=parse_stores,
+                        help="store ids and ranges, e.g. 1,5,10-20 (default: all)")
+    parser.add_argument("--shard", type=parse_shard, default=(0, 1),
+                        help="0-based shard i/N of the store list")
+    parser.add_argument("--output", default="forecasts")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--chunk-size", type=int)
+    parser.add_argument("--cache", action="store_true",
+                        help="reuse forecasts from the on-disk forecast cache")
+    parser.add_argument("--registry", action="store_true",
+                        help="load fitted models from the model registry and "
+                             "register new fits, so later runs only predict")
+    parser.add_argument("--fresh", action="store_true",
+                        help="ignore existing checkpoints for this output")
+    parser.add_argument("--auto-order", action="store_true",
+                        help="pick SARIMA orders per store by AIC search "
+                             "(cached, so later runs skip the search)")
+    parser.add_argument("--conformal", action="store_true",
+                        help="80%% intervals from walk-forward residuals "
+                             "instead of the model's own")
+    parser.add_argument("--scenarios", action="store_true",
+                        help="also write Monte-Carlo inventory quantiles per store, "
+                             "demand change and service level")
+    parser.add_argument("--quality", choices=["flag", "skip"],
+                        help="check each store's data before fitting and list "
+                             "problem stores, or leave them out of the run")
+    parser.add_argument("--regressors", action="store_true",
+                        help="use Open/Promo/holiday flags as regressors "
+                             "(sarima and prophet only)")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    shard_index, shard_count = args.shard
+
+    if args.regressors and args.model not in REGRESSOR_MODELS:
+        parser.error(f"--regressors needs one of {sorted(REGRESSOR_MODELS)}")
+    if args.auto_order and args.model != "sarima":
+        parser.error("--auto-order applies to --model sarima only")
+    if args.conformal and args.model in FLEET_METHODS:
+        parser.error("--conformal applies to the per-store models only")
+    if args.scenarios and not (
+        args.conformal
+        or args.model in FLEET_METHODS
+        or FORECASTERS[args.model][1].get("return_intervals")
+    ):
+        parser.error("--scenarios needs prediction intervals; add --conformal")
+
+    stores = list_stores(args.data_path)
+    if args.stores is not None:
+        stores = sorted(set(stores) & set(args.stores))
+    stores = shard_stores(stores, shard_index, shard_count)
+
+    output_dir = Path(args.output)
+    run_name = (
+        f"{args.model}{'-exog' if args.regressors else ''}"
+        f"{'-auto' if args.auto_order else ''}"
+        f"{'-conformal' if args.conformal else ''}-h{args.horizon}"
+    )
+    suffix = f"-shard-{shard_index}-of-{shard_count}" if shard_count > 1 else ""
+    # One directory per shard, so a finished shard can remove its parts
+    parts_dir = output_dir / "parts" / f"{run_name}{suffix}"
+    parts_dir.mkdir(parents=True, exist_ok=True)
+
+    if args.fresh:
+        for path in parts_dir.glob("part-*.parquet"):
+            path.unlink()
+
+    if args.quality:
+        # Covers every store in the shard, including any already forecast
+        issues = store_issues(load_quality_report(args.data_path, stores=stores))
+        for store_id, reason in issues.items():
+            print(f"Store {store_id}: {reason}", flush=True)
+        if args.quality == "skip" and len(issues):
+            skipped = set(issues.index.tolist())
+            stores = [s for s in stores if s not in skipped]
+        print(
+            f"Data quality: {len(issues)} stores flagged"
+            f"{', skipped' if args.quality == 'skip' else ''}",
+            flush=True
+        )
+
+    df = load_data(
+        args.data_path,
+        stores=stores,
+        columns=["Store", "Date", "Sales"]
+    )
+    versions = data_versions(df)
+
+    done = completed_stores(parts_dir, versions)
+    pending = [store_id for store_id in stores if store_id not in done]
+    print(
+        f"Shard {shard_index}/{shard_count}: {len(stores)} stores, "
+        f"{len(stores) - len(pending)} already done, {len(pending)} to forecast",
+        flush=True
+    )
+
+    if pending:
+        df = df[df["Store"].isin(pending)]
+
+        if args.model in FLEET_METHODS:
+            # Vectorized across all stores in one pass; no chunking needed
+            write_part(fleet_forecast(df, args.horizon, method=args.model), parts_dir, versions)
+            print(f"[{len(pending)}/{len(pending)}] stores forecast", flush=True)
+        else:
+            forecast_func, forecast_kwargs = FORECASTERS[args.model]
+            features = FeatureStore.from_data(args.data_path) if args.regressors else None
+            if args.conformal:
+                forecast_func = ConformalForecaster(forecast_func)
+                forecast_kwargs = {"return_intervals": True}
+
+            store_kwargs = None
+            if args.auto_order:
+                index = StoreIndex(df)
+                search_errors = {}
+                store_kwargs = select_orders(
+                    {s: index.get_series(s) for s in index.store_ids.tolist()},
+                    cache=OrderCache(),
+                    n_jobs=args.workers,
+                    errors=search_errors
+                )
+                for store_id, error in search_errors.items():
+                    print(f"Store {store_id}: order search failed, using defaults ({error})", flush=True)
+                print(f"SARIMA orders ready for {len(store_kwargs)} stores", flush=True)
+
+            finished = 0
+            for frame in iter_batch_forecast(
+                df,
+                forecast_func,
+                horizon=args.horizon,
+                n_jobs=args.workers,
+                chunk_size=args.chunk_size,
+                cache=ForecastCache() if args.cache else None,
+                features=features,
+                registry=ModelRegistry() if args.registry else None,
+                store_kwargs=store_kwargs,
+                **forecast_kwargs
+            ):
+                write_part(frame, parts_dir, versions)
+                finished += frame["Store"].nunique()
+                print(f"[{finished}/{len(pending)}] stores forecast", flush=True)
+
+    result = merge_parts(parts_dir, stores, versions)
+    output_path = output_dir / f"forecasts-{run_name}{suffix}.parquet"
+    result.to_parquet(output_path, index=False)
+
+    failures = result.loc[result["error"].notna(), "Store"].nunique() if len(result) else 0
+    print(f"Wrote {output_path} ({failures} failed stores)")
+
+    # Checkpoints only matter for resuming; keep them while stores still fail
+    if not failures:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+
+    if args.scenarios:
+        scenario_path = output_dir / f"scenarios-{run_name}{suffix}.parquet"
+        fleet_scenario_grid(result).to_frame().to_parquet(scenario_path, index=False)
+        print(f"Wrote {scenario_path}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
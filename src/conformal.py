@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+
+from src.cache import model_name
+from src.evaluation import walk_forward_residuals
+
+
+DEFAULT_COVERAGE = 0.8
+
+# An 80% band needs ceil((n + 1) * 0.9) <= n, i.e. at least 9 folds
+DEFAULT_N_FOLDS = 10
+
+
+def conformal_quantiles(residuals: np.ndarray, coverage: float = DEFAULT_COVERAGE):
+    """
+    Split-conformal bounds on the error at each horizon step.
+
+    Uses the signed residual quantiles with the (n + 1) finite-sample
+    correction, so each step's interval covers at least `coverage` of
+    exchangeable future errors. Raises ValueError when there are too few
+    folds for that guarantee. Returns (lower, upper) offsets, each shaped
+    (horizon,).
+    """
+    n = residuals.shape[0]
+    tail = (1 - coverage) / 2
+    rank = int(np.ceil((n + 1) * (1 - tail) - 1e-9))
+    if rank > n:
+        raise ValueError(
+            f"{n} residual folds cannot guarantee {coverage:.0%} coverage; "
+            f"need at least {int(np.ceil((1 - tail) / tail - 1e-9))}"
+        )
+    # The rank-th smallest error bounds the upper tail, the rank-th largest the lower
+    ordered = np.sort(residuals, axis=0)
+    return ordered[n - rank], ordered[rank - 1]
+
+
+def calibrate(
+    series: pd.Series,
+    forecast_func,
+    horizon: int,
+    coverage: float = DEFAULT_COVERAGE,
+    n_folds: int = DEFAULT_N_FOLDS,
+    step: int = 7,
+    **forecast_kwargs
+) -> dict:
+    """
+    Per-step interval offsets from the model's own walk-forward errors.
+
+    The result is plain data, so it can be stored next to a fitted model
+    and reused with `conformal_forecast(calibration=...)`.
+    """
+    residuals = walk_forward_residuals(
+        series,
+        forecast_func,
+        horizon,
+        n_folds=n_folds,
+        step=step,
+        **forecast_kwargs
+    )
+    lower, upper = conformal_quantiles(residuals, coverage)
+    return {
+        "model": model_name(forecast_func),
+        "coverage": coverage,
+        "n_folds": residuals.shape[0],
+        "lower": lower.tolist(),
+        "upper": upper.tolist()
+    }
+
+
+def conformal_forecast(
+    series: pd.Series,
+    horizon: int,
+    forecast_func,
+    return_intervals: bool = True,
+    coverage: float = DEFAULT_COVERAGE,
+    n_folds: int = DEFAULT_N_FOLDS,
+    step: int = 7,
+    calibration: dict = None,
+    **forecast_kwargs
+):
+    """
+    Point forecast from `forecast_func` with conformal prediction intervals.
+
+    The forecaster is only asked for point forecasts, so Prophet skips its
+    uncertainty sampling. Output matches `prophet_forecast`: a ds-indexed
+    frame of yhat / yhat_lower / yhat_upper, or just yhat.
+    """
+    if calibration is None:
+        calibration = calibrate(
+            series, forecast_func, horizon, coverage, n_folds, step,
+            **forecast_kwargs
+        )
+
+    forecast = forecast_func(series, horizon=horizon, **forecast_kwargs)
+    return apply_calibration(
+        forecast, calibration, series.index[-1], horizon, return_intervals
+    )
+
+
+def apply_calibration(
+    forecast,
+    calibration: dict,
+    last_date,
+    horizon: int,
+    return_intervals: bool = True
+):
+    """
+    Add stored conformal offsets to an existing point forecast.
+    """
+    if len(calibration["lower"]) < horizon:
+        raise ValueError(f"Calibration covers {len(calibration['lower'])} steps, need {horizon}")
+
+    if isinstance(forecast, pd.DataFrame):
+        forecast = forecast["yhat"]
+
+    index = getattr(forecast, "index", None)
+    if not isinstance(index, pd.DatetimeIndex):
+        index = pd.date_range(
+            last_date + pd.Timedelta(days=1),
+            periods=horizon,
+            freq="D"
+        )
+    index = index.rename("ds")
+
+    yhat = np.asarray(forecast, dtype=float)
+    if not return_intervals:
+        return pd.Series(yhat, index=index)
+
+    return pd.DataFrame({
+        "yhat": yhat,
+        "yhat_lower": yhat + np.asarray(calibration["lower"][:horizon]),
+        "yhat_upper": yhat + np.asarray(calibration["upper"][:horizon])
+    }, index=index)
+
+
+class ConformalForecaster:
+    """
+    Wrap any forecaster so it returns conformal intervals.
+
+    Instances have the usual `(series, horizon, return_intervals=False,
+    **kwargs)` signature and pickle cleanly, so they can be used anywhere a
+    forecaster is expected: the batch runner, the CLI, the forecast cache.
+
+    Calibrating costs `n_folds` extra fits. With `calibrate_missing=False`
+    the wrapper only applies calibrations already stored in a
+    `ModelRegistry` and otherwise returns the model's own intervals, which
+    keeps interactive callers at a single fit.
+    """
+
+    def __init__(
+        self,
+        forecast_func,
+        coverage: float = DEFAULT_COVERAGE,
+        n_folds: int = DEFAULT_N_FOLDS,
+        step: int = 7,
+        calibrate_missing: bool = True
+    ):
+        self.forecast_func = forecast_func
+        self.coverage = coverage
+        self.n_folds = n_folds
+        self.step = step
+        self.calibrate_missing = calibrate_missing
+
+    def __call__(
+        self,
+        series: pd.Series,
+        horizon: int,
+        return_intervals: bool = False,
+        **forecast_kwargs
+    ):
+        if not self.calibrate_missing:
+            return self.forecast_func(
+                series,
+                horizon=horizon,
+                return_intervals=return_intervals,
+                **forecast_kwargs
+            )
+        return conformal_forecast(
+            series,
+            horizon,
+            self.forecast_func,
+            return_intervals=return_intervals,
+            coverage=self.coverage,
+            n_folds=self.n_folds,
+            step=self.step,
+            **forecast_kwargs
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"ConformalForecaster({model_name(self.forecast_func)}, "
+            f"coverage={self.coverage}, n_folds={self.n_folds}, step={self.step}"
+            f"{'' if self.calibrate_missing else ', calibrate_missing=False'})"
+        )
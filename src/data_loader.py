@@ -1,6 +1,178 @@
-from pathlib import Path
-import pandas as pd
-
-def load_data(data_path="data/raw"):
-    parquet_path = Path(data_path) / "train.parquet"
-    return pd.read_parquet(parquet_path)
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from src.profiling import timed
+
+
+PARTITIONED_DIR = "train"
+
+STORE_DTYPES = {
+    "Store": "int16",
+    "StoreType": pd.CategoricalDtype(["a", "b", "c", "d"]),
+    "Assortment": pd.CategoricalDtype(["a", "b", "c"]),
+    "CompetitionDistance": "float32",
+    "CompetitionOpenSinceMonth": "Int8",
+    "CompetitionOpenSinceYear": "Int16",
+    "Promo2": "int8",
+    "Promo2SinceWeek": "Int8",
+    "Promo2SinceYear": "Int16",
+    "PromoInterval": "category"
+}
+
+# Hive layout: train/Store=<id>/part-*.parquet
+STORE_PARTITIONING = ds.partitioning(
+    pa.schema([("Store", pa.int16())]),
+    flavor="hive"
+)
+
+
+def _open_dataset(data_path="data/raw") -> ds.Dataset:
+    """
+    Prefer the store-partitioned dataset, fall back to a single train.parquet.
+    """
+    dataset_path = Path(data_path) / PARTITIONED_DIR
+    if dataset_path.is_dir():
+        return ds.dataset(
+            dataset_path,
+            format="parquet",
+            partitioning=STORE_PARTITIONING
+        )
+
+    return ds.dataset(Path(data_path) / "train.parquet", format="parquet")
+
+
+def _date_scalar(value, arrow_type: pa.DataType) -> pa.Scalar:
+    timestamp = pd.Timestamp(value)
+    if pa.types.is_date(arrow_type):
+        return pa.scalar(timestamp.date(), type=arrow_type)
+    if pa.types.is_timestamp(arrow_type):
+        return pa.scalar(timestamp.to_pydatetime(), type=arrow_type)
+    return pa.scalar(timestamp.strftime("%Y-%m-%d"))
+
+
+def _build_filter(schema: pa.Schema, stores=None, start_date=None, end_date=None):
+    conditions = []
+
+    if stores is not None:
+        conditions.append(ds.field("Store").isin([int(s) for s in stores]))
+    if start_date is not None:
+        date_type = schema.field("Date").type
+        conditions.append(ds.field("Date") >= _date_scalar(start_date, date_type))
+    if end_date is not None:
+        date_type = schema.field("Date").type
+        conditions.append(ds.field("Date") <= _date_scalar(end_date, date_type))
+
+    if not conditions:
+        return None
+
+    expression = conditions[0]
+    for condition in conditions[1:]:
+        expression = expression & condition
+    return expression
+
+
+@timed
+def load_data(
+    data_path="data/raw",
+    stores=None,
+    columns=None,
+    start_date=None,
+    end_date=None
+):
+    """
+    Load training data, reading only the requested stores, columns and dates.
+
+    Filters are pushed down to pyarrow, so on the store-partitioned layout a
+    single-store read only opens that store's files.
+    """
+    dataset = _open_dataset(data_path)
+    table = dataset.to_table(
+        columns=columns,
+        filter=_build_filter(dataset.schema, stores, start_date, end_date)
+    )
+
+    df = table.to_pandas()
+    if "Date" in df.columns:
+        df["Date"] = pd.to_datetime(df["Date"])
+    return df
+
+
+def load_store_metadata(data_path="data/raw") -> pd.DataFrame:
+    """
+    Per-store metadata from store.csv with compact dtypes.
+    """
+    return pd.read_csv(Path(data_path) / "store.csv", dtype=STORE_DTYPES)
+
+
+def dataset_columns(data_path="data/raw") -> list:
+    """
+    Column names of the training data, read from metadata only.
+    """
+    return _open_dataset(data_path).schema.names
+
+
+def list_stores(data_path="data/raw") -> list:
+    """
+    Sorted store ids, reading only the Store column.
+
+    On the store-partitioned layout the ids come from the partition
+    directories, so no data file is opened (and a corrupt one cannot
+    break the listing).
+    """
+    dataset = _open_dataset(data_path)
+    keys = [
+        ds.get_partition_keys(fragment.partition_expression).get("Store")
+        for fragment in dataset.get_fragments()
+    ]
+    if keys and None not in keys:
+        return sorted(set(keys))
+
+    table = dataset.to_table(columns=["Store"])
+    return sorted(pc.unique(table["Store"]).to_pylist())
+
+
+def write_partitioned_data(
+    df: pd.DataFrame,
+    data_path="data/raw",
+    existing_data_behavior: str = "delete_matching",
+    basename_template: str = None,
+    **write_options
+) -> Path:
+    """
+    Write `df` as a Hive-style dataset partitioned by Store.
+
+    Rows are sorted by (Store, Date) so each file is already in series
+    order, and dates are stored as date32. The default replaces the
+    partitions being written; pass "overwrite_or_ignore" with a unique
+    `basename_template` to append. Extra options such as
+    `max_rows_per_group` go to `pyarrow.dataset.write_dataset`.
+    """
+    root = Path(data_path) / PARTITIONED_DIR
+
+    df = df.sort_values(["Store", "Date"])
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for name, arrow_type in [("Store", pa.int16()), ("Date", pa.date32())]:
+        position = table.schema.get_field_index(name)
+        table = table.set_column(position, name, table[name].cast(arrow_type))
+
+    ds.write_dataset(
+        table,
+        root,
+        format="parquet",
+        partitioning=STORE_PARTITIONING,
+        existing_data_behavior=existing_data_behavior,
+        basename_template=basename_template,
+        **write_options
+    )
+    return root
+
+
+def prepare_series(store_df: pd.DataFrame, value_col: str = "Sales") -> pd.Series:
+    """
+    Turn one store's rows into a daily series with missing days filled as 0.
+    """
+    store_df = store_df.sort_values("Date").set_index("Date")
+    return store_df[value_col].asfreq("D", fill_value=0)
@@ -0,0 +1,224 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.cache import data_fingerprint
+from src.data_loader import list_stores, load_data
+from src.profiling import timed
+
+
+DEFAULT_QUALITY_DIR = Path("data/cache/quality")
+
+QUARTILES = (0.25, 0.5, 0.75)
+
+# A corrupt or partially written parquet file raises either of these
+READ_ERRORS = (OSError, pa.ArrowException)
+
+
+def _group_quantiles(
+    values: np.ndarray,
+    starts: np.ndarray,
+    counts: np.ndarray,
+    q: float
+) -> np.ndarray:
+    """
+    Linear-interpolated quantile of each group in values sorted within groups.
+
+    Each group's `counts` values start at `starts`; groups with no values
+    get NaN.
+    """
+    position = starts + q * np.maximum(counts - 1, 0)
+    below = np.floor(position).astype(np.int64)
+    above = np.minimum(below + 1, starts + np.maximum(counts - 1, 0))
+    weight = position - below
+    quantiles = values[below] * (1 - weight) + values[above] * weight
+    return np.where(counts > 0, quantiles, np.nan)
+
+
+@timed
+def quality_report(df: pd.DataFrame, value_col: str = "Sales") -> pd.DataFrame:
+    """
+    Data quality metrics for every store in one pass over the sorted rows.
+
+    Works on the raw rows, before any daily filling. Per store: row count,
+    first and last date, missing dates inside that span, number and
+    longest of those gaps, duplicated dates, zero-sales days and the
+    longest run of consecutive zero-sales rows, rows with a missing value,
+    quartiles and the number of IQR outlier days (1.5 x IQR beyond the
+    quartiles; none when IQR is 0). Missing values are left out of the
+    quartiles and outliers. Indexed by Store.
+    """
+    stores = df["Store"].to_numpy()
+    days = df["Date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    values = df[value_col].to_numpy(dtype=np.float64)
+
+    order = np.lexsort((days, stores))
+    stores, days, values = stores[order], days[order], values[order]
+
+    store_ids, first_row, counts = np.unique(stores, return_index=True, return_counts=True)
+    offsets = np.r_[first_row, len(stores)]
+    store_pos = np.repeat(np.arange(len(store_ids)), counts)
+    n_stores = len(store_ids)
+
+    # Day-to-day steps within each store
+    same_store = store_pos[1:] == store_pos[:-1]
+    step = np.diff(days)
+    missing = np.where(same_store, np.maximum(step - 1, 0), 0)
+    step_store = store_pos[1:]
+
+    longest_gap = np.zeros(n_stores, dtype=np.int64)
+    np.maximum.at(longest_gap, step_store, missing)
+
+    # Runs of zero-sales rows, broken at store boundaries
+    is_zero = values == 0
+    run_start = is_zero & np.r_[True, ~(is_zero[:-1] & same_store)]
+    run_id = np.cumsum(run_start) - 1
+    run_lengths = np.bincount(run_id[is_zero], minlength=run_start.sum())
+    longest_zero_run = np.zeros(n_stores, dtype=np.int64)
+    np.maximum.at(longest_zero_run, store_pos[run_start], run_lengths)
+
+    # Quartiles from values sorted within each store; NaNs sort last, so
+    # each store's valid values are the first `valid` of its rows
+    is_missing = np.isnan(values)
+    missing_values = np.bincount(store_pos, weights=is_missing, minlength=n_stores).astype(np.int64)
+    valid = counts - missing_values
+    sorted_values = values[np.lexsort((values, store_pos))]
+    q1, median, q3 = (
+        _group_quantiles(sorted_values, first_row, valid, q) for q in QUARTILES
+    )
+    iqr = q3 - q1
+    lower = np.repeat(q1 - 1.5 * iqr, counts)
+    upper = np.repeat(q3 + 1.5 * iqr, counts)
+    is_outlier = ((values < lower) | (values > upper)) & np.repeat(iqr > 0, counts)
+
+    return pd.DataFrame(
+        {
+            "rows": counts,
+            "first_date": days[first_row].astype("datetime64[D]").astype("datetime64[ns]"),
+            "last_date": days[offsets[1:] - 1].astype("datetime64[D]").astype("datetime64[ns]"),
+            "missing_dates": np.bincount(step_store, weights=missing, minlength=n_stores).astype(np.int64),
+            "gaps": np.bincount(step_store, weights=missing > 0, minlength=n_stores).astype(np.int64),
+            "longest_gap": longest_gap,
+            "duplicate_dates": np.bincount(step_store, weights=same_store & (step == 0), minlength=n_stores).astype(np.int64),
+            "zero_days": np.bincount(store_pos, weights=is_zero, minlength=n_stores).astype(np.int64),
+            "longest_zero_run": longest_zero_run,
+            "missing_values": missing_values,
+            "q1": q1,
+            "median": median,
+            "q3": q3,
+            "outlier_days": np.bincount(store_pos, weights=is_outlier, minlength=n_stores).astype(np.int64)
+        },
+        index=pd.Index(store_ids, name="Store")
+    )
+
+
+def store_issues(
+    report: pd.DataFrame,
+    min_rows: int = 90,
+    max_missing_share: float = 0.25,
+    max_zero_run: int = 60,
+    max_stale_days: int = 30
+) -> pd.Series:
+    """
+    Stores that are poor candidates for a model fit, with the reasons.
+
+    A store is flagged when it has fewer than `min_rows` rows, more than
+    `max_missing_share` of its date span missing, a zero-sales run longer
+    than `max_zero_run` rows, or a last date more than `max_stale_days`
+    before the newest store's, or when its data could not be read (an
+    `error` from `load_quality_report`). Returns a "; "-joined reason per flagged
+    store, indexed by Store.
+    """
+    span = (report["last_date"] - report["first_date"]).dt.days + 1
+    stale_days = (report["last_date"].max() - report["last_date"]).dt.days
+
+    rules = {
+        "too few rows": report["rows"] < min_rows,
+        "missing dates": report["missing_dates"] > max_missing_share * span,
+        "long zero-sales run": report["longest_zero_run"] > max_zero_run,
+        "stale": stale_days > max_stale_days
+    }
+    if "error" in report.columns:
+        rules["unreadable data"] = report["error"].notna()
+
+    issues = pd.Series("", index=report.index)
+    for reason, flagged in rules.items():
+        issues = issues.where(~flagged, issues + "; " + reason)
+
+    issues = issues[issues != ""].str.removeprefix("; ")
+    return issues.rename("issues")
+
+
+def cached_quality_report(
+    df: pd.DataFrame,
+    value_col: str = "Sales",
+    cache_dir=DEFAULT_QUALITY_DIR
+) -> pd.DataFrame:
+    """
+    `quality_report` stored on disk under the dataset's fingerprint.
+
+    The report is recomputed only when the data changes; reports for older
+    versions of the data are removed when a new one is written.
+    """
+    cache_dir = Path(cache_dir)
+    fingerprint = data_fingerprint(df[["Store", "Date", value_col]])
+    path = cache_dir / f"{fingerprint}.parquet"
+
+    try:
+        return pd.read_parquet(path)
+    except READ_ERRORS:
+        pass
+
+    report = quality_report(df, value_col=value_col)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    report.to_parquet(tmp_path)
+    os.replace(tmp_path, path)
+
+    for stale in cache_dir.glob("*.parquet"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    return report
+
+
+def load_quality_report(
+    data_path="data/raw",
+    stores=None,
+    value_col: str = "Sales"
+) -> pd.DataFrame:
+    """
+    `quality_report` for stores read straight from the dataset.
+
+    The stores are read together. If a corrupt or partial file breaks that
+    read, they are read one at a time and a store that cannot be read gets
+    a row with its `error` message instead of aborting the report. The
+    `error` column is None for every store that was read.
+    """
+    columns = ["Store", "Date", value_col]
+    try:
+        df = load_data(data_path, stores=stores, columns=columns)
+        return quality_report(df, value_col=value_col).assign(error=None)
+    except READ_ERRORS:
+        pass
+
+    if stores is None:
+        stores = list_stores(data_path)
+
+    frames, errors = [], {}
+    for store_id in stores:
+        try:
+            frames.append(load_data(data_path, stores=[store_id], columns=columns))
+        except READ_ERRORS as exc:
+            errors[store_id] = f"{type(exc).__name__}: {exc}"
+
+    failed = pd.DataFrame(
+        {"error": list(errors.values())},
+        index=pd.Index(list(errors), name="Store")
+    )
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+    report = quality_report(df, value_col=value_col)
+    return pd.concat([report.assign(error=None), failed]).sort_index()
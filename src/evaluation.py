@@ -1,20 +1,113 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
-from sklearn.metrics import mean_absolute_error, mean_squared_error
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.baseline import naive_forecast, moving_average_forecast
+from src.forecasting import arima_forecast, sarima_forecast, fit_arima, fit_sarima
+from src.prophet_model import (
+    prophet_forecast,
+    fit_prophet,
+    predict_prophet,
+    warm_start_params
+)
+from src.panel import Panel
+from src.profiling import timed
+
+
+def _baseline_fold_forecasts(
+    values: np.ndarray,
+    starts: np.ndarray,
+    forecast_func,
+    horizon: int,
+    **forecast_kwargs
+):
+    """
+    Forecasts for every fold at once, shape (n_folds, horizon).
+
+    Returns None when `forecast_func` has no vectorized equivalent.
+    """
+    if forecast_func is naive_forecast and not forecast_kwargs:
+        point = values[starts - 1]
+    elif (
+        forecast_func is moving_average_forecast
+        and set(forecast_kwargs) <= {"window"}
+    ):
+        window = forecast_kwargs.get("window", 7)
+        if window < 1:
+            return None
+        # Window sums from a cumulative sum; short histories average what exists
+        csum = np.concatenate([[0.0], np.cumsum(values, dtype=float)])
+        lower = np.maximum(starts - window, 0)
+        point = (csum[starts] - csum[lower]) / (starts - lower)
+    else:
+        return None
 
+    return np.repeat(point[:, None], horizon, axis=1)
 
 
+def _vectorized_validation(
+    series,
+    forecast_func,
+    horizon: int,
+    starts: np.ndarray,
+    **forecast_kwargs
+):
+    values = np.asarray(series, dtype=float)
+    if np.isnan(values).any():
+        return None
+
+    forecasts = _baseline_fold_forecasts(
+        values, starts, forecast_func, horizon, **forecast_kwargs
+    )
+    if forecasts is None:
+        return None
+
+    actuals = sliding_window_view(values, horizon)[starts]
+    residuals = actuals - forecasts
+
+    # Plain arrays have no dates, so folds are labelled by position
+    index = series.index if isinstance(series, pd.Series) else np.arange(len(values))
+
+    return pd.DataFrame({
+        "train_end": index[starts - 1],
+        "MAE": np.abs(residuals).mean(axis=1),
+        "RMSE": np.sqrt((residuals ** 2).mean(axis=1))
+    })
+
+
+@timed
 def walk_forward_validation(
-    series: pd.Series,
+    series,
     forecast_func,
     horizon: int,
     initial_train_size: int,
     step: int = 1,
+    vectorized: bool = True,
     **forecast_kwargs
 ):
     """
     Perform walk-forward validation on a time series.
+
+    `series` may also be a 1-D array such as a `Panel` row, in which case
+    folds are labelled by position. `naive_forecast` and
+    `moving_average_forecast` are scored for all folds in one array pass
+    unless `vectorized=False`.
     """
+    starts = np.arange(initial_train_size, len(series) - horizon, step)
+
+    if vectorized and len(starts) > 0 and starts[0] > 0:
+        result = _vectorized_validation(
+            series, forecast_func, horizon, starts, **forecast_kwargs
+        )
+        if result is not None:
+            return result
+
+    if not isinstance(series, pd.Series):
+        series = pd.Series(series)
+
     errors = []
 
     for start in range(
@@ -31,15 +124,301 @@ def walk_forward_validation(
             **forecast_kwargs
         )
 
-        mae = mean_absolute_error(test, forecast)
-        mse = mean_squared_error(test, forecast)
-        rmse = np.sqrt(mse)
+        errors.append(_fold_errors(train, test, forecast))
+
+    return pd.DataFrame(errors)
+
+
+def _fold_errors(train: pd.Series, test: pd.Series, forecast) -> dict:
+    from sklearn.metrics import mean_absolute_error, mean_squared_error
+
+    mae = mean_absolute_error(test, forecast)
+    mse = mean_squared_error(test, forecast)
+    rmse = np.sqrt(mse)
+
+    return {
+        "train_end": train.index[-1],
+        "MAE": mae,
+        "RMSE": rmse
+    }
+
+
+def walk_forward_residuals(
+    series: pd.Series,
+    forecast_func,
+    horizon: int,
+    n_folds: int = 8,
+    step: int = 7,
+    warm_start: bool = True,
+    **forecast_kwargs
+) -> np.ndarray:
+    """
+    Out-of-sample errors (actual - forecast) of the last `n_folds` folds.
+
+    The final fold ends on the last observation. Returns an array of shape
+    (folds, horizon); fewer folds are used when the history is short.
+    Baselines are scored in one array pass, and `exog` / `future_exog`
+    regressors are sliced per fold.
+    """
+    values = np.asarray(series, dtype=float)
+    last_start = len(values) - horizon
+    starts = np.arange(last_start - step * (n_folds - 1), last_start + 1, step)
+    starts = starts[starts >= max(horizon, 2)]
+    if len(starts) == 0:
+        return np.empty((0, horizon))
+
+    actuals = sliding_window_view(values, horizon)[starts]
+
+    if not np.isnan(values).any():
+        forecasts = _baseline_fold_forecasts(
+            values, starts, forecast_func, horizon, **forecast_kwargs
+        )
+        if forecasts is not None:
+            return actuals - forecasts
+
+    if not isinstance(series, pd.Series):
+        series = pd.Series(series)
+
+    exog = forecast_kwargs.pop("exog", None)
+    forecast_kwargs.pop("future_exog", None)
+
+    forecasts = []
+    state = None
+    for start in starts:
+        train = series.iloc[:start]
+
+        fold_kwargs = forecast_kwargs
+        if exog is not None:
+            fold_kwargs = {
+                **forecast_kwargs,
+                "exog": exog.iloc[:start],
+                "future_exog": exog.iloc[start:start + horizon]
+            }
+
+        if warm_start:
+            forecast, state = _warm_fold(
+                forecast_func, train, horizon, state, **fold_kwargs
+            )
+        else:
+            forecast = forecast_func(train, horizon=horizon, **fold_kwargs)
+
+        if isinstance(forecast, pd.DataFrame):
+            forecast = forecast["yhat"]
+        forecasts.append(np.asarray(forecast, dtype=float))
+
+    return actuals - np.vstack(forecasts)
+
+
+def _warm_fold(
+    forecast_func,
+    train: pd.Series,
+    horizon: int,
+    state,
+    **forecast_kwargs
+):
+    """
+    Forecast one fold, seeding the fit with the previous fold's parameters.
+
+    Returns the forecast and the parameters to seed the next fold with.
+    Fit-time keyword arguments (orders, `exog`) go to the fit and
+    `future_exog` / `return_intervals` to the predict step, as in the
+    models' own forecast functions. Models without warm-start support are
+    simply refit.
+    """
+    if forecast_func in (arima_forecast, sarima_forecast):
+        fit_kwargs = dict(forecast_kwargs)
+        future_exog = fit_kwargs.pop("future_exog", None)
+        if state is None:
+            state = fit_kwargs.pop("start_params", None)
+        fit_kwargs.pop("start_params", None)
+
+        if forecast_func is arima_forecast:
+            fitted = fit_arima(train, start_params=state, **fit_kwargs)
+            forecast = fitted.forecast(steps=horizon)
+        else:
+            fitted = fit_sarima(train, start_params=state, **fit_kwargs)
+            forecast = fitted.forecast(steps=horizon, exog=future_exog)
+        return forecast, np.asarray(fitted.params)
+
+    if forecast_func is prophet_forecast:
+        fit_kwargs = dict(forecast_kwargs)
+        future_exog = fit_kwargs.pop("future_exog", None)
+        return_intervals = fit_kwargs.pop("return_intervals", False)
+        if state is None:
+            state = fit_kwargs.pop("init", None)
+        fit_kwargs.pop("init", None)
+
+        model = fit_prophet(train, init=state, **fit_kwargs)
+        forecast = predict_prophet(
+            model,
+            horizon,
+            return_intervals=return_intervals,
+            future_exog=future_exog
+        )
+        return forecast, warm_start_params(model)
+
+    return forecast_func(train, horizon=horizon, **forecast_kwargs), None
+
+
+def _validate_fold_block(
+    series: pd.Series,
+    forecast_func,
+    horizon: int,
+    starts,
+    warm_start: bool,
+    forecast_kwargs: dict
+) -> list:
+    """
+    Run a contiguous block of folds in order, chaining warm starts.
+    """
+    errors = []
+    state = None
+
+    for start in starts:
+        train = series.iloc[:start]
+        test = series.iloc[start:start + horizon]
+
+        if warm_start:
+            forecast, state = _warm_fold(
+                forecast_func, train, horizon, state, **forecast_kwargs
+            )
+        else:
+            forecast = forecast_func(train, horizon=horizon, **forecast_kwargs)
+
+        errors.append(_fold_errors(train, test, forecast))
+
+    return errors
+
+
+@timed
+def parallel_walk_forward_validation(
+    series: pd.Series,
+    forecast_func,
+    horizon: int,
+    initial_train_size: int,
+    step: int = 1,
+    n_jobs: int = None,
+    warm_start: bool = True,
+    **forecast_kwargs
+):
+    """
+    Walk-forward validation with folds spread across a process pool.
+
+    Folds are split into one contiguous block per worker. Within a block,
+    ARIMA/SARIMA folds start from the previous fold's fitted parameters
+    (`start_params`) and Prophet folds from its Stan estimates (`init`),
+    so each refit converges in far fewer iterations than a cold start.
+    Returns the same frame as `walk_forward_validation`.
+    """
+    starts = np.arange(initial_train_size, len(series) - horizon, step)
+
+    # Baselines are already cheaper to score in one array pass
+    if len(starts) > 0 and starts[0] > 0:
+        result = _vectorized_validation(
+            series, forecast_func, horizon, starts, **forecast_kwargs
+        )
+        if result is not None:
+            return result
+
+    if len(starts) == 0:
+        return pd.DataFrame([])
+
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(starts))
+    blocks = np.array_split(starts, n_jobs)
+
+    if n_jobs == 1:
+        errors = _validate_fold_block(
+            series, forecast_func, horizon, starts, warm_start, forecast_kwargs
+        )
+        return pd.DataFrame(errors)
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = [
+            executor.submit(
+                _validate_fold_block,
+                series,
+                forecast_func,
+                horizon,
+                block,
+                warm_start,
+                forecast_kwargs
+            )
+            for block in blocks
+        ]
+        errors = [row for future in futures for row in future.result()]
+
+    return pd.DataFrame(errors)
+
+
+def _validate_panel_stores(
+    panel: Panel,
+    store_ids,
+    forecast_func,
+    horizon: int,
+    initial_train_size: int,
+    step: int,
+    forecast_kwargs: dict
+) -> pd.DataFrame:
+    frames = []
+    for store_id in store_ids:
+        errors = walk_forward_validation(
+            panel.get_series(store_id),
+            forecast_func,
+            horizon=horizon,
+            initial_train_size=initial_train_size,
+            step=step,
+            **forecast_kwargs
+        )
+        errors.insert(0, "Store", store_id)
+        frames.append(errors)
+
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
 
+@timed
+def panel_walk_forward_validation(
+    panel: Panel,
+    forecast_func,
+    horizon: int,
+    initial_train_size: int,
+    step: int = 1,
+    stores=None,
+    n_jobs: int = None,
+    **forecast_kwargs
+):
+    """
+    Walk-forward validation for every store (or `stores`) of a `Panel`.
+
+    Stores are split into one block per worker process. A panel opened with
+    `Panel.open` travels to the workers as its path and each worker maps
+    the same file, so the matrix is shared rather than pickled; save an
+    in-memory panel first to get this. Returns the `walk_forward_validation`
+    frame with a leading Store column.
+    """
+    store_ids = panel.store_ids if stores is None else [s for s in stores if s in panel]
+    n_jobs = max(1, min(n_jobs or os.cpu_count() or 1, len(store_ids)))
+    blocks = np.array_split(np.asarray(store_ids), n_jobs)
+
+    if n_jobs == 1:
+        return _validate_panel_stores(
+            panel, store_ids, forecast_func, horizon,
+            initial_train_size, step, forecast_kwargs
+        )
 
-        errors.append({
-            "train_end": train.index[-1],
-            "MAE": mae,
-            "RMSE": rmse
-        })
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = [
+            executor.submit(
+                _validate_panel_stores,
+                panel,
+                block.tolist(),
+                forecast_func,
+                horizon,
+                initial_train_size,
+                step,
+                forecast_kwargs
+            )
+            for block in blocks
+        ]
+        frames = [future.result() for future in futures]
 
-    return pd.DataFrame(errors)
\ No newline at end of file
+    return pd.concat(frames, ignore_index=True)
\ No newline at end of file
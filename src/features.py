@@ -0,0 +1,179 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data_loader import dataset_columns, load_data
+from src.ingest import SALES_DTYPES
+
+
+FEATURE_COLUMNS = ["Open", "Promo", "StateHoliday", "SchoolHoliday"]
+
+MISSING = -1
+
+
+def _encode(rows: pd.DataFrame) -> np.ndarray:
+    """
+    Feature columns as an (n, 4) int8 array of 0/1 flags, -1 where unknown.
+
+    StateHoliday is reduced to "any holiday"; absent columns are all unknown.
+    """
+    encoded = np.full((len(rows), len(FEATURE_COLUMNS)), MISSING, dtype=np.int8)
+
+    for i, col in enumerate(FEATURE_COLUMNS):
+        if col not in rows.columns:
+            continue
+        if col == "StateHoliday":
+            values = rows[col].astype("string")
+            flags = (values != "0").astype("Int8")
+        else:
+            flags = pd.to_numeric(rows[col]).astype("Int8")
+        encoded[:, i] = flags.fillna(MISSING).to_numpy(dtype=np.int8)
+
+    return encoded
+
+
+class FeatureStore:
+    """
+    Open / Promo / StateHoliday / SchoolHoliday flags for every store.
+
+    All stores share one daily grid running from the first training day to
+    the last known future day (e.g. the end of test.csv), held as a single
+    stores x days x features int8 array, so per-store lookups are slices.
+    Gaps are filled once at build time: a day inside a store's history with
+    no row was not traded (Open=0); an unknown future day is open if the
+    store usually opens on that weekday. Promo and holidays default to 0.
+    """
+
+    def __init__(self, history: pd.DataFrame, future: pd.DataFrame = None):
+        frames = [history] if future is None else [history, future]
+        rows = pd.concat(
+            [frame[[c for c in ["Store", "Date", *FEATURE_COLUMNS] if c in frame.columns]]
+             for frame in frames],
+            ignore_index=True
+        )
+        # Actual history wins over a planned future row for the same day
+        rows = rows.drop_duplicates(["Store", "Date"], keep="first")
+
+        self.store_ids, store_pos = np.unique(rows["Store"].to_numpy(), return_inverse=True)
+        self._positions = {
+            store_id: i for i, store_id in enumerate(self.store_ids.tolist())
+        }
+
+        days = rows["Date"].to_numpy().astype("datetime64[D]")
+        self._first_day = days.min()
+        n_days = int((days.max() - self._first_day).astype(np.int64)) + 1
+        day_pos = (days - self._first_day).astype(np.int64)
+
+        values = np.full(
+            (len(self.store_ids), n_days, len(FEATURE_COLUMNS)),
+            MISSING,
+            dtype=np.int8
+        )
+        values[store_pos, day_pos] = _encode(rows)
+
+        self._open_rate = self._weekday_open_rate(history)
+        self._history_end = np.full(len(self.store_ids), -1, dtype=np.int64)
+        history_days = history["Date"].to_numpy().astype("datetime64[D]")
+        history_pos = np.searchsorted(self.store_ids, history["Store"].to_numpy())
+        np.maximum.at(
+            self._history_end,
+            history_pos,
+            (history_days - self._first_day).astype(np.int64)
+        )
+
+        grid_days = np.arange(n_days)
+        in_history = grid_days[None, :] <= self._history_end[:, None]
+        default_open = self._default_open(
+            np.arange(len(self.store_ids))[:, None],
+            grid_days[None, :]
+        )
+
+        open_flags = values[:, :, 0]
+        unknown = open_flags == MISSING
+        open_flags[unknown] = np.where(in_history, 0, default_open)[unknown]
+        values[values == MISSING] = 0
+
+        self._values = values
+
+    @classmethod
+    def from_data(cls, data_path="data/raw", future_csv: str = "test.csv") -> "FeatureStore":
+        """
+        Build from the training dataset plus future rows in `future_csv`, if present.
+        """
+        available = set(dataset_columns(data_path))
+        columns = [c for c in ["Store", "Date", *FEATURE_COLUMNS] if c in available]
+        history = load_data(data_path, columns=columns)
+
+        future = None
+        future_path = Path(data_path) / future_csv
+        if future_csv and future_path.exists():
+            future = pd.read_csv(
+                future_path,
+                usecols=lambda col: col in ["Store", "Date", *FEATURE_COLUMNS],
+                dtype={col: SALES_DTYPES[col] for col in ["Store", *FEATURE_COLUMNS]},
+                parse_dates=["Date"]
+            )
+
+        return cls(history, future)
+
+    def _weekday_open_rate(self, history: pd.DataFrame) -> np.ndarray:
+        rate = np.ones((len(self.store_ids), 7), dtype=np.float32)
+        if "Open" not in history.columns:
+            return rate
+
+        known = history[history["Open"].notna()]
+        grouped = known.groupby(
+            [known["Store"].to_numpy(), known["Date"].dt.dayofweek.to_numpy()]
+        )["Open"].mean()
+
+        positions = np.searchsorted(self.store_ids, grouped.index.get_level_values(0))
+        rate[positions, grouped.index.get_level_values(1)] = grouped.to_numpy()
+        return rate
+
+    def _default_open(self, positions, day_offsets) -> np.ndarray:
+        dates = self._first_day + np.asarray(day_offsets).astype("timedelta64[D]")
+        # 1970-01-01 was a Thursday (dayofweek 3)
+        weekday = (dates.astype(np.int64) + 3) % 7
+        return (self._open_rate[positions, weekday] >= 0.5).astype(np.int8)
+
+    def __contains__(self, store_id) -> bool:
+        return store_id in self._positions
+
+    def _position(self, store_id) -> int:
+        try:
+            return self._positions[store_id]
+        except KeyError:
+            raise KeyError(f"Store {store_id} is not in the feature store") from None
+
+    def get_features(self, store_id, dates) -> pd.DataFrame:
+        """
+        Regressors for one store on `dates`, which may run past the known grid.
+        """
+        i = self._position(store_id)
+        dates = pd.DatetimeIndex(dates)
+        offsets = (dates.to_numpy().astype("datetime64[D]") - self._first_day).astype(np.int64)
+        inside = (offsets >= 0) & (offsets < self._values.shape[1])
+
+        values = np.zeros((len(dates), len(FEATURE_COLUMNS)), dtype=np.int8)
+        values[inside] = self._values[i, offsets[inside]]
+        values[~inside, 0] = self._default_open(i, offsets[~inside])
+
+        return pd.DataFrame(values.astype(np.float64), index=dates, columns=FEATURE_COLUMNS)
+
+    def regressors_for(self, store_id, index: pd.DatetimeIndex, horizon: int):
+        """
+        (past, future) regressor frames for a series and the next `horizon` days.
+
+        Columns that never vary over the history carry no information for
+        the fit and are dropped from both.
+        """
+        future_index = pd.date_range(index[-1] + pd.Timedelta(days=1), periods=horizon, freq="D")
+        features = self.get_features(store_id, index.append(future_index))
+
+        # Keep the callers' indexes (and their freq) so models align them as-is
+        past = features.iloc[:len(index)].set_axis(index)
+        future = features.iloc[len(index):].set_axis(future_index)
+
+        informative = past.columns[past.nunique() > 1]
+        return past[informative], future[informative]
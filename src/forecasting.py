@@ -1,19 +1,91 @@
 import pandas as pd
 
-from statsmodels.tsa.arima.model import ARIMA
-from statsmodels.tsa.statespace.sarimax import SARIMAX
+from src.profiling import timed
+
+# statsmodels is imported inside the fit functions: it costs most of a
+# second, and workers that only run baselines should never pay for it.
+
+
+def build_arima(series: pd.Series, order: tuple = (1, 1, 1)):
+    """
+    Unfitted ARIMA model; `.filter(params)` rebuilds a fit from stored params.
+    """
+    from statsmodels.tsa.arima.model import ARIMA
+
+    return ARIMA(series, order=order)
+
+
+def build_sarima(
+    series: pd.Series,
+    order: tuple = (1, 1, 1),
+    seasonal_order: tuple = (1, 1, 1, 7),
+    exog=None,
+    trend=None
+):
+    """
+    Unfitted SARIMA model; `.filter(params)` rebuilds a fit from stored params.
+    """
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    return SARIMAX(
+        series,
+        exog=exog,
+        order=order,
+        seasonal_order=seasonal_order,
+        trend=trend,
+        enforce_stationarity=False,
+        enforce_invertibility=False
+    )
+
+
+@timed
+def fit_arima(
+    series: pd.Series,
+    order: tuple = (1, 1, 1),
+    start_params=None
+):
+    """
+    Fit ARIMA model, optionally warm-started from earlier parameters.
+    """
+    model = build_arima(series, order=order)
+    return model.fit(start_params=start_params)
+
+
+@timed
+def fit_sarima(
+    series: pd.Series,
+    order: tuple = (1, 1, 1),
+    seasonal_order: tuple = (1, 1, 1, 7),
+    start_params=None,
+    exog=None,
+    trend=None
+):
+    """
+    Fit SARIMA model, optionally warm-started from earlier parameters.
+
+    `exog` holds regressors aligned with `series`, e.g. from `FeatureStore`.
+    """
+    model = build_sarima(
+        series,
+        order=order,
+        seasonal_order=seasonal_order,
+        exog=exog,
+        trend=trend
+    )
+
+    return model.fit(start_params=start_params, disp=False)
 
 
 def arima_forecast(
     series: pd.Series,
     horizon: int,
-    order: tuple = (1, 1, 1)
+    order: tuple = (1, 1, 1),
+    start_params=None
 ):
     """
     Fit ARIMA model and forecast future values.
     """
-    model = ARIMA(series, order=order)
-    fitted_model = model.fit()
+    fitted_model = fit_arima(series, order=order, start_params=start_params)
 
     forecast = fitted_model.forecast(steps=horizon)
 
@@ -24,20 +96,27 @@ def sarima_forecast(
     series: pd.Series,
     horizon: int,
     order: tuple = (1, 1, 1),
-    seasonal_order: tuple = (1, 1, 1, 7)
+    seasonal_order: tuple = (1, 1, 1, 7),
+    start_params=None,
+    exog=None,
+    future_exog=None,
+    trend=None
 ):
     """
     Fit SARIMA model and forecast future values.
+
+    With `exog`, the matching `future_exog` rows for the horizon are required.
+    `order_search.select_order` picks `order`, `seasonal_order` and `trend`
+    per store.
     """
-    model = SARIMAX(
+    fitted_model = fit_sarima(
         series,
         order=order,
         seasonal_order=seasonal_order,
-        enforce_stationarity=False,
-        enforce_invertibility=False
+        start_params=start_params,
+        exog=exog,
+        trend=trend
     )
-
-    fitted_model = model.fit(disp=False)
-    forecast = fitted_model.forecast(steps=horizon)
+    forecast = fitted_model.forecast(steps=horizon, exog=future_exog)
 
     return forecast
\ No newline at end of file
@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from src.panel import build_sales_matrix
+from src.profiling import timed
+from src.seasonal_engine import INTERVAL_Z, forecast_matrix
+
+
+# Aggregation levels above the stores; a tuple crosses several columns,
+# e.g. ("StoreType", "Assortment")
+DEFAULT_GROUPS = ("StoreType", "Assortment")
+
+RECONCILIATION_METHODS = ("bottom_up", "ols", "wls_struct", "wls_var")
+
+
+def build_summing_matrix(
+    store_meta: pd.DataFrame,
+    store_ids,
+    groups=DEFAULT_GROUPS
+):
+    """
+    Sparse aggregation matrix C mapping store series to their aggregates.
+
+    Row 0 is the total, followed by one row per value of each grouping
+    level. The full summing matrix S is C stacked on the identity, which
+    is never built explicitly. Returns (C, nodes) where `nodes` lists the
+    Level and Node label of each row of C.
+    """
+    meta = store_meta.set_index("Store").reindex(store_ids)
+    n_stores = len(store_ids)
+    columns = np.arange(n_stores)
+
+    rows = [np.zeros(n_stores, dtype=np.int64)]
+    nodes = [("Total", "Total")]
+
+    for group in groups:
+        group_cols = [group] if isinstance(group, str) else list(group)
+        values = meta[group_cols]
+        if values.isna().any(axis=None):
+            missing = meta.index[values.isna().any(axis=1)].tolist()
+            raise ValueError(f"No {'/'.join(group_cols)} metadata for stores {missing[:10]}")
+
+        labels = values.astype(str).agg("/".join, axis=1)
+        codes, uniques = pd.factorize(labels, sort=True)
+        rows.append(len(nodes) + codes)
+        nodes.extend(("/".join(group_cols), label) for label in uniques)
+
+    C = sparse.csr_matrix(
+        (np.ones(n_stores * len(rows)), (np.concatenate(rows), np.tile(columns, len(rows)))),
+        shape=(len(nodes), n_stores)
+    )
+    return C, pd.DataFrame(nodes, columns=["Level", "Node"])
+
+
+def reconcile(
+    base_aggregate: np.ndarray,
+    base_bottom: np.ndarray,
+    C: sparse.spmatrix,
+    method: str = "wls_struct",
+    variances: np.ndarray = None
+):
+    """
+    Adjust base forecasts so every aggregate equals the sum of its stores.
+
+    `bottom_up` ignores the aggregate forecasts. The other methods are the
+    MinT family with a diagonal error covariance W: identity (`ols`), the
+    number of stores under each node (`wls_struct`) or per-node forecast
+    error variances passed as `variances` (`wls_var`, aggregates first).
+    Via the Woodbury identity the only dense system solved is aggregates x
+    aggregates, so cost grows linearly in the number of stores.
+
+    Returns (aggregate, bottom) coherent forecasts.
+    """
+    if method not in RECONCILIATION_METHODS:
+        raise ValueError(
+            f"method must be one of {list(RECONCILIATION_METHODS)}, got {method!r}"
+        )
+
+    n_aggregate, n_stores = C.shape
+
+    if method == "bottom_up":
+        bottom = base_bottom
+    else:
+        if method == "ols":
+            weights = np.ones(n_aggregate + n_stores)
+        elif method == "wls_struct":
+            weights = np.concatenate([np.asarray(C.sum(axis=1)).ravel(), np.ones(n_stores)])
+        else:
+            if variances is None:
+                raise ValueError("wls_var reconciliation needs per-node variances")
+            weights = np.asarray(variances, dtype=np.float64)
+
+        weights = np.maximum(weights, np.finfo(np.float64).tiny)
+        w_aggregate, w_bottom = weights[:n_aggregate], weights[n_aggregate:]
+
+        # b~ = b^ + W_b C' (W_a + C W_b C')^-1 (a^ - C b^)
+        C_w = sparse.csr_matrix(C.multiply(w_bottom[None, :]))
+        inner = (C_w @ C.T).toarray() + np.diag(w_aggregate)
+        gap = base_aggregate - C @ base_bottom
+        bottom = base_bottom + C_w.T @ np.linalg.solve(inner, gap)
+
+    return C @ bottom, bottom
+
+
+def _pivot_base_forecasts(base_forecasts: pd.DataFrame, store_ids, horizon: int):
+    """
+    Store-level forecasts in batch layout -> (stores, horizon) point and scale.
+    """
+    frame = base_forecasts[base_forecasts["Store"].isin(store_ids)]
+    point = frame.pivot(index="Store", columns="Date", values="yhat").reindex(store_ids)
+    if point.shape[1] != horizon or point.isna().any(axis=None):
+        raise ValueError(f"base_forecasts must cover every store for {horizon} days")
+
+    scale = None
+    if "yhat_upper" in frame.columns:
+        upper = frame.pivot(index="Store", columns="Date", values="yhat_upper").reindex(store_ids)
+        scale = (upper.to_numpy() - point.to_numpy()) / INTERVAL_Z
+
+    return point.to_numpy(dtype=np.float64), scale
+
+
+@timed
+def forecast_hierarchy(
+    df: pd.DataFrame,
+    store_meta: pd.DataFrame,
+    horizon: int = 14,
+    method: str = "holt_winters",
+    reconciliation: str = "wls_struct",
+    groups=DEFAULT_GROUPS,
+    base_forecasts: pd.DataFrame = None,
+    value_col: str = "Sales",
+    **method_kwargs
+) -> pd.DataFrame:
+    """
+    Coherent forecasts for the total, each grouping level and every store.
+
+    Aggregate histories are built in one sparse product over the stores x
+    days matrix and forecast with the vectorized seasonal engine. Store
+    forecasts come from the same engine unless `base_forecasts` (e.g. the
+    output of `batch_forecast` with a per-store model) is given.
+
+    Returns Level, Node, Date, yhat_base (before reconciliation) and yhat.
+    """
+    matrix, store_ids, dates = build_sales_matrix(
+        df, value_col=value_col, dtype=np.float64
+    )
+    C, nodes = build_summing_matrix(store_meta, store_ids, groups)
+    aggregate = C @ matrix
+
+    aggregate_point, aggregate_lower, _ = forecast_matrix(
+        aggregate, horizon, method, **method_kwargs
+    )
+    aggregate_scale = (aggregate_point - aggregate_lower) / INTERVAL_Z
+
+    if base_forecasts is None:
+        bottom_point, bottom_lower, _ = forecast_matrix(
+            matrix, horizon, method, **method_kwargs
+        )
+        bottom_scale = (bottom_point - bottom_lower) / INTERVAL_Z
+    else:
+        bottom_point, bottom_scale = _pivot_base_forecasts(
+            base_forecasts, store_ids, horizon
+        )
+
+    variances = None
+    if reconciliation == "wls_var":
+        if bottom_scale is None:
+            raise ValueError("wls_var needs yhat_upper in base_forecasts")
+        # One-step-ahead scale is the in-sample residual spread
+        variances = np.concatenate([aggregate_scale[:, 0], bottom_scale[:, 0]]) ** 2
+
+    aggregate_fc, bottom_fc = reconcile(
+        aggregate_point, bottom_point, C, reconciliation, variances
+    )
+
+    nodes = pd.concat([
+        nodes,
+        pd.DataFrame({"Level": "Store", "Node": store_ids.astype(str)})
+    ], ignore_index=True)
+    future = pd.date_range(dates[-1] + pd.Timedelta(days=1), periods=horizon, freq="D")
+
+    return pd.DataFrame({
+        "Level": np.repeat(nodes["Level"].to_numpy(), horizon),
+        "Node": np.repeat(nodes["Node"].to_numpy(), horizon),
+        "Date": np.tile(future, len(nodes)),
+        "yhat_base": np.concatenate([aggregate_point, bottom_point]).ravel(),
+        "yhat": np.concatenate([aggregate_fc, bottom_fc]).ravel()
+    })
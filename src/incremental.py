@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+
+from src.forecasting import fit_arima, fit_sarima
+from src.prophet_model import fit_prophet, predict_prophet, warm_start_params
+
+
+MODELS = ("arima", "sarima", "prophet")
+
+
+def append_observations(fitted_model, new_observations: pd.Series):
+    """
+    Extend fitted ARIMA/SARIMA results with new data, keeping the parameters.
+
+    Only the Kalman filter runs over the new points; nothing is re-estimated.
+    """
+    return fitted_model.append(new_observations, refit=False)
+
+
+class IncrementalForecaster:
+    """
+    Keep one store's fitted model current as new days of sales arrive.
+
+    `update` folds new observations into the existing fit: ARIMA/SARIMA
+    results are extended with the state-space `append`, Prophet is refit
+    warm-started from its previous parameters. A full cold refit happens
+    only every `refit_every` new observations, or when the new data drifts
+    away from the model, i.e. its mean absolute forecast error exceeds
+    `drift_threshold` residual standard deviations.
+    """
+
+    def __init__(
+        self,
+        model: str = "sarima",
+        refit_every: int = 28,
+        drift_threshold: float = 3.0,
+        **model_kwargs
+    ):
+        if model not in MODELS:
+            raise ValueError(f"model must be one of {MODELS}, got {model!r}")
+
+        self.model = model
+        self.refit_every = refit_every
+        self.drift_threshold = drift_threshold
+        self.model_kwargs = model_kwargs
+
+        self.fitted_model = None
+        self.history = None
+        self.since_refit = 0
+        self.residual_std = None
+
+    def _fit(self, series: pd.Series, init=None):
+        if self.model == "arima":
+            return fit_arima(series, **self.model_kwargs)
+        if self.model == "sarima":
+            return fit_sarima(series, **self.model_kwargs)
+        return fit_prophet(series, init=init)
+
+    def _residual_std(self) -> float:
+        if self.model == "prophet":
+            # In-sample point fit only; interval sampling would dominate the cost
+            fitted = predict_prophet(self.fitted_model, 0, include_history=True)
+            residuals = self.fitted_model.history["y"].to_numpy() - fitted.to_numpy()
+        else:
+            residuals = np.asarray(self.fitted_model.resid)
+        return float(np.std(residuals))
+
+    def fit(self, series: pd.Series) -> "IncrementalForecaster":
+        """
+        Full fit on the whole history.
+        """
+        self.history = series
+        self.fitted_model = self._fit(series)
+        self.since_refit = 0
+        self.residual_std = self._residual_std()
+        return self
+
+    def _new_part(self, new_observations: pd.Series) -> pd.Series:
+        # Drop days we already have and fill gaps with 0 like the loader does
+        last_date = self.history.index[-1]
+        new_observations = new_observations[new_observations.index > last_date]
+        if new_observations.empty:
+            return new_observations
+
+        index = pd.date_range(
+            last_date + pd.Timedelta(days=1),
+            new_observations.index[-1],
+            freq="D",
+            name=self.history.index.name
+        )
+        return new_observations.reindex(index, fill_value=0).astype(
+            self.history.dtype
+        )
+
+    def drift_detected(self, new_observations: pd.Series) -> bool:
+        """
+        Whether the current model forecasts the new days unusually badly.
+        """
+        if not self.residual_std:
+            return False
+
+        expected = self.forecast(len(new_observations))
+        errors = np.abs(new_observations.to_numpy() - expected.to_numpy())
+        return errors.mean() > self.drift_threshold * self.residual_std
+
+    def update(self, new_observations: pd.Series) -> "IncrementalForecaster":
+        """
+        Fold newly arrived days into the model without a full re-estimation.
+        """
+        if self.fitted_model is None:
+            raise RuntimeError("Call fit() before update().")
+
+        new_observations = self._new_part(new_observations)
+        if new_observations.empty:
+            return self
+
+        refit_due = self.since_refit + len(new_observations) >= self.refit_every
+        drifted = self.drift_detected(new_observations)
+        self.history = pd.concat([self.history, new_observations])
+
+        if refit_due or drifted:
+            return self.fit(self.history)
+
+        if self.model == "prophet":
+            init = warm_start_params(self.fitted_model)
+            self.fitted_model = self._fit(self.history, init=init)
+        else:
+            self.fitted_model = append_observations(
+                self.fitted_model, new_observations
+            )
+
+        self.since_refit += len(new_observations)
+        return self
+
+    def forecast(self, horizon: int, return_intervals: bool = False):
+        """
+        Forecast from the current fit, in the same format as `prophet_forecast`.
+        """
+        if self.model == "prophet":
+            return predict_prophet(
+                self.fitted_model, horizon, return_intervals=return_intervals
+            )
+
+        prediction = self.fitted_model.get_forecast(steps=horizon)
+        if not return_intervals:
+            return prediction.predicted_mean
+
+        bounds = prediction.conf_int()
+        return pd.DataFrame({
+            "yhat": prediction.predicted_mean,
+            "yhat_lower": bounds.iloc[:, 0],
+            "yhat_upper": bounds.iloc[:, 1]
+        }).rename_axis("ds")
@@ -0,0 +1,163 @@
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from src.data_loader import (
+    PARTITIONED_DIR,
+    load_store_metadata,
+    write_partitioned_data
+)
+
+
+SALES_DTYPES = {
+    "Store": "int16",
+    "DayOfWeek": "int8",
+    "Sales": "int32",
+    "Customers": "int32",
+    "Open": "Int8",
+    "Promo": "Int8",
+    "StateHoliday": "str",
+    "SchoolHoliday": "Int8"
+}
+
+STATE_HOLIDAY_DTYPE = pd.CategoricalDtype(["0", "a", "b", "c"])
+
+MANIFEST_NAME = "_ingest_manifest.json"
+
+
+def _read_manifest(root: Path) -> dict:
+    path = root / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def _write_manifest(root: Path, manifest: dict) -> None:
+    root.mkdir(parents=True, exist_ok=True)
+    (root / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+
+
+def _run_id(csv_path: Path) -> str:
+    # Re-running the same file after a crash overwrites its own parts
+    stat = csv_path.stat()
+    key = f"{csv_path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def _compact_chunk(chunk: pd.DataFrame, stores: pd.DataFrame) -> pd.DataFrame:
+    chunk = chunk.drop(columns=["Id"], errors="ignore")
+    if "StateHoliday" in chunk.columns:
+        chunk["StateHoliday"] = chunk["StateHoliday"].astype(STATE_HOLIDAY_DTYPE)
+
+    return chunk.merge(stores, on="Store", how="left")
+
+
+def ingest_csv(
+    csv_path,
+    data_path="data/raw",
+    chunksize: int = 200_000,
+    flush_rows: int = 2_000_000,
+    row_group_size: int = 64_000
+) -> dict:
+    """
+    Stream a Rossmann-style sales CSV into the store-partitioned dataset.
+
+    The CSV is read `chunksize` rows at a time with compact dtypes, joined
+    with store.csv metadata and buffered until `flush_rows` rows are held;
+    each flush is sorted by (Store, Date) and appended as new files, so
+    memory stays bounded by the buffer. Only rows newer than the last
+    ingested date are kept, which makes re-ingesting a monthly extract an
+    append of the new days.
+    """
+    csv_path = Path(csv_path)
+    root = Path(data_path) / PARTITIONED_DIR
+    manifest = _read_manifest(root)
+    last_date = manifest.get("last_date")
+    last_date = pd.Timestamp(last_date) if last_date else None
+
+    stores = load_store_metadata(data_path)
+    run_id = _run_id(csv_path)
+
+    buffer = []
+    buffered = 0
+    flushes = 0
+    rows_written = 0
+    newest = last_date
+
+    def flush():
+        nonlocal buffer, buffered, flushes, rows_written
+        batch = pd.concat(buffer, ignore_index=True)
+        write_partitioned_data(
+            batch,
+            data_path,
+            existing_data_behavior="overwrite_or_ignore",
+            basename_template=f"part-{run_id}-{flushes:04d}-{{i}}.parquet",
+            max_rows_per_group=row_group_size,
+            min_rows_per_group=min(row_group_size, len(batch))
+        )
+        rows_written += len(batch)
+        flushes += 1
+        buffer, buffered = [], 0
+
+    reader = pd.read_csv(
+        csv_path,
+        dtype=SALES_DTYPES,
+        parse_dates=["Date"],
+        chunksize=chunksize
+    )
+    for chunk in reader:
+        if last_date is not None:
+            chunk = chunk[chunk["Date"] > last_date]
+        if chunk.empty:
+            continue
+
+        chunk_max = chunk["Date"].max()
+        newest = chunk_max if newest is None else max(newest, chunk_max)
+
+        buffer.append(_compact_chunk(chunk, stores))
+        buffered += len(chunk)
+        if buffered >= flush_rows:
+            flush()
+
+    if buffer:
+        flush()
+
+    if rows_written:
+        manifest["last_date"] = newest.strftime("%Y-%m-%d")
+        manifest.setdefault("runs", []).append({
+            "source": csv_path.name,
+            "run_id": run_id,
+            "rows": rows_written
+        })
+        _write_manifest(root, manifest)
+
+    return {
+        "rows_written": rows_written,
+        "last_date": newest.strftime("%Y-%m-%d") if newest is not None else None
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Ingest a sales CSV into the store-partitioned Parquet dataset."
+    )
+    parser.add_argument("csv_path")
+    parser.add_argument("--data-path", default="data/raw")
+    parser.add_argument("--chunksize", type=int, default=200_000)
+    parser.add_argument("--flush-rows", type=int, default=2_000_000)
+    args = parser.parse_args(argv)
+
+    summary = ingest_csv(
+        args.csv_path,
+        data_path=args.data_path,
+        chunksize=args.chunksize,
+        flush_rows=args.flush_rows
+    )
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,128 @@
 import numpy as np
 import pandas as pd
 
+from src.panel import Panel
+from src.profiling import timed
 
-def generate_business_insight(
-    series: pd.Series,
-    forecast: pd.Series
-) -> str:
-    """
-    Generate business-friendly insights without external LLMs.
+
+# A forecast this far (in %) from the recent average is a trend change
+TREND_THRESHOLD_PCT = 10
+
+# Recent volatility above this share of average sales counts as high
+HIGH_VOLATILITY_RATIO = 0.5
+
+RECENT_DAYS = 14
+
+RECOMMENDATION = (
+    "Recommended action: plan inventory using weekly demand patterns and monitor sudden deviations closely."
+)
+
+
+@timed
+def fleet_insights(
+    history,
+    forecasts: np.ndarray,
+    store_ids=None,
+    top_n: int = None
+) -> pd.DataFrame:
     """
+    Insights for every store at once, ranked by risk.
 
-    avg_sales = series.mean()
-    recent_avg = series[-14:].mean()
-    forecast_avg = forecast.mean()
+    `history` is a stores x days sales matrix (or a `Panel`) and
+    `forecasts` the matching stores x horizon matrix. Change %, recent
+    volatility and both flags are computed as whole-matrix reductions with
+    the same thresholds as `generate_business_insight`. The risk score is
+    the size of the expected change over its threshold plus volatility
+    over its threshold, so a store scores 1 when it just reaches either
+    flag. Stores without sales in the last `RECENT_DAYS` days are classed
+    "no recent sales" and scored against their whole-history average, so
+    they rank high rather than last.
 
-    volatility = series[-14:].std()
-    change_pct = ((forecast_avg - recent_avg) / recent_avg) * 100
+    Returns Store, change_pct, volatility_ratio, trend_class,
+    volatility_class, risk_score and insight, highest risk first (only
+    the `top_n` highest if given).
+    """
+    if isinstance(history, Panel):
+        history, store_ids = history.values, history.store_ids
+    history = np.asarray(history, dtype=np.float64)
+    forecasts = np.asarray(forecasts, dtype=np.float64)
+    if store_ids is None:
+        store_ids = np.arange(len(history))
 
-    insights = []
+    avg_sales = np.nanmean(history, axis=1)
+    recent = history[:, -RECENT_DAYS:]
+    recent_avg = np.nanmean(recent, axis=1)
+    forecast_avg = np.nanmean(forecasts, axis=1)
 
-    # Trend insight
-    if change_pct > 10:
-        insights.append(
-            f"Demand is expected to increase by approximately {change_pct:.1f}% over the next two weeks."
-        )
-    elif change_pct < -10:
-        insights.append(
-            f"Demand is expected to decline by approximately {abs(change_pct):.1f}% over the next two weeks."
-        )
-    else:
-        insights.append(
-            "Demand levels are expected to remain relatively stable over the next two weeks."
+    volatility = np.nanstd(recent, axis=1, ddof=1)
+    no_recent_sales = np.nan_to_num(recent_avg) == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_pct = np.where(
+            no_recent_sales, np.nan, (forecast_avg - recent_avg) / recent_avg * 100
         )
+        long_run_change = (forecast_avg - avg_sales) / avg_sales * 100
+        volatility_ratio = volatility / avg_sales
 
-    # Volatility insight
-    if volatility > 0.5 * avg_sales:
-        insights.append(
-            "Sales show high variability, suggesting potential promotions or irregular demand events."
-        )
-    else:
-        insights.append(
-            "Sales patterns appear stable with predictable weekly behavior."
-        )
+    trend_class = np.select(
+        [
+            no_recent_sales,
+            change_pct > TREND_THRESHOLD_PCT,
+            change_pct < -TREND_THRESHOLD_PCT
+        ],
+        ["no recent sales", "increase", "decline"],
+        "stable"
+    )
+    high_volatility = volatility > HIGH_VOLATILITY_RATIO * avg_sales
 
-    # Recommendation
-    insights.append(
-        "Recommended action: plan inventory using weekly demand patterns and monitor sudden deviations closely."
+    trend_change = np.where(no_recent_sales, long_run_change, change_pct)
+    risk_score = (
+        np.nan_to_num(np.abs(trend_change) / TREND_THRESHOLD_PCT, posinf=0)
+        + np.nan_to_num(volatility_ratio / HIGH_VOLATILITY_RATIO, posinf=0)
     )
 
-    return " ".join(insights)
\ No newline at end of file
+    pct = pd.Series(np.abs(change_pct)).map("{:.1f}".format)
+    trend_text = pd.Series(np.select(
+        [trend_class == "no recent sales", trend_class == "increase", trend_class == "decline"],
+        [
+            "No sales were recorded over the last two weeks; check whether the store is closed or its data is missing.",
+            "Demand is expected to increase by approximately " + pct + "% over the next two weeks.",
+            "Demand is expected to decline by approximately " + pct + "% over the next two weeks."
+        ],
+        "Demand levels are expected to remain relatively stable over the next two weeks."
+    ))
+    # Leading spaces so stores without recent sales get no volatility sentence
+    volatility_text = pd.Series(np.select(
+        [no_recent_sales, high_volatility],
+        ["", " Sales show high variability, suggesting potential promotions or irregular demand events."],
+        " Sales patterns appear stable with predictable weekly behavior."
+    ))
+
+    result = pd.DataFrame({
+        "Store": store_ids,
+        "change_pct": change_pct,
+        "volatility_ratio": volatility_ratio,
+        "trend_class": trend_class,
+        "volatility_class": np.where(high_volatility, "high", "normal"),
+        "risk_score": risk_score,
+        "insight": trend_text + volatility_text + " " + RECOMMENDATION
+    })
+
+    order = np.argsort(-risk_score, kind="stable")
+    if top_n is not None:
+        order = order[:top_n]
+    return result.iloc[order].reset_index(drop=True)
+
+
+@timed
+def generate_business_insight(
+    series: pd.Series,
+    forecast: pd.Series
+) -> str:
+    """
+    Generate business-friendly insights without external LLMs.
+    """
+    insights = fleet_insights(
+        np.asarray(series, dtype=np.float64)[None, :],
+        np.asarray(forecast, dtype=np.float64)[None, :]
+    )
+    return insights["insight"].iloc[0]
\ No newline at end of file
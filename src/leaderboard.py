@@ -0,0 +1,214 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.baseline import naive_forecast, moving_average_forecast
+from src.data_loader import load_data
+from src.evaluation import walk_forward_validation
+from src.forecasting import arima_forecast, sarima_forecast
+from src.prophet_model import prophet_forecast
+from src.store_index import StoreIndex
+
+
+DEFAULT_LEADERBOARD_PATH = Path("data/cache/leaderboard.parquet")
+
+MODELS = {
+    "Naive": naive_forecast,
+    "Moving Average": moving_average_forecast,
+    "ARIMA": arima_forecast,
+    "SARIMA": sarima_forecast,
+    "Prophet": prophet_forecast
+}
+
+
+def _score_model(
+    store_id,
+    series: pd.Series,
+    model: str,
+    horizon: int,
+    backtest_days: int,
+    step: int
+) -> dict:
+    """
+    Backtest one model on one store and time a full-history fit/predict.
+    """
+    forecast_func = MODELS[model]
+    initial_train_size = max(len(series) - horizon - backtest_days, 1)
+
+    start = time.perf_counter()
+    errors = walk_forward_validation(
+        series,
+        forecast_func,
+        horizon=horizon,
+        initial_train_size=initial_train_size,
+        step=step
+    )
+    backtest_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    forecast_func(series, horizon=horizon)
+    fit_predict_seconds = time.perf_counter() - start
+
+    return {
+        "Store": store_id,
+        "Model": model,
+        "MAE": errors["MAE"].mean() if len(errors) else np.nan,
+        "RMSE": errors["RMSE"].mean() if len(errors) else np.nan,
+        "folds": len(errors),
+        "backtest_seconds": backtest_seconds,
+        "fit_predict_seconds": fit_predict_seconds,
+        "error": None
+    }
+
+
+def _failed_score(store_id, model: str, exc: Exception) -> dict:
+    return {
+        "Store": store_id,
+        "Model": model,
+        "MAE": np.nan,
+        "RMSE": np.nan,
+        "folds": 0,
+        "backtest_seconds": np.nan,
+        "fit_predict_seconds": np.nan,
+        "error": f"{type(exc).__name__}: {exc}"
+    }
+
+
+def run_leaderboard(
+    df: pd.DataFrame,
+    stores=None,
+    sample_size: int = 10,
+    seed: int = 0,
+    models=None,
+    horizon: int = 14,
+    backtest_days: int = 56,
+    step: int = 7,
+    n_jobs: int = None,
+    output_path=DEFAULT_LEADERBOARD_PATH
+) -> pd.DataFrame:
+    """
+    Walk-forward score every model on a sample of stores and persist it.
+
+    Each (store, model) pair is one task on a process pool. The result has
+    one row per pair with MAE/RMSE, the backtest wall time and the latency
+    of a single full-history fit/predict, and is written to `output_path`.
+    A pair that fails keeps its row with NaN scores and the exception in
+    `error`; the other pairs are unaffected.
+    """
+    index = StoreIndex(df)
+    if stores is None:
+        rng = np.random.default_rng(seed)
+        size = min(sample_size, len(index))
+        stores = np.sort(rng.choice(index.store_ids, size=size, replace=False))
+    models = list(models or MODELS)
+
+    tasks = [
+        (store_id, index.get_series(store_id), model, horizon, backtest_days, step)
+        for store_id in stores
+        for model in models
+    ]
+
+    rows = [None] * len(tasks)
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1:
+        for i, task in enumerate(tasks):
+            try:
+                rows[i] = _score_model(*task)
+            except Exception as exc:
+                rows[i] = _failed_score(task[0], task[2], exc)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = {
+                executor.submit(_score_model, *task): i
+                for i, task in enumerate(tasks)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    rows[i] = future.result()
+                except Exception as exc:
+                    rows[i] = _failed_score(tasks[i][0], tasks[i][2], exc)
+
+    results = pd.DataFrame(rows)
+    results["computed_at"] = pd.Timestamp.now().floor("s")
+
+    if output_path is not None:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        results.to_parquet(output_path, index=False)
+
+    return results
+
+
+def load_leaderboard(path=DEFAULT_LEADERBOARD_PATH):
+    """
+    Previously computed leaderboard, or None if it has not been run yet.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    return pd.read_parquet(path)
+
+
+def summarize_leaderboard(results: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per model: mean errors across stores and median latencies.
+
+    Failed pairs are left out of the scores and counted in `failed`.
+    """
+    failed = results["error"].notna() if "error" in results.columns else False
+    results = results.assign(failed=failed)
+    summary = results.groupby("Model", sort=False).agg(
+        MAE=("MAE", "mean"),
+        RMSE=("RMSE", "mean"),
+        stores=("Store", "nunique"),
+        failed=("failed", "sum"),
+        fit_predict_seconds=("fit_predict_seconds", "median"),
+        backtest_seconds=("backtest_seconds", "median")
+    )
+    return summary.reset_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Backtest every forecasting model on a sample of stores."
+    )
+    parser.add_argument("--data-path", default="data/raw")
+    parser.add_argument("--stores", type=int, nargs="*")
+    parser.add_argument("--sample-size", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--models", nargs="*", choices=list(MODELS))
+    parser.add_argument("--horizon", type=int, default=14)
+    parser.add_argument("--backtest-days", type=int, default=56)
+    parser.add_argument("--step", type=int, default=7)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--output", default=str(DEFAULT_LEADERBOARD_PATH))
+    args = parser.parse_args(argv)
+
+    df = load_data(
+        args.data_path,
+        stores=args.stores,
+        columns=["Store", "Date", "Sales"]
+    )
+    results = run_leaderboard(
+        df,
+        stores=args.stores,
+        sample_size=args.sample_size,
+        seed=args.seed,
+        models=args.models,
+        horizon=args.horizon,
+        backtest_days=args.backtest_days,
+        step=args.step,
+        n_jobs=args.workers,
+        output_path=args.output
+    )
+    print(summarize_leaderboard(results).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
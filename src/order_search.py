@@ -0,0 +1,304 @@
+import json
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.anomaly import decompose_weekly
+from src.profiling import timed
+
+
+DEFAULT_ORDER_CACHE_PATH = Path("data/cache/sarima_orders.json")
+
+# Hyndman-Khandakar starting points, as (p, q, P, Q)
+INITIAL_CANDIDATES = [(2, 2, 1, 1), (0, 0, 0, 0), (1, 0, 1, 0), (0, 1, 0, 1)]
+
+# Seasonal differencing when the weekly pattern explains this much variance
+SEASONAL_STRENGTH_THRESHOLD = 0.64
+
+
+def seasonal_strength(series, period: int = 7) -> float:
+    """
+    1 - Var(remainder) / Var(seasonal + remainder), clipped to [0, 1].
+    """
+    values = np.asarray(series, dtype=float)[None, :]
+    _, seasonal, resid = decompose_weekly(values, period=period)
+    total = np.var(seasonal + resid)
+    if total == 0:
+        return 0.0
+    return float(np.clip(1 - np.var(resid) / total, 0, 1))
+
+
+def _needs_difference(values: np.ndarray, alpha: float) -> bool:
+    """
+    KPSS rejects level stationarity and ADF can't reject a unit root.
+    """
+    from statsmodels.tsa.stattools import adfuller, kpss
+
+    if np.ptp(values) == 0:
+        return False
+
+    with warnings.catch_warnings():
+        # KPSS p-values are clipped to its lookup table; that's fine here
+        warnings.simplefilter("ignore")
+        kpss_p = kpss(values, regression="c", nlags="auto")[1]
+        adf_p = adfuller(values, autolag="AIC")[1]
+    return kpss_p < alpha and adf_p > alpha
+
+
+def choose_differencing(
+    series,
+    period: int = 7,
+    max_d: int = 2,
+    alpha: float = 0.05
+):
+    """
+    Differencing orders (d, D) from stationarity tests, run once per series.
+
+    Returns (d, D, differenced values) so candidate fits can reuse the
+    differenced series instead of differencing inside every model.
+    """
+    values = np.asarray(series, dtype=float)
+
+    D = int(seasonal_strength(values, period) > SEASONAL_STRENGTH_THRESHOLD)
+    if D:
+        values = values[period:] - values[:-period]
+
+    d = 0
+    while d < max_d and _needs_difference(values, alpha):
+        values = np.diff(values)
+        d += 1
+
+    return d, D, values
+
+
+def _candidate_aic(
+    differenced: np.ndarray,
+    candidate: tuple,
+    period: int,
+    with_constant: bool
+) -> float:
+    """
+    AIC of an ARMA(p, q)(P, Q) fit on the already differenced series.
+    """
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    p, q, P, Q = candidate
+    model = SARIMAX(
+        differenced,
+        order=(p, 0, q),
+        seasonal_order=(P, 0, Q, period) if P or Q else (0, 0, 0, 0),
+        trend="c" if with_constant else None,
+        enforce_stationarity=False,
+        enforce_invertibility=False
+    )
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return float(model.fit(disp=False).aic)
+    except (np.linalg.LinAlgError, ValueError):
+        return np.inf
+
+
+def _neighbours(candidate: tuple, max_order: tuple) -> list:
+    steps = [
+        (1, 0, 0, 0), (0, 1, 0, 0), (0, 0, 1, 0), (0, 0, 0, 1),
+        (1, 1, 0, 0), (0, 0, 1, 1)
+    ]
+
+    neighbours = []
+    for step in steps:
+        for sign in (1, -1):
+            moved = tuple(c + sign * s for c, s in zip(candidate, step))
+            if all(0 <= c <= m for c, m in zip(moved, max_order)):
+                neighbours.append(moved)
+    return neighbours
+
+
+@timed
+def select_order(
+    series,
+    period: int = 7,
+    max_order: tuple = (3, 3, 1, 1),
+    max_waves: int = 6,
+    min_improvement: float = 2.0,
+    n_jobs: int = None
+) -> dict:
+    """
+    Stepwise SARIMA order search by AIC.
+
+    Differencing is decided once from KPSS/ADF tests and the weekly
+    seasonal strength. Candidate ARMA orders are then fitted to that
+    differenced series in waves on a process pool: the starting set, then
+    the neighbours of the best order so far. The search stops as soon as a
+    wave fails to lower the AIC by `min_improvement`, or after `max_waves`.
+    `max_order` bounds (p, q, P, Q).
+
+    Returns keyword arguments for `sarima_forecast`: order, seasonal_order
+    and trend, plus the winning AIC and the number of models fitted.
+    """
+    d, D, differenced = choose_differencing(series, period)
+    with_constant = d + D == 0
+
+    aics = {}
+    best = None
+    wave = [c for c in INITIAL_CANDIDATES if all(x <= m for x, m in zip(c, max_order))]
+
+    executor = None
+    if n_jobs != 1 and (n_jobs or os.cpu_count() or 1) > 1:
+        executor = ProcessPoolExecutor(max_workers=n_jobs)
+
+    try:
+        for _ in range(max_waves):
+            wave = [c for c in dict.fromkeys(wave) if c not in aics]
+            if not wave:
+                break
+
+            results = (executor.map if executor else map)(
+                _candidate_aic,
+                [differenced] * len(wave),
+                wave,
+                [period] * len(wave),
+                [with_constant] * len(wave)
+            )
+            aics.update(zip(wave, results))
+
+            # Early stopping: this wave's neighbours didn't beat the incumbent
+            previous = aics[best] if best is not None else np.inf
+            best = min(aics, key=aics.get)
+            if aics[best] > previous - min_improvement:
+                break
+
+            wave = _neighbours(best, max_order)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    p, q, P, Q = best
+    return {
+        "order": (p, d, q),
+        "seasonal_order": (P, D, Q, period),
+        "trend": "c" if with_constant else None,
+        "aic": aics[best],
+        "models_fitted": len(aics)
+    }
+
+
+def sarima_kwargs(selection: dict) -> dict:
+    """
+    The subset of a `select_order` result that `sarima_forecast` accepts.
+    """
+    return {
+        "order": tuple(selection["order"]),
+        "seasonal_order": tuple(selection["seasonal_order"]),
+        "trend": selection["trend"]
+    }
+
+
+class OrderCache:
+    """
+    Chosen SARIMA orders per store, in one JSON file.
+
+    Orders change far more slowly than the data, so entries are reused
+    until they are `max_age_seconds` old regardless of new observations.
+    """
+
+    def __init__(
+        self,
+        path=DEFAULT_ORDER_CACHE_PATH,
+        max_age_seconds: float = 30 * 24 * 3600
+    ):
+        self.path = Path(path)
+        self.max_age_seconds = max_age_seconds
+        try:
+            self._orders = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self._orders = {}
+
+    def get(self, store_id):
+        entry = self._orders.get(str(store_id))
+        if entry is None:
+            return None
+        if (
+            self.max_age_seconds is not None
+            and time.time() - entry["searched_at"] > self.max_age_seconds
+        ):
+            return None
+        return entry
+
+    def put(self, store_id, selection: dict) -> None:
+        self._orders[str(store_id)] = {**selection, "searched_at": time.time()}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self._orders, indent=2))
+        os.replace(tmp_path, self.path)
+
+
+def _select_store_order(store_id, series: pd.Series, search_kwargs: dict):
+    """
+    One store's search as (store_id, selection, error), never raising.
+    """
+    try:
+        return store_id, select_order(series, n_jobs=1, **search_kwargs), None
+    except Exception as exc:
+        return store_id, None, f"{type(exc).__name__}: {exc}"
+
+
+@timed
+def select_orders(
+    series_by_store: dict,
+    cache: OrderCache = None,
+    n_jobs: int = None,
+    errors: dict = None,
+    **search_kwargs
+) -> dict:
+    """
+    Orders for many stores, searching only those missing from `cache`.
+
+    Each store's search runs serially inside one worker, so the pool is
+    spread across stores. A store whose search fails (e.g. too short for
+    the stationarity tests) is left out of the result, so it keeps the
+    default orders, and is not cached; its message is added to `errors`
+    when a dict is given. Returns {store_id: sarima_forecast kwargs}.
+    """
+    selections = {}
+    pending = []
+    for store_id, series in series_by_store.items():
+        cached = cache.get(store_id) if cache is not None else None
+        if cached is not None:
+            selections[store_id] = cached
+        else:
+            pending.append((store_id, series))
+
+    n_jobs = max(1, min(n_jobs or os.cpu_count() or 1, len(pending) or 1))
+    if n_jobs == 1:
+        searched = [_select_store_order(s, series, search_kwargs) for s, series in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            searched = list(executor.map(
+                _select_store_order,
+                [store_id for store_id, _ in pending],
+                [series for _, series in pending],
+                [search_kwargs] * len(pending)
+            ))
+
+    found = 0
+    for store_id, selection, error in searched:
+        if error is not None:
+            if errors is not None:
+                errors[store_id] = error
+            continue
+        selections[store_id] = selection
+        found += 1
+        if cache is not None:
+            cache.put(store_id, selection)
+    if cache is not None and found:
+        cache.save()
+
+    return {store_id: sarima_kwargs(s) for store_id, s in selections.items()}
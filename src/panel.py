@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def build_sales_matrix(
+    df: pd.DataFrame,
+    value_col: str = "Sales",
+    fill_value: float = 0,
+    dtype=np.float32
+):
+    """
+    Pivot long Store/Date rows into a dense stores x days matrix.
+
+    Days a store has no row for are set to `fill_value`, matching the
+    daily filling used for single-store series.
+    Returns (matrix, store_ids, dates).
+    """
+    store_ids, store_pos = np.unique(df["Store"].to_numpy(), return_inverse=True)
+
+    days = df["Date"].to_numpy().astype("datetime64[D]")
+    first_day, last_day = days.min(), days.max()
+    dates = pd.date_range(first_day, last_day, freq="D", name="Date")
+    day_pos = (days - first_day).astype(np.int64)
+
+    matrix = np.full((len(store_ids), len(dates)), fill_value, dtype=dtype)
+    matrix[store_pos, day_pos] = df[value_col].to_numpy()
+
+    return matrix, store_ids, dates
+
+
+PANEL_FILES = {
+    "values": "values.npy",
+    "store_ids": "stores.npy",
+    "dates": "dates.npy"
+}
+
+
+class Panel:
+    """
+    Stores x days float32 matrix with its store ids and daily dates.
+
+    `save` writes the three arrays as .npy files in one directory and
+    `Panel.open` memory-maps them back, so every process that opens the
+    same directory shares a single copy through the page cache. A panel
+    opened from disk pickles as its path, which keeps process-pool task
+    payloads to a few bytes.
+    """
+
+    def __init__(self, values: np.ndarray, store_ids: np.ndarray, dates, path=None):
+        self.values = values
+        self.store_ids = np.asarray(store_ids)
+        self.dates = pd.DatetimeIndex(dates, name="Date")
+        self.path = Path(path) if path is not None else None
+        self._positions = {
+            store_id: i for i, store_id in enumerate(self.store_ids.tolist())
+        }
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        value_col: str = "Sales",
+        fill_value: float = 0
+    ) -> "Panel":
+        matrix, store_ids, dates = build_sales_matrix(
+            df, value_col=value_col, fill_value=fill_value, dtype=np.float32
+        )
+        return cls(matrix, store_ids, dates)
+
+    @classmethod
+    def open(cls, path, mmap_mode: str = "r") -> "Panel":
+        path = Path(path)
+        return cls(
+            np.load(path / PANEL_FILES["values"], mmap_mode=mmap_mode),
+            np.load(path / PANEL_FILES["store_ids"]),
+            np.load(path / PANEL_FILES["dates"]),
+            path=path
+        )
+
+    def save(self, path) -> "Panel":
+        """
+        Write the panel to `path` and return it reopened memory-mapped.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        np.save(path / PANEL_FILES["values"], np.asarray(self.values, dtype=np.float32))
+        np.save(path / PANEL_FILES["store_ids"], self.store_ids)
+        np.save(path / PANEL_FILES["dates"], self.dates.to_numpy().astype("datetime64[D]"))
+        return Panel.open(path)
+
+    def __reduce__(self):
+        if self.path is not None and isinstance(self.values, np.memmap):
+            return Panel.open, (self.path,)
+        return Panel, (self.values, self.store_ids, self.dates)
+
+    def __contains__(self, store_id) -> bool:
+        return store_id in self._positions
+
+    def __len__(self) -> int:
+        return len(self.store_ids)
+
+    def row(self, store_id) -> np.ndarray:
+        """
+        One store's values as a view into the matrix.
+        """
+        try:
+            return self.values[self._positions[store_id]]
+        except KeyError:
+            raise KeyError(f"Store {store_id} is not in the panel") from None
+
+    def get_series(self, store_id, value_col: str = "Sales") -> pd.Series:
+        """
+        One store's row as a Date-indexed Series without copying.
+        """
+        return pd.Series(self.row(store_id), index=self.dates, name=value_col, copy=False)
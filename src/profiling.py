@@ -0,0 +1,136 @@
+import contextvars
+import functools
+import json
+import os
+import resource
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+
+DEFAULT_METRICS_PATH = Path("logs/stage_timings.jsonl")
+
+_active_recorder = contextvars.ContextVar("active_recorder", default=None)
+
+
+def current_rss_mb() -> float:
+    """
+    Resident set size of this process in MB.
+
+    Reads /proc on Linux; elsewhere falls back to the peak RSS.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class StageRecorder:
+    """
+    Collects stage timings for one run, e.g. one dashboard rerun.
+
+    Use as a context manager; `stage` blocks and `timed` functions entered
+    while it is active are recorded with their duration, RSS change and
+    nesting depth. Outside a recorder they cost a single lookup.
+    """
+
+    def __init__(self, run_id: str = None):
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.records = []
+        self._started = time.perf_counter()
+        self._depth = 0
+        self._token = None
+
+    def start(self) -> "StageRecorder":
+        self._token = _active_recorder.set(self)
+        return self
+
+    def stop(self) -> None:
+        if self._token is not None:
+            _active_recorder.reset(self._token)
+            self._token = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Records in the order the stages started.
+        """
+        frame = pd.DataFrame(
+            self.records,
+            columns=["stage", "depth", "started_at", "seconds", "rss_mb", "rss_delta_mb"]
+        )
+        return frame.sort_values("started_at", kind="stable").reset_index(drop=True)
+
+    def write(self, path=DEFAULT_METRICS_PATH) -> None:
+        """
+        Append this run's records as JSON lines.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        timestamp = pd.Timestamp.now().isoformat(timespec="seconds")
+
+        with open(path, "a") as f:
+            for record in self.records:
+                f.write(json.dumps({
+                    "run_id": self.run_id,
+                    "timestamp": timestamp,
+                    **record
+                }) + "\n")
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Time a block under the active recorder, if there is one.
+    """
+    recorder = _active_recorder.get()
+    if recorder is None:
+        yield
+        return
+
+    rss_start = current_rss_mb()
+    start = time.perf_counter()
+    recorder._depth += 1
+    try:
+        yield
+    finally:
+        recorder._depth -= 1
+        rss_end = current_rss_mb()
+        recorder.records.append({
+            "stage": name,
+            "depth": recorder._depth,
+            "started_at": start - recorder._started,
+            "seconds": time.perf_counter() - start,
+            "rss_mb": rss_end,
+            "rss_delta_mb": rss_end - rss_start
+        })
+
+
+def timed(func=None, *, name: str = None):
+    """
+    Decorator form of `stage`, named after the function by default.
+    """
+    if func is None:
+        return functools.partial(timed, name=name)
+
+    stage_name = name or f"{func.__module__.removeprefix('src.')}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _active_recorder.get() is None:
+            return func(*args, **kwargs)
+        with stage(stage_name):
+            return func(*args, **kwargs)
+
+    return wrapper
@@ -1,15 +1,20 @@
 import pandas as pd
-from prophet import Prophet
 
+from src.profiling import timed
+
+# Prophet (and its cmdstanpy backend) is imported on first fit so that
+# importing this module stays cheap for processes that never use it.
 
-def prophet_forecast(
-    series: pd.Series,
-    horizon: int,
-    return_intervals: bool = False
-):
+
+@timed
+def fit_prophet(series: pd.Series, init: dict = None, exog: pd.DataFrame = None):
     """
-    Fit Prophet model and forecast future values.
+    Fit Prophet model, optionally warm-started from earlier parameters.
+
+    Each column of `exog` (aligned with `series`) becomes an extra regressor.
     """
+    from prophet import Prophet
+
     # Prophet requires specific column names
     df = series.reset_index()
     df.columns = ["ds", "y"]
@@ -19,22 +24,105 @@ def prophet_forecast(
         daily_seasonality=False,
         yearly_seasonality=False
     )
+
+    if exog is not None:
+        for col in exog.columns:
+            model.add_regressor(col)
+            df[col] = exog[col].to_numpy()
 
-    model.fit(df)
+    if init is not None:
+        model.fit(df, init=init)
+    else:
+        model.fit(df)
 
-    future = model.make_future_dataframe(periods=horizon, freq="D")
-    forecast = model.predict(future)
+    return model
+
+
+def warm_start_params(model) -> dict:
+    """
+    Fitted parameters in the form `Prophet.fit(init=...)` expects.
+    """
+    params = {}
+    for name in ["k", "m", "sigma_obs"]:
+        params[name] = model.params[name][0][0]
+    for name in ["delta", "beta"]:
+        params[name] = model.params[name][0]
+    return params
+
+
+def prophet_forecast(
+    series: pd.Series,
+    horizon: int,
+    return_intervals: bool = False,
+    init: dict = None,
+    exog: pd.DataFrame = None,
+    future_exog: pd.DataFrame = None
+):
+    """
+    Fit Prophet model and forecast future values.
+
+    With `exog`, the matching `future_exog` rows for the horizon are required.
+    """
+    model = fit_prophet(series, init=init, exog=exog)
+    return predict_prophet(
+        model,
+        horizon,
+        return_intervals=return_intervals,
+        future_exog=future_exog
+    )
+
+
+@timed
+def predict_prophet(
+    model,
+    horizon: int,
+    return_intervals: bool = False,
+    future_exog: pd.DataFrame = None,
+    include_history: bool = False
+):
+    """
+    Forecast the next `horizon` days from an already fitted Prophet model.
+
+    Prophet's Monte-Carlo uncertainty sampling only runs when
+    `return_intervals` is set; point forecasts skip it. With
+    `include_history` the in-sample fit over the training days comes first,
+    using the regressor values the model was trained on.
+    """
+    # Only the horizon is returned, so only the horizon is predicted
+    future = model.make_future_dataframe(
+        periods=horizon,
+        freq="D",
+        include_history=False
+    )
+
+    if model.extra_regressors:
+        if future_exog is None or len(future_exog) != horizon:
+            raise ValueError(
+                f"Model was fitted with regressors; future_exog needs {horizon} rows"
+            )
+        for col in model.extra_regressors:
+            future[col] = future_exog[col].to_numpy()
+
+    if include_history:
+        future = pd.concat(
+            [model.history[["ds", *model.extra_regressors]], future],
+            ignore_index=True
+        )
 
-    # Return only the forecast horizon
-    forecast_horizon = forecast.loc[
-        forecast.index[-horizon:],
-        ["ds", "yhat", "yhat_lower", "yhat_upper"]
-    ].set_index("ds")
+    samples = model.uncertainty_samples
+    if not return_intervals:
+        model.uncertainty_samples = 0
+    try:
+        forecast = model.predict(future)
+    finally:
+        model.uncertainty_samples = samples
 
     if return_intervals:
-        return forecast_horizon
+        return forecast[
+            ["ds", "yhat", "yhat_lower", "yhat_upper"]
+        ].set_index("ds")
 
     return pd.Series(
-        forecast_horizon["yhat"].values,
-        index=forecast_horizon.index
+        forecast["yhat"].values,
+        index=pd.DatetimeIndex(forecast["ds"], name="ds")
     )
@@ -0,0 +1,298 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.cache import data_fingerprint
+from src.conformal import ConformalForecaster, apply_calibration, calibrate
+from src.forecasting import (
+    arima_forecast,
+    sarima_forecast,
+    build_arima,
+    build_sarima,
+    fit_arima,
+    fit_sarima
+)
+from src.prophet_model import fit_prophet, predict_prophet, prophet_forecast
+
+
+DEFAULT_REGISTRY_DIR = Path("data/cache/models")
+
+REGISTERED_MODELS = {
+    arima_forecast: "arima",
+    sarima_forecast: "sarima",
+    prophet_forecast: "prophet"
+}
+
+# Keyword arguments that steer the optimizer but don't change which model
+# is being fitted, so they stay out of the registry key
+FIT_ONLY_KWARGS = ("start_params", "init")
+
+
+def _config_key(config: dict) -> str:
+    payload = json.dumps(config, sort_keys=True, default=repr)
+    return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+
+def _fit(model: str, series: pd.Series, config: dict, exog, fit_kwargs: dict):
+    if model == "arima":
+        if exog is not None:
+            raise ValueError("ARIMA does not take exogenous regressors; use SARIMA")
+        return fit_arima(series, **config, **fit_kwargs)
+    if model == "sarima":
+        return fit_sarima(series, exog=exog, **config, **fit_kwargs)
+    return fit_prophet(series, exog=exog, **fit_kwargs)
+
+
+def _serialize(model: str, fitted):
+    if model == "prophet":
+        from prophet.serialize import model_to_json
+
+        return model_to_json(fitted)
+    # State-space fits are rebuilt from their parameters and the data
+    return np.asarray(fitted.params, dtype=float).tolist()
+
+
+def _deserialize(model: str, payload, series: pd.Series, config: dict, exog):
+    if model == "prophet":
+        from prophet.serialize import model_from_json
+
+        return model_from_json(payload)
+
+    params = np.asarray(payload)
+    if model == "arima":
+        return build_arima(series, **config).filter(params)
+    return build_sarima(series, exog=exog, **config).filter(params)
+
+
+def _predict(model: str, fitted, horizon: int, return_intervals: bool, future_exog):
+    if model == "prophet":
+        return predict_prophet(
+            fitted,
+            horizon,
+            return_intervals=return_intervals,
+            future_exog=future_exog
+        )
+    if model == "sarima":
+        return fitted.forecast(steps=horizon, exog=future_exog)
+    return fitted.forecast(steps=horizon)
+
+
+class ModelRegistry:
+    """
+    Fitted models on disk, so forecasts can skip the fit.
+
+    One JSON record per version under
+    <root>/<store>/<model>-<config hash>/<data fingerprint>.json: Prophet
+    models via Prophet's JSON serializer, ARIMA/SARIMA as their parameter
+    vector. Records are only read when a forecast asks for them, and the
+    rebuilt models are kept in a small in-memory LRU. Registering a new
+    version keeps only the newest `keep_versions` per store, model and
+    config; older ones were fitted on data that has since changed.
+    """
+
+    def __init__(
+        self,
+        root=DEFAULT_REGISTRY_DIR,
+        keep_versions: int = 1,
+        max_memory_items: int = 64
+    ):
+        self.root = Path(root)
+        self.keep_versions = keep_versions
+        self.max_memory_items = max_memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Worker processes read records from disk themselves
+        state = self.__dict__.copy()
+        state["_memory"] = OrderedDict()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _path(self, store_id, model: str, config: dict, fingerprint: str) -> Path:
+        return self.root / str(store_id) / f"{model}-{_config_key(config)}" / f"{fingerprint}.json"
+
+    def versions(self, store_id, model: str, config: dict = None) -> list:
+        """
+        Fingerprints of the stored versions, newest first.
+        """
+        directory = self._path(store_id, model, config or {}, "_").parent
+        paths = sorted(
+            directory.glob("*.json"),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True
+        )
+        return [path.stem for path in paths]
+
+    def load(
+        self,
+        store_id,
+        model: str,
+        config: dict,
+        fingerprint: str,
+        series: pd.Series,
+        exog=None
+    ):
+        """
+        Return (fitted model, record) for this exact version, or (None, None).
+        """
+        path = self._path(store_id, model, config, fingerprint)
+
+        with self._lock:
+            if path in self._memory:
+                self._memory.move_to_end(path)
+                return self._memory[path]
+
+        try:
+            record = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None, None
+
+        fitted = _deserialize(model, record["payload"], series, config, exog)
+        self._remember(path, fitted, record)
+        return fitted, record
+
+    def save(
+        self,
+        store_id,
+        model: str,
+        config: dict,
+        fingerprint: str,
+        fitted,
+        record: dict = None
+    ) -> dict:
+        """
+        Register a fitted model (or an updated record for it).
+        """
+        path = self._path(store_id, model, config, fingerprint)
+        if record is None:
+            record = {
+                "store": str(store_id),
+                "model": model,
+                "config": json.loads(json.dumps(config, default=repr)),
+                "fingerprint": fingerprint,
+                "created_at": time.time(),
+                "payload": _serialize(model, fitted),
+                "calibrations": {}
+            }
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(record))
+        os.replace(tmp_path, path)
+
+        self._remember(path, fitted, record)
+        self._evict_stale(path.parent)
+        return record
+
+    def _remember(self, path: Path, fitted, record: dict) -> None:
+        with self._lock:
+            self._memory[path] = (fitted, record)
+            self._memory.move_to_end(path)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    def _evict_stale(self, directory: Path) -> None:
+        paths = sorted(
+            directory.glob("*.json"),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True
+        )
+        for path in paths[self.keep_versions:]:
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self._memory.pop(path, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        for path in self.root.glob("*/*/*.json"):
+            path.unlink(missing_ok=True)
+
+
+def registered_forecast(
+    registry: ModelRegistry,
+    store_id,
+    series: pd.Series,
+    forecast_func,
+    horizon: int,
+    **forecast_kwargs
+):
+    """
+    `forecast_func(series, horizon, **kwargs)` from a registered fit.
+
+    The fit for this store, model, config and training data is loaded from
+    `registry`, or fitted and registered on a miss; only the predict step
+    runs otherwise. A `ConformalForecaster` around a registered model also
+    stores its calibration with the model; one with `calibrate_missing=False`
+    falls back to the model's own intervals until a calibration is stored.
+    Other forecasters are called directly.
+    """
+    wrapper = None
+    if isinstance(forecast_func, ConformalForecaster):
+        wrapper, forecast_func = forecast_func, forecast_func.forecast_func
+
+    model = REGISTERED_MODELS.get(forecast_func)
+    if model is None:
+        return (wrapper or forecast_func)(series, horizon=horizon, **forecast_kwargs)
+
+    return_intervals = forecast_kwargs.pop("return_intervals", False)
+    exog = forecast_kwargs.pop("exog", None)
+    future_exog = forecast_kwargs.pop("future_exog", None)
+    fit_kwargs = {
+        name: forecast_kwargs.pop(name)
+        for name in FIT_ONLY_KWARGS
+        if name in forecast_kwargs
+    }
+    config = forecast_kwargs
+
+    fingerprint = data_fingerprint(series)
+    if exog is not None:
+        fingerprint = hashlib.sha1(
+            f"{fingerprint}:{data_fingerprint(exog)}".encode()
+        ).hexdigest()
+
+    fitted, record = registry.load(store_id, model, config, fingerprint, series, exog)
+    if fitted is None:
+        fitted = _fit(model, series, config, exog, fit_kwargs)
+        record = registry.save(store_id, model, config, fingerprint, fitted)
+
+    forecast = _predict(
+        model, fitted, horizon, return_intervals and wrapper is None, future_exog
+    )
+    if wrapper is None:
+        return forecast
+
+    calibration_key = f"{wrapper.coverage}-{wrapper.n_folds}-{wrapper.step}-h{horizon}"
+    calibration = record["calibrations"].get(calibration_key)
+    if calibration is None and not wrapper.calibrate_missing:
+        return _predict(model, fitted, horizon, return_intervals, future_exog)
+    if calibration is None:
+        regressors = {} if exog is None else {"exog": exog, "future_exog": future_exog}
+        calibration = calibrate(
+            series,
+            forecast_func,
+            horizon,
+            coverage=wrapper.coverage,
+            n_folds=wrapper.n_folds,
+            step=wrapper.step,
+            **regressors,
+            **config
+        )
+        record["calibrations"][calibration_key] = calibration
+        registry.save(store_id, model, config, fingerprint, fitted, record)
+
+    return apply_calibration(
+        forecast, calibration, series.index[-1], horizon, return_intervals
+    )
@@ -0,0 +1,282 @@
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from src.conformal import DEFAULT_COVERAGE
+from src.profiling import timed
+
+
+# Positions of the dashboard's "Simulate demand change (%)" slider
+DEMAND_CHANGES = np.arange(-30, 31, 5)
+
+SERVICE_LEVELS = (0.5, 0.8, 0.9, 0.95, 0.99)
+
+N_PATHS = 2000
+
+# Upper bound on the elements of any sampled-error or demand block held in
+# memory; stores are processed in blocks below it
+_BLOCK_ELEMENTS = 2 ** 23
+
+
+def interval_errors(
+    point,
+    lower,
+    upper,
+    n_paths: int = N_PATHS,
+    coverage: float = DEFAULT_COVERAGE,
+    correlation: float = 0.0,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    Sampled forecast errors (stores, paths, horizon) from prediction intervals.
+
+    Each day's error is split-normal, scaled so that `lower` and `upper`
+    are the bounds of a central `coverage` interval around `point`, which
+    keeps the shape of asymmetric (e.g. conformal) intervals. A day whose
+    `point` lies outside its band, as it can with conformal bands around a
+    biased forecast, is centred on the band's midpoint instead, so sampled
+    demand always agrees with the interval. Errors stay relative to
+    `point`. `correlation` is the share of each path's shock common to all
+    of its days; 0 draws the days independently. `seed` may also be a
+    NumPy Generator.
+    """
+    point, lower, upper = (
+        np.atleast_2d(np.asarray(a, dtype=np.float64)) for a in (point, lower, upper)
+    )
+    lower, upper = np.minimum(lower, upper), np.maximum(lower, upper)
+    inside = (lower <= point) & (point <= upper)
+    centre = np.where(inside, point, (lower + upper) / 2)
+
+    z_bound = NormalDist().inv_cdf((1 + coverage) / 2)
+    below = (centre - lower) / z_bound
+    above = (upper - centre) / z_bound
+
+    rng = np.random.default_rng(seed)
+    n_stores, horizon = point.shape
+    z = rng.standard_normal((n_stores, n_paths, horizon))
+    if correlation:
+        common = rng.standard_normal((n_stores, n_paths, 1))
+        z = np.sqrt(correlation) * common + np.sqrt(1 - correlation) * z
+
+    shift = (centre - point)[:, None, :]
+    return shift + z * np.where(z < 0, below[:, None, :], above[:, None, :])
+
+
+def bootstrap_errors(
+    residuals,
+    n_paths: int = N_PATHS,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    Sampled forecast errors (stores, paths, horizon) from backtest residuals.
+
+    `residuals` holds each store's walk-forward errors, shaped
+    (stores, folds, horizon) or (folds, horizon) for one store, as returned
+    by `walk_forward_residuals`. Whole folds are resampled, so errors keep
+    their correlation across the days of a path. `seed` may also be a NumPy
+    Generator.
+    """
+    residuals = np.asarray(residuals, dtype=np.float64)
+    if residuals.ndim == 2:
+        residuals = residuals[None]
+    n_stores, n_folds, _ = residuals.shape
+    if n_folds == 0:
+        raise ValueError("Residual bootstrap needs at least one residual fold")
+
+    rng = np.random.default_rng(seed)
+    folds = rng.integers(0, n_folds, size=(n_stores, n_paths))
+    return np.take_along_axis(residuals, folds[:, :, None], axis=1)
+
+
+def scenario_quantiles(
+    point,
+    errors: np.ndarray,
+    demand_changes=DEMAND_CHANGES,
+    service_levels=SERVICE_LEVELS
+) -> np.ndarray:
+    """
+    Quantiles of total demand over the horizon, shaped (stores, changes, levels).
+
+    A demand change scales the expected demand `point` while the sampled
+    `errors` stay as they are; daily demand is floored at zero before
+    summing each path. All changes are evaluated together. Path totals are
+    plain sums for stores whose demand can never go negative; only the
+    rest are floored day by day, in blocks of stores. Memory still grows
+    with `errors`, so `build_scenario_grid` passes a block of stores at a
+    time.
+    """
+    point = np.atleast_2d(np.asarray(point, dtype=np.float64))
+    factors = 1 + np.asarray(demand_changes, dtype=np.float64) / 100
+    levels = np.asarray(service_levels, dtype=np.float64)
+
+    n_stores, n_paths, horizon = errors.shape
+
+    # (stores, changes, paths)
+    totals = (
+        point.sum(axis=1)[:, None, None] * factors[None, :, None]
+        + errors.sum(axis=2)[:, None, :]
+    )
+
+    lowest_point = np.minimum(point * factors.min(), point * factors.max())
+    floored = np.flatnonzero((lowest_point[:, None, :] + errors < 0).any(axis=(1, 2)))
+
+    block = max(1, _BLOCK_ELEMENTS // (len(factors) * n_paths * horizon))
+    for start in range(0, len(floored), block):
+        rows = floored[start:start + block]
+        # (stores, changes, paths, days)
+        demand = (
+            point[rows, None, None, :] * factors[None, :, None, None]
+            + errors[rows, None, :, :]
+        )
+        totals[rows] = np.maximum(demand, 0).sum(axis=-1)
+
+    return np.moveaxis(np.quantile(totals, levels, axis=-1), 0, -1)
+
+
+class ScenarioGrid:
+    """
+    Inventory needed per store, demand change and service level.
+
+    The value at (store, change, level) is the total demand over the
+    forecast horizon that is not exceeded with probability `level` when
+    expected demand shifts by `change` percent.
+    """
+
+    def __init__(self, quantiles: np.ndarray, store_ids, demand_changes, service_levels):
+        self.quantiles = quantiles
+        self.store_ids = np.asarray(store_ids)
+        self.demand_changes = np.asarray(demand_changes)
+        self.service_levels = np.asarray(service_levels, dtype=np.float64)
+        self._positions = {
+            store_id: i for i, store_id in enumerate(self.store_ids.tolist())
+        }
+
+    def lookup(self, store_id, demand_change: float, service_level: float) -> float:
+        """
+        Inventory for one point of the grid.
+        """
+        try:
+            i = self._positions[store_id]
+        except KeyError:
+            raise KeyError(f"Store {store_id} is not in the scenario grid") from None
+
+        changes = np.flatnonzero(self.demand_changes == demand_change)
+        levels = np.flatnonzero(np.isclose(self.service_levels, service_level))
+        if len(changes) == 0 or len(levels) == 0:
+            raise ValueError(
+                f"({demand_change}%, {service_level}) is not on the grid; changes are "
+                f"{self.demand_changes.tolist()}, levels {self.service_levels.tolist()}"
+            )
+        return float(self.quantiles[i, changes[0], levels[0]])
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Long layout: Store, demand_change_pct, service_level, inventory.
+        """
+        n_stores, n_changes, n_levels = self.quantiles.shape
+        return pd.DataFrame({
+            "Store": np.repeat(self.store_ids, n_changes * n_levels),
+            "demand_change_pct": np.tile(np.repeat(self.demand_changes, n_levels), n_stores),
+            "service_level": np.tile(self.service_levels, n_stores * n_changes),
+            "inventory": self.quantiles.ravel()
+        })
+
+
+@timed
+def build_scenario_grid(
+    point,
+    lower=None,
+    upper=None,
+    residuals=None,
+    store_ids=None,
+    demand_changes=DEMAND_CHANGES,
+    service_levels=SERVICE_LEVELS,
+    n_paths: int = N_PATHS,
+    coverage: float = DEFAULT_COVERAGE,
+    correlation: float = 0.0,
+    seed: int = 0
+) -> ScenarioGrid:
+    """
+    Monte-Carlo scenario grid for one store or many.
+
+    `point` is a horizon-long forecast or a stores x horizon matrix. Demand
+    paths are sampled around it from `residuals` (a residual bootstrap)
+    when given, otherwise from the `lower` / `upper` prediction intervals.
+    Stores are sampled and reduced in blocks, so only one block's paths are
+    in memory at a time.
+    """
+    point = np.atleast_2d(np.asarray(point, dtype=np.float64))
+    if residuals is not None:
+        residuals = np.asarray(residuals, dtype=np.float64)
+        if residuals.ndim == 2:
+            residuals = residuals[None]
+        if residuals.shape[0] != point.shape[0] or residuals.shape[2] != point.shape[1]:
+            raise ValueError(
+                f"residuals {residuals.shape} do not match forecasts {point.shape}"
+            )
+    elif lower is not None and upper is not None:
+        lower, upper = (
+            np.atleast_2d(np.asarray(a, dtype=np.float64)) for a in (lower, upper)
+        )
+    else:
+        raise ValueError("Scenario sampling needs prediction intervals or residuals")
+
+    n_stores, horizon = point.shape
+    rng = np.random.default_rng(seed)
+    block = max(1, _BLOCK_ELEMENTS // (n_paths * horizon))
+
+    quantiles = np.empty((n_stores, len(demand_changes), len(service_levels)))
+    for start in range(0, n_stores, block):
+        rows = slice(start, start + block)
+        if residuals is not None:
+            errors = bootstrap_errors(residuals[rows], n_paths, rng)
+        else:
+            errors = interval_errors(
+                point[rows], lower[rows], upper[rows], n_paths, coverage, correlation, rng
+            )
+        quantiles[rows] = scenario_quantiles(
+            point[rows], errors, demand_changes, service_levels
+        )
+
+    if store_ids is None:
+        store_ids = np.arange(n_stores)
+    return ScenarioGrid(quantiles, store_ids, demand_changes, service_levels)
+
+
+def fleet_scenario_grid(forecasts: pd.DataFrame, **grid_kwargs) -> ScenarioGrid:
+    """
+    Scenario grid for every store in a `batch_forecast` / `fleet_forecast` result.
+
+    Needs yhat_lower and yhat_upper; stores whose forecast failed are
+    skipped. Forecasts are aligned by horizon step, so stores whose
+    histories end on different dates are fine, but every store must cover
+    the same number of days.
+    """
+    missing = {"yhat_lower", "yhat_upper"} - set(forecasts.columns)
+    if missing:
+        raise ValueError(f"forecasts need prediction intervals; missing {sorted(missing)}")
+
+    frame = forecasts
+    if "error" in frame.columns:
+        frame = frame[frame["error"].isna()]
+    frame = frame.sort_values(["Store", "Date"])
+    frame = frame.assign(step=frame.groupby("Store").cumcount())
+
+    pivoted = {
+        col: frame.pivot(index="Store", columns="step", values=col)
+        for col in ("yhat", "yhat_lower", "yhat_upper")
+    }
+    incomplete = pivoted["yhat"].index[pivoted["yhat"].isna().any(axis=1)]
+    if len(incomplete):
+        raise ValueError(
+            f"Stores {incomplete.tolist()[:10]} forecast fewer than "
+            f"{pivoted['yhat'].shape[1]} days"
+        )
+    return build_scenario_grid(
+        pivoted["yhat"].to_numpy(dtype=np.float64),
+        pivoted["yhat_lower"].to_numpy(dtype=np.float64),
+        pivoted["yhat_upper"].to_numpy(dtype=np.float64),
+        store_ids=pivoted["yhat"].index.to_numpy(),
+        **grid_kwargs
+    )
@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+
+from src.panel import build_sales_matrix
+from src.profiling import timed
+
+
+# Prophet's default interval_width is 0.8; z for a central 80% interval
+INTERVAL_Z = 1.2815515655446004
+
+
+def _check_history(matrix: np.ndarray, period: int):
+    """
+    Seasonal indexing below needs at least one full season per row.
+    """
+    if matrix.shape[1] < period:
+        raise ValueError(
+            f"Need at least {period} days of history for a seasonal forecast, "
+            f"got {matrix.shape[1]}"
+        )
+
+
+def seasonal_naive_matrix(matrix: np.ndarray, horizon: int, period: int = 7):
+    """
+    Repeat each row's last full season.
+
+    Returns (point, scale): point forecasts (stores, horizon) and the
+    interval half-width per unit z, shaped the same.
+    """
+    _check_history(matrix, period)
+    n_days = matrix.shape[1]
+    steps = np.arange(horizon)
+    point = matrix[:, n_days - period + steps % period]
+
+    errors = matrix[:, period:] - matrix[:, :-period]
+    sigma = np.sqrt(np.mean(errors ** 2, axis=1, keepdims=True))
+    seasons_ahead = steps // period + 1
+    return point, sigma * np.sqrt(seasons_ahead)
+
+
+def weekly_profile_matrix(
+    matrix: np.ndarray,
+    horizon: int,
+    period: int = 7,
+    weeks: int = 4
+):
+    """
+    Average of the last `weeks` values at the same weekday, per row.
+    """
+    _check_history(matrix, period)
+    n_stores, n_days = matrix.shape
+    weeks = max(1, min(weeks, n_days // period))
+    recent = matrix[:, n_days - weeks * period:].reshape(n_stores, weeks, period)
+    profile = recent.mean(axis=1)
+
+    # Phase of day n_days - weeks * period is 0 within `recent`
+    steps = np.arange(horizon)
+    point = profile[:, steps % period]
+
+    spread = recent.std(axis=1).mean(axis=1, keepdims=True)
+    scale = spread * np.sqrt(1 + 1 / weeks)
+    return point, np.broadcast_to(scale, point.shape)
+
+
+def holt_winters_matrix(
+    matrix: np.ndarray,
+    horizon: int,
+    period: int = 7,
+    alpha: float = 0.2,
+    beta: float = 0.01,
+    gamma: float = 0.1
+):
+    """
+    Additive Holt-Winters fitted to every row simultaneously.
+
+    The recursion runs once over time with each step vectorized across
+    stores. Smoothing parameters are fixed (or per-store arrays) rather
+    than optimized, which keeps a fleet fit to a single pass.
+    """
+    _check_history(matrix, period)
+    matrix = matrix.astype(np.float64, copy=False)
+    n_stores, n_days = matrix.shape
+    alpha, beta, gamma = (np.asarray(p, dtype=np.float64) for p in (alpha, beta, gamma))
+
+    level = matrix[:, :period].mean(axis=1)
+    if n_days >= 2 * period:
+        trend = (matrix[:, period:2 * period].mean(axis=1) - level) / period
+    else:
+        trend = np.zeros(n_stores)
+    season = matrix[:, :period] - level[:, None]
+
+    sse = np.zeros(n_stores)
+    for t in range(period, n_days):
+        phase = t % period
+        s = season[:, phase]
+        y = matrix[:, t]
+
+        error = y - (level + trend + s)
+        sse += error ** 2
+
+        new_level = alpha * (y - s) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        season[:, phase] = gamma * (y - new_level) + (1 - gamma) * s
+        level = new_level
+
+    steps = np.arange(1, horizon + 1)
+    phases = (n_days - 1 + steps) % period
+    point = level[:, None] + steps * trend[:, None] + season[:, phases]
+
+    sigma = np.sqrt(sse / max(n_days - period, 1))[:, None]
+    alpha = np.broadcast_to(alpha, (n_stores,))[:, None]
+    scale = sigma * np.sqrt(1 + (steps - 1) * alpha ** 2)
+    return point, scale
+
+
+METHODS = {
+    "seasonal_naive": seasonal_naive_matrix,
+    "weekly_profile": weekly_profile_matrix,
+    "holt_winters": holt_winters_matrix
+}
+
+
+def forecast_matrix(
+    matrix: np.ndarray,
+    horizon: int,
+    method: str = "holt_winters",
+    **method_kwargs
+):
+    """
+    Point forecasts and 80% bounds for every row of a stores x days matrix.
+
+    Returns (yhat, yhat_lower, yhat_upper), each (stores, horizon).
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {list(METHODS)}, got {method!r}")
+
+    point, scale = METHODS[method](matrix, horizon, **method_kwargs)
+    return point, point - INTERVAL_Z * scale, point + INTERVAL_Z * scale
+
+
+@timed
+def fleet_forecast(
+    df: pd.DataFrame,
+    horizon: int = 14,
+    method: str = "holt_winters",
+    value_col: str = "Sales",
+    **method_kwargs
+) -> pd.DataFrame:
+    """
+    Forecast every store at once with a vectorized seasonal model.
+
+    Returns the same tidy layout as `batch_forecast`
+    (Store, Date, yhat, yhat_lower, yhat_upper, error), so it can stand in
+    as a fast fallback tier for the per-store models.
+    """
+    matrix, store_ids, dates = build_sales_matrix(
+        df, value_col=value_col, dtype=np.float64
+    )
+    yhat, lower, upper = forecast_matrix(matrix, horizon, method, **method_kwargs)
+
+    future = pd.date_range(dates[-1] + pd.Timedelta(days=1), periods=horizon, freq="D")
+    return pd.DataFrame({
+        "Store": np.repeat(store_ids, horizon),
+        "Date": np.tile(future, len(store_ids)),
+        "yhat": yhat.ravel(),
+        "yhat_lower": lower.ravel(),
+        "yhat_upper": upper.ravel(),
+        "error": None
+    })
+
+
+def _series_forecast(
+    series: pd.Series,
+    horizon: int,
+    method: str,
+    return_intervals: bool,
+    **method_kwargs
+):
+    matrix = series.to_numpy(dtype=np.float64)[None, :]
+    yhat, lower, upper = forecast_matrix(matrix, horizon, method, **method_kwargs)
+
+    index = pd.date_range(
+        series.index[-1] + pd.Timedelta(days=1),
+        periods=horizon,
+        freq="D",
+        name="ds"
+    )
+    if return_intervals:
+        return pd.DataFrame(
+            {"yhat": yhat[0], "yhat_lower": lower[0], "yhat_upper": upper[0]},
+            index=index
+        )
+    return pd.Series(yhat[0], index=index)
+
+
+def seasonal_naive_forecast(
+    series: pd.Series,
+    horizon: int,
+    return_intervals: bool = False,
+    period: int = 7
+):
+    """
+    Single-series seasonal naive with the same output as `prophet_forecast`.
+    """
+    return _series_forecast(
+        series, horizon, "seasonal_naive", return_intervals, period=period
+    )
+
+
+def holt_winters_forecast(
+    series: pd.Series,
+    horizon: int,
+    return_intervals: bool = False,
+    **method_kwargs
+):
+    """
+    Single-series additive Holt-Winters with the same output as `prophet_forecast`.
+    """
+    return _series_forecast(
+        series, horizon, "holt_winters", return_intervals, **method_kwargs
+    )
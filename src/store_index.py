@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+
+class StoreIndex:
+    """
+    Per-store daily series built once per dataset load.
+
+    Raw rows are sorted by (Store, Date) and each store's series is
+    regularized to a daily grid (missing days filled with 0, as
+    `asfreq("D", fill_value=0)` does) in one shared array, so `get_series`
+    is a slice, not a filter. The raw rows are not kept.
+    """
+
+    def __init__(self, df: pd.DataFrame, value_col: str = "Sales"):
+        self.value_col = value_col
+        self._date_unit = np.datetime_data(df["Date"].dtype)[0]
+
+        stores = df["Store"].to_numpy()
+        dates = df["Date"].to_numpy().astype("datetime64[D]")
+        order = np.lexsort((dates, stores))
+
+        stores = stores[order]
+        values = df[value_col].to_numpy()[order]
+        dates = dates[order]
+
+        self.store_ids, first_row = np.unique(stores, return_index=True)
+        row_offsets = np.r_[first_row, len(stores)]
+        self._positions = {
+            store_id: i for i, store_id in enumerate(self.store_ids.tolist())
+        }
+
+        # Lay every store's daily grid end to end in one array
+        rows_per_store = np.diff(row_offsets)
+        row_store = np.repeat(np.arange(len(self.store_ids)), rows_per_store)
+        self._start_dates = dates[first_row]
+        end_dates = dates[row_offsets[1:] - 1]
+        lengths = (end_dates - self._start_dates).astype(np.int64) + 1
+        self._daily_offsets = np.r_[0, np.cumsum(lengths)]
+
+        day_offset = (dates - self._start_dates[row_store]).astype(np.int64)
+        daily = np.zeros(self._daily_offsets[-1], dtype=values.dtype)
+        daily[self._daily_offsets[row_store] + day_offset] = values
+
+        daily.flags.writeable = False
+        self._daily = daily
+
+    def __contains__(self, store_id) -> bool:
+        return store_id in self._positions
+
+    def __len__(self) -> int:
+        return len(self.store_ids)
+
+    def _position(self, store_id) -> int:
+        try:
+            return self._positions[store_id]
+        except KeyError:
+            raise KeyError(f"Store {store_id} is not in the index") from None
+
+    def get_series(self, store_id) -> pd.Series:
+        """
+        Daily series for one store, as a zero-copy view of the shared array.
+        """
+        i = self._position(store_id)
+        start, stop = self._daily_offsets[i], self._daily_offsets[i + 1]
+
+        index = pd.date_range(
+            self._start_dates[i],
+            periods=stop - start,
+            freq="D",
+            unit=self._date_unit,
+            name="Date"
+        )
+        return pd.Series(
+            self._daily[start:stop],
+            index=index,
+            name=self.value_col,
+            copy=False
+        )
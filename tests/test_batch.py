@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.baseline import naive_forecast
+from src.batch import OUTPUT_COLUMNS, batch_forecast
+
+
+def _fails_on_short_series(series, horizon):
+    if len(series) < 30:
+        raise ValueError("series too short")
+    return naive_forecast(series, horizon)
+
+
+@pytest.fixture
+def sales():
+    frames = []
+    for store_id, days in [(1, 60), (2, 10), (3, 60)]:
+        dates = pd.date_range("2015-01-01", periods=days, freq="D")
+        frames.append(pd.DataFrame({
+            "Store": store_id,
+            "Date": dates,
+            "Sales": np.arange(days, dtype=float) + 100 * store_id
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_failing_store_does_not_stop_the_others(sales, n_jobs):
+    result = batch_forecast(
+        sales, _fails_on_short_series, horizon=7, n_jobs=n_jobs, chunk_size=1
+    )
+
+    assert list(result.columns) == OUTPUT_COLUMNS
+    failed = result[result["error"].notna()]
+    assert failed["Store"].tolist() == [2]
+    assert failed["error"].iloc[0] == "ValueError: series too short"
+
+    ok = result[result["error"].isna()]
+    assert ok.groupby("Store").size().to_dict() == {1: 7, 3: 7}
+    # Naive forecasts repeat each store's last value from the day after its history
+    assert (ok.loc[ok["Store"] == 3, "yhat"] == 359.0).all()
+    assert ok["Date"].min() == pd.Timestamp("2015-03-02")
@@ -0,0 +1,32 @@
+import pickle
+
+import pandas as pd
+
+from src.cache import ForecastCache
+
+
+def _forecast(value: float) -> pd.Series:
+    return pd.Series([value] * 14)
+
+
+def test_get_returns_a_copy(tmp_path):
+    cache = ForecastCache(tmp_path)
+    cache.put("a", _forecast(1.0))
+
+    first = cache.get("a")
+    first[:] = -1
+
+    assert (cache.get("a") == 1.0).all()
+
+
+def test_disk_stays_under_limit(tmp_path):
+    entry_size = len(pickle.dumps(_forecast(0.0)))
+    cache = ForecastCache(tmp_path, max_memory_items=1, max_disk_bytes=20 * entry_size)
+
+    for i in range(100):
+        cache.put(f"key-{i}", _forecast(float(i)))
+
+    on_disk = sum(path.stat().st_size for path in tmp_path.iterdir())
+    assert on_disk <= cache.max_disk_bytes
+    # The newest entry survives eviction and is readable from disk
+    assert ForecastCache(tmp_path).get("key-99").iloc[0] == 99.0
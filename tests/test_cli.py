@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import cli
+from src.data_loader import write_partitioned_data
+
+
+def _sales(stores, days, start="2015-01-01"):
+    dates = pd.date_range(start, periods=days, freq="D")
+    return pd.DataFrame({
+        "Store": np.repeat(stores, days),
+        "Date": np.tile(dates, len(stores)),
+        "Sales": np.tile(np.arange(days, dtype=float), len(stores))
+    })
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    write_partitioned_data(_sales([1, 2, 3, 4], 60), tmp_path / "raw")
+    return tmp_path / "raw"
+
+
+def _run(data_path, output, *extra):
+    return cli.main([
+        "--data-path", str(data_path), "--model", "naive", "--output", str(output),
+        "--workers", "1", "--chunk-size", "1", *extra
+    ])
+
+
+def _crash_after_first_chunk(monkeypatch):
+    real = cli.iter_batch_forecast
+
+    def crashing(*args, **kwargs):
+        chunks = real(*args, **kwargs)
+        yield next(chunks)
+        raise RuntimeError("worker died")
+
+    monkeypatch.setattr(cli, "iter_batch_forecast", crashing)
+
+
+def test_parse_stores_and_shards():
+    assert cli.parse_stores("1,5,10-12, 5") == [1, 5, 10, 11, 12]
+    assert cli.shard_stores([4, 1, 3, 2, 5], 1, 2) == [2, 4]
+
+    shards = [cli.shard_stores(list(range(1, 11)), i, 3) for i in range(3)]
+    assert sorted(s for shard in shards for s in shard) == list(range(1, 11))
+
+
+def test_resume_skips_finished_stores(data_path, tmp_path, monkeypatch, capsys):
+    output = tmp_path / "out"
+    _crash_after_first_chunk(monkeypatch)
+    with pytest.raises(RuntimeError):
+        _run(data_path, output)
+    monkeypatch.undo()
+
+    assert _run(data_path, output) == 0
+    assert "4 stores, 1 already done, 3 to forecast" in capsys.readouterr().out
+
+    result = pd.read_parquet(output / "forecasts-naive-h14.parquet")
+    assert result.groupby("Store").size().to_dict() == {1: 14, 2: 14, 3: 14, 4: 14}
+    # A clean run leaves no checkpoints behind
+    assert not (output / "parts" / "naive-h14").exists()
+
+
+def test_changed_data_is_forecast_again(data_path, tmp_path, monkeypatch, capsys):
+    output = tmp_path / "out"
+    _crash_after_first_chunk(monkeypatch)
+    with pytest.raises(RuntimeError):
+        _run(data_path, output)
+    monkeypatch.undo()
+
+    # New days arrive for every store before the rerun
+    write_partitioned_data(_sales([1, 2, 3, 4], 70), data_path)
+    assert _run(data_path, output) == 0
+    assert "0 already done, 4 to forecast" in capsys.readouterr().out
+
+    result = pd.read_parquet(output / "forecasts-naive-h14.parquet")
+    assert (result.groupby("Store")["Date"].min() == pd.Timestamp("2015-03-12")).all()
+    assert (result["yhat"] == 69.0).all()
+
+
+def test_shard_forecasts_only_its_stores(data_path, tmp_path):
+    output = tmp_path / "out"
+    assert _run(data_path, output, "--shard", "1/2") == 0
+
+    result = pd.read_parquet(output / "forecasts-naive-h14-shard-1-of-2.parquet")
+    assert sorted(result["Store"].unique().tolist()) == [2, 4]
+    assert not (output / "parts" / "naive-h14-shard-1-of-2").exists()
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.baseline import naive_forecast
+from src.conformal import DEFAULT_N_FOLDS, conformal_forecast, conformal_quantiles
+
+
+def test_too_few_folds_for_coverage_raises():
+    residuals = np.zeros((8, 3))
+    with pytest.raises(ValueError, match="need at least 9"):
+        conformal_quantiles(residuals, coverage=0.8)
+
+    conformal_quantiles(np.zeros((9, 3)), coverage=0.8)
+    conformal_quantiles(np.zeros((DEFAULT_N_FOLDS, 3)), coverage=0.8)
+
+
+@pytest.mark.parametrize("n", [9, 10, 19, 50])
+def test_bounds_are_the_conformal_order_statistics(n):
+    residuals = np.random.default_rng(n).permutation(np.arange(n, dtype=float))[:, None]
+    lower, upper = conformal_quantiles(residuals, coverage=0.8)
+
+    # ceil((n + 1) * 0.9)-th smallest and largest
+    rank = int(np.ceil((n + 1) * 0.9 - 1e-9))
+    assert upper[0] == rank - 1
+    assert lower[0] == n - rank
+
+
+def test_coverage_holds_on_exchangeable_errors():
+    rng = np.random.default_rng(0)
+    errors = rng.standard_normal((4000, 10 + 1))
+    # Each row calibrates on 10 errors, as one horizon step, and is checked on the 11th
+    lower, upper = conformal_quantiles(errors[:, :10].T, coverage=0.8)
+
+    covered = (errors[:, 10] >= lower) & (errors[:, 10] <= upper)
+    assert covered.mean() >= 0.8
+
+
+def test_conformal_forecast_offsets_point_forecast():
+    days = pd.date_range("2015-01-01", periods=200, freq="D")
+    series = pd.Series(np.random.default_rng(4).normal(100, 10, 200), index=days)
+
+    forecast = conformal_forecast(series, 7, naive_forecast)
+
+    assert list(forecast.columns) == ["yhat", "yhat_lower", "yhat_upper"]
+    assert forecast.index[0] == days[-1] + pd.Timedelta(days=1)
+    np.testing.assert_allclose(forecast["yhat"], series.iloc[-1])
+    assert (forecast["yhat_lower"] <= forecast["yhat"]).all()
+    assert (forecast["yhat_upper"] >= forecast["yhat"]).all()
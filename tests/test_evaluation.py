@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.baseline import moving_average_forecast, naive_forecast
+from src.evaluation import parallel_walk_forward_validation, walk_forward_validation
+from src.forecasting import arima_forecast
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    days = pd.date_range("2015-01-01", periods=120, freq="D")
+    weekly = 1000 * np.sin(2 * np.pi * np.arange(120) / 7)
+    return pd.Series(5000 + weekly + rng.normal(0, 300, 120), index=days)
+
+
+@pytest.mark.parametrize(
+    "forecast_func, kwargs",
+    [
+        (naive_forecast, {}),
+        (moving_average_forecast, {}),
+        (moving_average_forecast, {"window": 3}),
+        # Longer than the first training window, so early folds average what exists
+        (moving_average_forecast, {"window": 40})
+    ]
+)
+@pytest.mark.parametrize("step", [1, 7])
+def test_vectorized_matches_loop(series, forecast_func, kwargs, step):
+    vectorized = walk_forward_validation(
+        series, forecast_func, horizon=14, initial_train_size=30, step=step, **kwargs
+    )
+    loop = walk_forward_validation(
+        series, forecast_func, horizon=14, initial_train_size=30, step=step,
+        vectorized=False, **kwargs
+    )
+
+    assert len(vectorized) == len(loop)
+    np.testing.assert_allclose(vectorized["MAE"], loop["MAE"])
+    np.testing.assert_allclose(vectorized["RMSE"], loop["RMSE"])
+
+
+def test_array_input_labels_folds_by_position(series):
+    result = walk_forward_validation(
+        series.to_numpy(), naive_forecast, horizon=14, initial_train_size=30, step=7
+    )
+    assert result["train_end"].tolist() == list(range(29, 120 - 14, 7))
+
+
+def test_parallel_warm_start_matches_serial_cold_start(series):
+    kwargs = dict(horizon=7, initial_train_size=80, step=7)
+    cold = parallel_walk_forward_validation(
+        series, arima_forecast, n_jobs=1, warm_start=False, **kwargs
+    )
+    serial = parallel_walk_forward_validation(series, arima_forecast, n_jobs=1, **kwargs)
+    parallel = parallel_walk_forward_validation(series, arima_forecast, n_jobs=2, **kwargs)
+
+    assert serial["train_end"].tolist() == cold["train_end"].tolist()
+    assert parallel["train_end"].tolist() == cold["train_end"].tolist()
+    # Warm starts change where the optimizer begins, not the optimum it finds
+    np.testing.assert_allclose(serial["MAE"], cold["MAE"], rtol=1e-2)
+    np.testing.assert_allclose(parallel["MAE"], cold["MAE"], rtol=1e-2)
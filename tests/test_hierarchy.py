@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.hierarchy import build_summing_matrix, reconcile
+
+
+@pytest.fixture
+def hierarchy():
+    rng = np.random.default_rng(2)
+    n_stores, horizon = 12, 5
+    store_meta = pd.DataFrame({
+        "Store": np.arange(1, n_stores + 1),
+        "StoreType": list("aabbccddaabb"),
+        "Assortment": list("abcabcabcabc")
+    })
+    C, nodes = build_summing_matrix(store_meta, store_meta["Store"].to_numpy())
+    base_bottom = rng.uniform(100, 200, (n_stores, horizon))
+    # Aggregates deliberately incoherent with the stores
+    base_aggregate = C @ base_bottom + rng.normal(0, 50, (C.shape[0], horizon))
+    return C, nodes, base_aggregate, base_bottom
+
+
+def _dense_mint(C, base_aggregate, base_bottom, weights):
+    # b~ = (S' W^-1 S)^-1 S' W^-1 y^ with the full summing matrix S
+    S = np.vstack([C.toarray(), np.eye(C.shape[1])])
+    W_inv = np.diag(1 / weights)
+    y = np.vstack([base_aggregate, base_bottom])
+    return np.linalg.solve(S.T @ W_inv @ S, S.T @ W_inv @ y)
+
+
+def test_summing_matrix_nodes(hierarchy):
+    C, nodes, _, _ = hierarchy
+    assert nodes.iloc[0].tolist() == ["Total", "Total"]
+    assert C.shape == (1 + 4 + 3, 12)
+    # Every grouping level partitions the stores
+    np.testing.assert_array_equal(C[1:5].sum(axis=0), np.ones((1, 12)))
+    np.testing.assert_array_equal(C[5:].sum(axis=0), np.ones((1, 12)))
+
+
+@pytest.mark.parametrize("method", ["ols", "wls_struct", "wls_var"])
+def test_mint_matches_dense_solve(hierarchy, method):
+    C, _, base_aggregate, base_bottom = hierarchy
+    n_aggregate, n_stores = C.shape
+
+    if method == "ols":
+        weights = np.ones(n_aggregate + n_stores)
+    elif method == "wls_struct":
+        weights = np.concatenate([np.asarray(C.sum(axis=1)).ravel(), np.ones(n_stores)])
+    else:
+        weights = np.random.default_rng(3).uniform(0.5, 4, n_aggregate + n_stores)
+
+    aggregate, bottom = reconcile(
+        base_aggregate, base_bottom, C, method,
+        variances=weights if method == "wls_var" else None
+    )
+
+    expected = _dense_mint(C, base_aggregate, base_bottom, weights)
+    np.testing.assert_allclose(bottom, expected)
+    np.testing.assert_allclose(aggregate, C @ expected)
+
+
+def test_bottom_up_keeps_store_forecasts(hierarchy):
+    C, _, base_aggregate, base_bottom = hierarchy
+    aggregate, bottom = reconcile(base_aggregate, base_bottom, C, "bottom_up")
+
+    np.testing.assert_array_equal(bottom, base_bottom)
+    np.testing.assert_allclose(aggregate, C @ base_bottom)
+
+
+def test_coherent_forecasts_are_unchanged(hierarchy):
+    C, _, _, base_bottom = hierarchy
+    aggregate, bottom = reconcile(C @ base_bottom, base_bottom, C, "wls_struct")
+    np.testing.assert_allclose(bottom, base_bottom)
+
+
+def test_wls_var_needs_variances(hierarchy):
+    C, _, base_aggregate, base_bottom = hierarchy
+    with pytest.raises(ValueError, match="variances"):
+        reconcile(base_aggregate, base_bottom, C, "wls_var")
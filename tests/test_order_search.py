@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.order_search import OrderCache, select_orders
+
+
+def _series(days, seed):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2015-01-01", periods=days, freq="D")
+    weekly = 500 * np.sin(2 * np.pi * np.arange(days) / 7)
+    return pd.Series(5000 + weekly + rng.normal(0, 100, days), index=index)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_short_store_falls_back_to_defaults(tmp_path, n_jobs):
+    cache = OrderCache(tmp_path / "orders.json")
+    errors = {}
+    orders = select_orders(
+        {1: _series(120, 0), 2: _series(3, 1)},
+        cache=cache,
+        n_jobs=n_jobs,
+        errors=errors,
+        max_waves=1
+    )
+
+    assert list(orders) == [1]
+    assert set(orders[1]) == {"order", "seasonal_order", "trend"}
+    assert list(errors) == [2]
+    # Only the successful search is cached, so the short store is retried later
+    assert cache.get(1) is not None
+    assert OrderCache(tmp_path / "orders.json").get(2) is None
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import registry as registry_module
+from src.forecasting import arima_forecast
+from src.registry import ModelRegistry, registered_forecast
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(7)
+    days = pd.date_range("2015-01-01", periods=120, freq="D")
+    return pd.Series(5000 + rng.normal(0, 300, 120).cumsum() / 5, index=days)
+
+
+@pytest.fixture
+def fits(monkeypatch):
+    # Count the fits the registry runs
+    calls = []
+    real = registry_module._fit
+
+    def counting_fit(*args, **kwargs):
+        calls.append(args[0])
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(registry_module, "_fit", counting_fit)
+    return calls
+
+
+def test_round_trip_skips_the_fit(series, tmp_path, fits):
+    first = registered_forecast(ModelRegistry(tmp_path), 1, series, arima_forecast, 14)
+    # A new registry has an empty memory layer, so this reads the record from disk
+    second = registered_forecast(ModelRegistry(tmp_path), 1, series, arima_forecast, 14)
+
+    assert fits == ["arima"]
+    np.testing.assert_allclose(np.asarray(second), np.asarray(first))
+    np.testing.assert_allclose(np.asarray(first), np.asarray(arima_forecast(series, 14)))
+
+
+def test_changed_data_refits_and_replaces_version(series, tmp_path, fits):
+    registry = ModelRegistry(tmp_path)
+    registered_forecast(registry, 1, series, arima_forecast, 14)
+    old_versions = registry.versions(1, "arima")
+
+    changed = series.copy()
+    changed.iloc[-1] += 500
+    registered_forecast(registry, 1, changed, arima_forecast, 14)
+
+    assert fits == ["arima", "arima"]
+    new_versions = registry.versions(1, "arima")
+    assert len(new_versions) == 1
+    assert new_versions != old_versions
+
+
+def test_config_and_store_are_kept_apart(series, tmp_path, fits):
+    registry = ModelRegistry(tmp_path)
+    registered_forecast(registry, 1, series, arima_forecast, 14)
+    registered_forecast(registry, 2, series, arima_forecast, 14)
+    registered_forecast(registry, 1, series, arima_forecast, 14, order=(2, 1, 0))
+
+    assert len(fits) == 3
+    assert len(registry.versions(1, "arima", {"order": (2, 1, 0)})) == 1
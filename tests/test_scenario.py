@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.scenario import (
+    DEMAND_CHANGES,
+    SERVICE_LEVELS,
+    build_scenario_grid,
+    fleet_scenario_grid,
+    interval_errors,
+    scenario_quantiles
+)
+
+
+def _brute_force_quantiles(point, errors):
+    # One change at a time, every store floored day by day
+    factors = 1 + DEMAND_CHANGES / 100
+    result = np.empty((len(point), len(factors), len(SERVICE_LEVELS)))
+    for j, factor in enumerate(factors):
+        totals = np.maximum(point[:, None, :] * factor + errors, 0).sum(axis=2)
+        result[:, j] = np.quantile(totals, SERVICE_LEVELS, axis=1).T
+    return result
+
+
+def test_quantiles_match_brute_force():
+    rng = np.random.default_rng(5)
+    # Store 0 never floors; store 1 is near zero, so its paths are floored
+    point = np.array([[500.0] * 7, [5.0] * 7])
+    errors = rng.normal(0, 20, (2, 300, 7))
+
+    np.testing.assert_allclose(
+        scenario_quantiles(point, errors), _brute_force_quantiles(point, errors)
+    )
+
+
+def test_interval_errors_reproduce_bounds():
+    point, lower, upper = np.full((1, 3), 100.0), np.full((1, 3), 80.0), np.full((1, 3), 150.0)
+    errors = interval_errors(point, lower, upper, n_paths=200_000)
+
+    # Asymmetric bounds are the 10% and 90% quantiles of the sampled demand
+    np.testing.assert_allclose(np.quantile(errors, 0.1, axis=1), -20, rtol=0.03)
+    np.testing.assert_allclose(np.quantile(errors, 0.9, axis=1), 50, rtol=0.03)
+
+
+@pytest.mark.parametrize("point_value", [170.0, 60.0])
+def test_point_outside_band_follows_the_interval(point_value):
+    point = np.full((1, 3), point_value)
+    lower, upper = np.full((1, 3), 80.0), np.full((1, 3), 150.0)
+    demand = point[:, None, :] + interval_errors(point, lower, upper, n_paths=200_000)
+
+    np.testing.assert_allclose(np.quantile(demand, 0.1, axis=1), 80, rtol=0.03)
+    np.testing.assert_allclose(np.quantile(demand, 0.9, axis=1), 150, rtol=0.03)
+
+
+def test_high_service_level_stays_near_band_when_point_is_outside():
+    # Forecast above its own upper bound every day, as with a biased model
+    point, lower, upper = np.full(14, 6000.0), np.full(14, 4000.0), np.full(14, 5000.0)
+    grid = build_scenario_grid(point, lower, upper)
+
+    # Daily draws are independent, so the 90% total sits well inside the summed bounds
+    assert grid.lookup(0, 0, 0.9) < upper.sum()
+    assert grid.lookup(0, 0, 0.5) == pytest.approx(4500 * 14, rel=0.01)
+
+
+def test_grid_is_monotone_in_change_and_level():
+    point = np.full((3, 14), 200.0)
+    grid = build_scenario_grid(point, point - 40, point + 40, store_ids=[10, 20, 30])
+
+    assert (np.diff(grid.quantiles, axis=1) >= 0).all()
+    assert (np.diff(grid.quantiles, axis=2) >= 0).all()
+    assert grid.lookup(20, 0, 0.5) == pytest.approx(200 * 14, rel=0.01)
+    assert len(grid.to_frame()) == 3 * len(DEMAND_CHANGES) * len(SERVICE_LEVELS)
+
+
+def _forecast_frame(store_id, start, days):
+    dates = pd.date_range(start, periods=days, freq="D")
+    return pd.DataFrame({
+        "Store": store_id,
+        "Date": dates,
+        "yhat": 100.0,
+        "yhat_lower": 80.0,
+        "yhat_upper": 120.0,
+        "error": None
+    })
+
+
+def test_fleet_grid_aligns_stores_by_horizon_step():
+    forecasts = pd.concat([
+        _forecast_frame(1, "2015-08-01", 14),
+        _forecast_frame(2, "2015-06-20", 14)
+    ])
+    grid = fleet_scenario_grid(forecasts)
+
+    assert not np.isnan(grid.quantiles).any()
+    np.testing.assert_allclose(grid.quantiles[0], grid.quantiles[1], rtol=0.05)
+
+
+def test_fleet_grid_rejects_short_forecasts():
+    forecasts = pd.concat([
+        _forecast_frame(1, "2015-08-01", 14),
+        _forecast_frame(2, "2015-08-01", 10)
+    ])
+    with pytest.raises(ValueError, match=r"Stores \[2\] forecast fewer than 14 days"):
+        fleet_scenario_grid(forecasts)
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.seasonal_engine import (
+    INTERVAL_Z,
+    fleet_forecast,
+    forecast_matrix,
+    holt_winters_forecast,
+    holt_winters_matrix,
+    seasonal_naive_forecast,
+    weekly_profile_matrix
+)
+
+
+@pytest.fixture
+def sales():
+    rng = np.random.default_rng(1)
+    days = pd.date_range("2015-01-01", periods=90, freq="D")
+    weekly = 800 * np.sin(2 * np.pi * np.arange(90) / 7)
+    return pd.DataFrame({
+        "Store": np.repeat([1, 2, 3], 90),
+        "Date": np.tile(days, 3),
+        "Sales": np.concatenate([
+            level + weekly + rng.normal(0, 200, 90) for level in (3000, 5000, 8000)
+        ])
+    })
+
+
+def _holt_winters_reference(y, horizon, period=7, alpha=0.2, beta=0.01, gamma=0.1):
+    # Scalar recursion, one store at a time
+    level = y[:period].mean()
+    trend = (y[period:2 * period].mean() - level) / period
+    season = list(y[:period] - level)
+    for t in range(period, len(y)):
+        s = season[t % period]
+        new_level = alpha * (y[t] - s) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        season[t % period] = gamma * (y[t] - new_level) + (1 - gamma) * s
+        level = new_level
+    return np.array([
+        level + h * trend + season[(len(y) - 1 + h) % period]
+        for h in range(1, horizon + 1)
+    ])
+
+
+def test_holt_winters_matrix_matches_scalar_recursion(sales):
+    matrix = sales.pivot(index="Store", columns="Date", values="Sales").to_numpy()
+    point, _ = holt_winters_matrix(matrix, 10)
+
+    for row, store_values in zip(point, matrix):
+        np.testing.assert_allclose(row, _holt_winters_reference(store_values, 10))
+
+
+def test_seasonal_naive_repeats_last_week(sales):
+    series = sales[sales["Store"] == 1].set_index("Date")["Sales"]
+    forecast = seasonal_naive_forecast(series, 10)
+
+    expected = series.to_numpy()[-7:][np.arange(10) % 7]
+    np.testing.assert_allclose(forecast.to_numpy(), expected)
+    assert forecast.index[0] == series.index[-1] + pd.Timedelta(days=1)
+
+
+def test_weekly_profile_averages_same_weekday():
+    matrix = np.arange(28, dtype=np.float64)[None, :]
+    point, _ = weekly_profile_matrix(matrix, 7, weeks=4)
+    np.testing.assert_allclose(point[0], np.arange(7) + 10.5)
+
+
+@pytest.mark.parametrize("method", ["seasonal_naive", "weekly_profile", "holt_winters"])
+def test_fleet_forecast_matches_per_store(sales, method):
+    fleet = fleet_forecast(sales, horizon=14, method=method)
+
+    for store_id, store_df in sales.groupby("Store"):
+        series = store_df.set_index("Date")["Sales"]
+        matrix = series.to_numpy()[None, :]
+        yhat, lower, upper = forecast_matrix(matrix, 14, method)
+        store = fleet[fleet["Store"] == store_id]
+
+        np.testing.assert_allclose(store["yhat"], yhat[0])
+        np.testing.assert_allclose(store["yhat_lower"], lower[0])
+        np.testing.assert_allclose(store["yhat_upper"], upper[0])
+
+
+def test_single_series_intervals(sales):
+    series = sales[sales["Store"] == 2].set_index("Date")["Sales"]
+    forecast = holt_winters_forecast(series, 14, return_intervals=True)
+    _, scale = holt_winters_matrix(series.to_numpy()[None, :], 14)
+
+    np.testing.assert_allclose(
+        forecast["yhat_upper"] - forecast["yhat"], INTERVAL_Z * scale[0]
+    )
+
+
+@pytest.mark.parametrize("method", ["seasonal_naive", "weekly_profile", "holt_winters"])
+def test_history_shorter_than_a_season_is_rejected(method):
+    with pytest.raises(ValueError, match="at least 7 days"):
+        forecast_matrix(np.ones((2, 5)), 7, method)
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_loader import prepare_series
+from src.store_index import StoreIndex
+
+
+@pytest.fixture
+def sales():
+    rng = np.random.default_rng(6)
+    days = pd.date_range("2015-01-01", periods=60, freq="D")
+    frames = []
+    for store_id, start in [(3, 0), (1, 10), (2, 5)]:
+        # Each store skips some days and starts on its own date
+        kept = np.sort(rng.choice(np.arange(start, 60), size=40, replace=False))
+        frames.append(pd.DataFrame({
+            "Store": store_id,
+            "Date": days[kept],
+            "Sales": rng.integers(1000, 9000, len(kept)).astype(float)
+        }))
+    # Rows arrive unsorted, as after an append
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=0)
+
+
+def test_series_match_asfreq_path(sales):
+    index = StoreIndex(sales)
+
+    assert index.store_ids.tolist() == [1, 2, 3]
+    for store_id, store_df in sales.groupby("Store"):
+        pd.testing.assert_series_equal(
+            index.get_series(store_id),
+            prepare_series(store_df),
+            check_freq=False
+        )
+
+
+def test_series_are_read_only_views(sales):
+    series = StoreIndex(sales).get_series(1)
+    with pytest.raises(ValueError):
+        series.to_numpy()[0] = -1
+
+
+def test_unknown_store(sales):
+    index = StoreIndex(sales)
+    assert 99 not in index
+    with pytest.raises(KeyError, match="Store 99"):
+        index.get_series(99)